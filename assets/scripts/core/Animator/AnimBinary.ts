@@ -0,0 +1,220 @@
+import type {
+    AnimBounds,
+    AnimNodeData,
+    AnimationData,
+    FrameData,
+    SlotData,
+    TrackColumns,
+    TrackData,
+    TrackFrameData,
+} from './Animator.d'
+
+// Mirrors tools/reanim_binary.py.
+const MAGIC = 0x415a5650 // "PVZA"
+const VERSION = 3
+const NO_STRING = 0xffffffff
+const NO_OFFSET = 0xffffffff
+const TRACK_KEYFRAMED = 1
+const FRAME_MATRICES = 2
+const SLOT_COLUMN_COUNT = 7
+const TRACK_COLUMN_COUNT = 8
+
+/**
+ * Decodes a .bin animation written by reanim_converter --format binary.
+ * Track and slot columns are Float32Array views over `buffer`; frame objects
+ * are only materialized the first time a track's `frames` is read.
+ */
+export function decodeAnimBinary(buffer: ArrayBuffer): Record<string, AnimNodeData> {
+    const view = new DataView(buffer)
+    if (view.getUint32(0, true) !== MAGIC) throw new Error('[AnimBinary] Bad magic')
+    const version = view.getUint16(4, true)
+    if (version !== VERSION) throw new Error(`[AnimBinary] Unsupported version ${version}`)
+
+    const stringOffset = view.getUint32(8, true)
+    const stringCount = view.getUint32(12, true)
+    let pos = view.getUint32(16, true)
+    const nodeCount = view.getUint32(20, true)
+    const strings = readStrings(buffer, view, stringOffset, stringCount)
+
+    const u32 = () => {
+        const value = view.getUint32(pos, true)
+        pos += 4
+        return value
+    }
+
+    const result: Record<string, AnimNodeData> = {}
+    for (let n = 0; n < nodeCount; n++) {
+        const nodeName = strings[u32()]
+        const animCount = u32()
+        const slotCount = u32()
+        const trackCount = u32()
+
+        const animations: Record<string, AnimationData> = {}
+        for (let i = 0; i < animCount; i++) {
+            const name = strings[u32()]
+            const fps = view.getFloat32(pos, true)
+            pos += 4
+            const startFrame = u32()
+            const endFrame = u32()
+            const duration = u32()
+            const boundsOffset = u32()
+            const frameBoundsOffset = u32()
+            const anim: AnimationData = { fps, startFrame, endFrame, duration }
+            if (boundsOffset !== NO_OFFSET) {
+                anim.bounds = readBounds(new Float32Array(buffer, boundsOffset, 4), 0)
+            }
+            if (frameBoundsOffset !== NO_OFFSET) {
+                const values = new Float32Array(buffer, frameBoundsOffset, duration * 4)
+                const frameBounds: (AnimBounds | null)[] = new Array(duration)
+                for (let f = 0; f < duration; f++) frameBounds[f] = readBounds(values, f * 4)
+                anim.frameBounds = frameBounds
+            }
+            animations[name] = anim
+        }
+
+        const slots: Record<string, SlotData> = {}
+        for (let i = 0; i < slotCount; i++) {
+            const name = strings[u32()]
+            const frameCount = u32()
+            const flags = u32()
+            const offset = u32()
+            const frames = readSlotFrames(buffer, offset, frameCount)
+            if (flags & FRAME_MATRICES) {
+                attachMatrices(frames, buffer, offset + SLOT_COLUMN_COUNT * frameCount * 4)
+            }
+            slots[name] = { frames }
+        }
+
+        const tracks: Record<string, TrackData> = {}
+        for (let i = 0; i < trackCount; i++) {
+            const name = strings[u32()]
+            const zIndex = view.getInt32(pos, true)
+            pos += 4
+            const frameCount = u32()
+            const flags = u32()
+            const offset = u32()
+            const columns = readTrackColumns(buffer, offset, frameCount, strings)
+            let extraOffset = offset + (TRACK_COLUMN_COUNT + 1) * frameCount * 4
+            let hideAfter: Uint8Array | null = null
+            if (flags & TRACK_KEYFRAMED) {
+                hideAfter = new Uint8Array(buffer, extraOffset, frameCount)
+                extraOffset += Math.ceil(frameCount / 4) * 4
+            }
+            const matrixOffset = flags & FRAME_MATRICES ? extraOffset : null
+            tracks[name] = createLazyTrack(zIndex, columns, hideAfter, buffer, matrixOffset)
+        }
+
+        result[nodeName] = { animations, slots, tracks }
+    }
+    return result
+}
+
+function readStrings(buffer: ArrayBuffer, view: DataView, offset: number, count: number): string[] {
+    const bytesStart = offset + count * 4
+    const bytes = new Uint8Array(buffer)
+    const decoder = typeof TextDecoder !== 'undefined' ? new TextDecoder('utf-8') : null
+    const strings: string[] = new Array(count)
+    let start = 0
+    for (let i = 0; i < count; i++) {
+        const end = view.getUint32(offset + i * 4, true)
+        const slice = bytes.subarray(bytesStart + start, bytesStart + end)
+        strings[i] = decoder ? decoder.decode(slice) : String.fromCharCode(...slice)
+        start = end
+    }
+    return strings
+}
+
+function readBounds(values: Float32Array, index: number): AnimBounds | null {
+    if (Number.isNaN(values[index])) return null
+    return [values[index], values[index + 1], values[index + 2], values[index + 3]]
+}
+
+function column(buffer: ArrayBuffer, offset: number, frameCount: number, index: number) {
+    return new Float32Array(buffer, offset + index * frameCount * 4, frameCount)
+}
+
+function readSlotFrames(buffer: ArrayBuffer, offset: number, frameCount: number): FrameData[] {
+    const [frameIndex, x, y, sx, sy, kx, ky] = Array.from({ length: SLOT_COLUMN_COUNT }, (_, i) =>
+        column(buffer, offset, frameCount, i),
+    )
+    const frames: FrameData[] = new Array(frameCount)
+    for (let i = 0; i < frameCount; i++) {
+        frames[i] = {
+            frameIndex: frameIndex[i],
+            x: x[i],
+            y: y[i],
+            sx: sx[i],
+            sy: sy[i],
+            kx: kx[i],
+            ky: ky[i],
+        }
+    }
+    return frames
+}
+
+function attachMatrices(frames: FrameData[], buffer: ArrayBuffer, offset: number) {
+    const matrices = new Float32Array(buffer, offset, frames.length * 6)
+    for (let i = 0; i < frames.length; i++) frames[i].matrix = matrices.subarray(i * 6, i * 6 + 6)
+}
+
+function readTrackColumns(
+    buffer: ArrayBuffer,
+    offset: number,
+    frameCount: number,
+    strings: readonly string[],
+): TrackColumns {
+    return {
+        frameIndex: column(buffer, offset, frameCount, 0),
+        x: column(buffer, offset, frameCount, 1),
+        y: column(buffer, offset, frameCount, 2),
+        sx: column(buffer, offset, frameCount, 3),
+        sy: column(buffer, offset, frameCount, 4),
+        kx: column(buffer, offset, frameCount, 5),
+        ky: column(buffer, offset, frameCount, 6),
+        alpha: column(buffer, offset, frameCount, 7),
+        image: new Uint32Array(buffer, offset + TRACK_COLUMN_COUNT * frameCount * 4, frameCount),
+        strings,
+    }
+}
+
+export function getColumnImage(columns: TrackColumns, index: number): string | null {
+    const stringIndex = columns.image[index]
+    return stringIndex === NO_STRING ? null : columns.strings[stringIndex]
+}
+
+function createLazyTrack(
+    zIndex: number,
+    columns: TrackColumns,
+    hideAfter: Uint8Array | null,
+    buffer: ArrayBuffer,
+    matrixOffset: number | null,
+): TrackData {
+    let frames: TrackFrameData[] | null = null
+    return {
+        zIndex,
+        columns,
+        keyframed: hideAfter !== null,
+        get frames() {
+            if (!frames) {
+                const count = columns.frameIndex.length
+                frames = new Array(count)
+                for (let i = 0; i < count; i++) {
+                    frames[i] = {
+                        frameIndex: columns.frameIndex[i],
+                        x: columns.x[i],
+                        y: columns.y[i],
+                        sx: columns.sx[i],
+                        sy: columns.sy[i],
+                        kx: columns.kx[i],
+                        ky: columns.ky[i],
+                        alpha: columns.alpha[i],
+                        image: getColumnImage(columns, i),
+                    }
+                    if (hideAfter?.[i]) frames[i].hideAfter = true
+                }
+                if (matrixOffset !== null) attachMatrices(frames, buffer, matrixOffset)
+            }
+            return frames
+        },
+    }
+}
@@ -0,0 +1,125 @@
+import { JsonAsset } from 'cc'
+import { AssetLoader } from '../AssetLoader'
+import type {
+    AnimChunkData,
+    AnimChunkIndex,
+    AnimNodeData,
+    FrameData,
+    SlotData,
+    TrackData,
+} from './Animator.d'
+
+const chunkBasePaths = new WeakMap<object, string>()
+
+/**
+ * Loads the animation at path. A reanim converted with --format chunks has no path.json;
+ * its path/index.json is returned instead, and parseJson recognises it by identity.
+ */
+export async function loadAnimJson(
+    path: string,
+    label: string | null = path,
+): Promise<JsonAsset | null> {
+    const indexPath = `${path}/index`
+    if (AssetLoader.has(path, JsonAsset) || !AssetLoader.has(indexPath, JsonAsset)) {
+        return AssetLoader.load<JsonAsset>(path, JsonAsset, label)
+    }
+    const index = await AssetLoader.load<JsonAsset>(indexPath, JsonAsset, label)
+    if (index?.json) chunkBasePaths.set(index.json, path)
+    return index
+}
+
+/** Resource path whose chunks belong to a chunk index loaded by loadAnimJson. */
+export function getAnimChunkBasePath(data: object): string | null {
+    return chunkBasePaths.get(data) ?? null
+}
+
+/**
+ * Builds node data from a chunk index written by reanim_converter --format chunks.
+ * Every slot and track starts with no frames; mergeAnimChunk fills them in as clips load.
+ */
+export function createChunkedNodeData(index: AnimChunkIndex): Record<string, AnimNodeData> {
+    const result: Record<string, AnimNodeData> = {}
+    for (const nodeName in index.nodes) {
+        const node = index.nodes[nodeName]
+        const tracks: Record<string, TrackData> = {}
+        for (const trackName in node.tracks) {
+            const info = node.tracks[trackName]
+            const track: TrackData = { frames: [], zIndex: info.zIndex }
+            if (info.keyframed) track.keyframed = true
+            tracks[trackName] = track
+        }
+        const slots: Record<string, SlotData> = {}
+        for (const slotName in node.slots) {
+            slots[slotName] = { frames: [] }
+        }
+        const animations = { ...node.animations }
+        for (const clip in animations) {
+            animations[clip] = { ...animations[clip] }
+        }
+        result[nodeName] = { animations, slots, tracks }
+    }
+    return result
+}
+
+/**
+ * Merges the chunk named chunkName into a node in place: slot and track frames stay
+ * sorted by frameIndex, and the clips stored in it get their per-frame bounds.
+ * Returns false when none of the node's clips use the chunk.
+ */
+export function mergeAnimChunk(
+    node: AnimNodeData,
+    chunk: AnimChunkData,
+    chunkName: string,
+): boolean {
+    let used = false
+    for (const clip in node.animations) {
+        const anim = node.animations[clip]
+        if (anim.chunk !== chunkName) continue
+        used = true
+        if (chunk.frameBounds) anim.frameBounds = chunk.frameBounds
+    }
+    if (!used) return false
+
+    for (const trackName in chunk.tracks) {
+        const track = node.tracks[trackName]
+        if (!track) continue
+        mergeFrames(track.frames, chunk.tracks[trackName])
+    }
+    for (const slotName in chunk.slots ?? {}) {
+        const slot = node.slots[slotName]
+        if (!slot) continue
+        mergeFrames(slot.frames, chunk.slots[slotName])
+    }
+    return true
+}
+
+function mergeFrames<T extends FrameData>(target: T[], incoming: T[]): void {
+    if (incoming.length === 0) return
+    const last = target[target.length - 1]
+    if (!last || last.frameIndex < incoming[0].frameIndex) {
+        for (const frame of incoming) target.push(frame)
+        return
+    }
+
+    const merged: T[] = []
+    let i = 0
+    let j = 0
+    while (i < target.length || j < incoming.length) {
+        const a = target[i]
+        const b = incoming[j]
+        if (!b || (a && a.frameIndex < b.frameIndex)) {
+            merged.push(a)
+            i++
+        } else if (!a || b.frameIndex < a.frameIndex) {
+            merged.push(b)
+            j++
+        } else {
+            // Clips can overlap; both chunks hold the same frame.
+            merged.push(a)
+            i++
+            j++
+        }
+    }
+    target.length = 0
+    for (const frame of merged) target.push(frame)
+}
@@ -0,0 +1,29 @@
+// Mirrors tools/reanim_lod.py: reanim_converter --lod N writes <name>_lod<N>.
+const LOD_SUFFIX = '_lod'
+
+const LOD_PATH = new RegExp(`${LOD_SUFFIX}\\d+$`)
+
+export function isAnimLodPath(path: string): boolean {
+    return LOD_PATH.test(path)
+}
+
+/** Resource path of a reduced-rate variant; factor 1 is the full-rate animation. */
+export function getAnimLodPath(path: string, factor: number): string {
+    return factor > 1 ? `${path}${LOD_SUFFIX}${factor}` : path
+}
+
+/**
+ * Picks the smallest factor whose cost fits the budget, treating sampling cost
+ * as instances / factor. Falls back to the largest available factor.
+ */
+export function chooseAnimLodFactor(
+    instanceCount: number,
+    fullRateBudget: number,
+    factors: readonly number[],
+): number {
+    const sorted = [1, ...factors.filter((factor) => factor > 1)].sort((a, b) => a - b)
+    for (const factor of sorted) {
+        if (instanceCount / factor <= fullRateBudget) return factor
+    }
+    return sorted[sorted.length - 1]
+}
@@ -1,5 +1,11 @@
 import { Mat4, toRadian, warn, error } from 'cc'
-import type { AnimNodeData, AnimationData, TrackFrameData, FrameData } from './Animator.d'
+import type {
+    AnimBounds,
+    AnimNodeData,
+    AnimationData,
+    TrackFrameData,
+    FrameData,
+} from './Animator.d'
 
 export interface ComputedTrackFrame {
     trackName: string
@@ -27,10 +33,12 @@ export class AnimNode {
     private _keepLastFrame: boolean = false
     private _onFinish?: () => void
     private _onPoseDirty?: () => void
+    private _onPlay?: (name: string) => void
     private _frameCountOverride: number | null = null
     private _truncateDisappearingFrames: boolean = true
     private _visibleTracks: Set<string> | null = null
     private _hiddenTrackPrefixes: Set<string> | null = null
+    private _skipInvisibleFrames: boolean = false
 
     // Blend transition (snapshot-based)
     private _blendTrackSnapshot: Record<string, TrackFrameData> = {}
@@ -53,9 +61,10 @@ export class AnimNode {
         return this._computedFrames
     }
 
-    constructor(data: AnimNodeData, onPoseDirty?: () => void) {
+    constructor(data: AnimNodeData, onPoseDirty?: () => void, onPlay?: (name: string) => void) {
         this._data = data
         this._onPoseDirty = onPoseDirty
+        this._onPlay = onPlay
     }
 
     // ── Public API ─────────────────────────────────────────────
@@ -146,6 +155,7 @@ export class AnimNode {
         this._frameCountOverride = frameCountOverride ?? null
         this._truncateDisappearingFrames = truncateDisappearingFrames
         this._onFinish = onFinish
+        this._onPlay?.(name)
         onStart?.()
         this._onPoseDirty?.()
     }
@@ -286,6 +296,24 @@ export class AnimNode {
         return name in this._data.animations
     }
 
+    /** Skip track sampling on frames whose precomputed bounds say nothing is drawn. */
+    public set skipInvisibleFrames(value: boolean) {
+        this._skipInvisibleFrames = value
+    }
+
+    /**
+     * Precomputed bounds of the current frame, or of the whole clip when the
+     * converter did not emit per-frame bounds. Null means nothing is drawn.
+     */
+    public getCurrentBounds(): AnimBounds | null | undefined {
+        const anim = this._currentAnim
+        if (!anim) return null
+        const frameBounds = anim.frameBounds
+        if (!frameBounds) return anim.bounds
+        const index = Math.min(frameBounds.length - 1, Math.max(0, Math.floor(this._time)))
+        return frameBounds[index]
+    }
+
     public get currentAnimationStartFrame(): number | null {
         return this._currentAnim?.startFrame ?? null
     }
@@ -352,6 +380,8 @@ export class AnimNode {
             }
         }
 
+        if (this._skipInvisibleFrames && blendRatio >= 1 && this._isInvisibleAt(anim, this._time)) return
+
         // parent transform (computed once per frame)
         let parentMat: Mat4 | null = null
         if (this._parentNode && (this._parentSlot || this._parentTrack)) {
@@ -407,6 +437,16 @@ export class AnimNode {
 
     // ── Sampling ───────────────────────────────────────────────
 
+    private _isInvisibleAt(anim: AnimationData, time: number): boolean {
+        const frameBounds = anim.frameBounds
+        if (!frameBounds) return anim.bounds === null
+        // Both neighbours must be empty, since alpha is interpolated between them.
+        const last = frameBounds.length - 1
+        const left = Math.min(last, Math.max(0, Math.floor(time)))
+        const right = Math.min(last, Math.max(0, Math.ceil(time)))
+        return frameBounds[left] === null && frameBounds[right] === null
+    }
+
     private _sampleTrack(
         trackName: string,
         time: number,
@@ -415,13 +455,14 @@ export class AnimNode {
         const track = this._data.tracks[trackName]
         if (!track || track.frames.length === 0) return null
         const targetFrame = anim.startFrame + time
-        return this._sampleTrackFramesAt(track.frames, targetFrame, trackName)
+        return this._sampleTrackFramesAt(track.frames, targetFrame, trackName, track.keyframed)
     }
 
     private _sampleTrackFramesAt(
         frames: TrackFrameData[],
         targetFrame: number,
         cacheKey?: string,
+        keyframed: boolean = false,
     ): TrackFrameData | null {
         if (frames.length === 0) return null
         if (targetFrame > frames[frames.length - 1].frameIndex) {
@@ -447,7 +488,10 @@ export class AnimNode {
         if (leftIdx + 1 >= frames.length) return left
 
         const right = frames[leftIdx + 1]
-        if (right.frameIndex - left.frameIndex > 1 && targetFrame >= left.frameIndex + 1) {
+        const hidesAfterLeft = keyframed
+            ? left.hideAfter === true
+            : right.frameIndex - left.frameIndex > 1
+        if (hidesAfterLeft && targetFrame >= left.frameIndex + 1) {
             return null
         }
 
@@ -506,7 +550,10 @@ export class AnimNode {
     private _sampleBaseTrackFrame(track: string, basePoseFrame: number): TrackFrameData | null {
         const trackData = this._data.tracks[track]
         if (!trackData || trackData.frames.length === 0) return null
-        return this._sampleTrackFramesAt(trackData.frames, basePoseFrame) ?? trackData.frames[0]
+        return (
+            this._sampleTrackFramesAt(trackData.frames, basePoseFrame, undefined, trackData.keyframed) ??
+            trackData.frames[0]
+        )
     }
 
     private _sampleFrameDataAt(
@@ -552,6 +599,7 @@ export class AnimNode {
             ky: a.ky + (b.ky - a.ky) * t,
             alpha: a.alpha + (b.alpha - a.alpha) * t,
             image: a.image,
+            matrix: this._lerpMatrix(a.matrix, b.matrix, t),
         }
     }
 
@@ -564,9 +612,26 @@ export class AnimNode {
             sy: a.sy + (b.sy - a.sy) * t,
             kx: a.kx + (b.kx - a.kx) * t,
             ky: a.ky + (b.ky - a.ky) * t,
+            matrix: this._lerpMatrix(a.matrix, b.matrix, t),
         }
     }
 
+    private _lerpMatrix(
+        a: ArrayLike<number> | undefined,
+        b: ArrayLike<number> | undefined,
+        t: number,
+    ): number[] | undefined {
+        if (!a || !b) return undefined
+        return [
+            a[0] + (b[0] - a[0]) * t,
+            a[1] + (b[1] - a[1]) * t,
+            a[2] + (b[2] - a[2]) * t,
+            a[3] + (b[3] - a[3]) * t,
+            a[4] + (b[4] - a[4]) * t,
+            a[5] + (b[5] - a[5]) * t,
+        ]
+    }
+
     // ── Blending ───────────────────────────────────────────────
 
     private _blendTrackFrames(
@@ -623,9 +688,21 @@ export class AnimNode {
     // ── Matrix helpers ─────────────────────────────────────────
 
     private _frameToMatrix(frame: FrameData, out: Mat4): void {
+        Mat4.identity(out)
+        const matrix = frame.matrix
+        if (matrix) {
+            // Baked by reanim_converter --matrices.
+            out.m00 = matrix[0]
+            out.m01 = matrix[1]
+            out.m04 = matrix[2]
+            out.m05 = matrix[3]
+            out.m12 = matrix[4]
+            out.m13 = matrix[5]
+            return
+        }
+
         const rkx = -toRadian(frame.kx)
         const rky = -toRadian(frame.ky)
-        Mat4.identity(out)
         out.m00 = frame.sx * Math.cos(rkx)
         out.m01 = frame.sx * Math.sin(rkx)
         out.m04 = -frame.sy * Math.sin(rky)
@@ -0,0 +1,50 @@
+import type { AnimNodeData, SharedAnimData, TrackData, TrackFrameData } from './Animator.d'
+
+export function isSharedAnimData(json: unknown): json is SharedAnimData {
+    return (
+        typeof json === 'object' &&
+        json !== null &&
+        Array.isArray((json as SharedAnimData).sharedTracks)
+    )
+}
+
+/** Per-node data of a JSON animation in either layout reanim_converter writes. */
+export function resolveAnimNodeData(
+    json: Record<string, AnimNodeData> | SharedAnimData,
+): Record<string, AnimNodeData> {
+    return isSharedAnimData(json) ? resolveSharedAnimData(json) : json
+}
+
+/**
+ * Expands JSON written by reanim_converter --shared-tracks into per-node data.
+ * Frame objects are shared between nodes; a ref covering a whole track reuses
+ * its frames array as-is.
+ */
+export function resolveSharedAnimData(data: SharedAnimData): Record<string, AnimNodeData> {
+    const result: Record<string, AnimNodeData> = {}
+    for (const nodeName in data.nodes) {
+        const node = data.nodes[nodeName]
+        const tracks: Record<string, TrackData> = {}
+        for (const trackName in node.tracks) {
+            const ref = node.tracks[trackName]
+            const shared = data.sharedTracks[ref.track]
+            const track: TrackData = {
+                frames: sliceFrames(shared.frames, ref.ranges),
+                zIndex: shared.zIndex,
+            }
+            if (shared.keyframed) track.keyframed = true
+            tracks[trackName] = track
+        }
+        result[nodeName] = { animations: node.animations, slots: node.slots, tracks }
+    }
+    return result
+}
+
+function sliceFrames(frames: TrackFrameData[], ranges: [number, number][]): TrackFrameData[] {
+    if (ranges.length === 1 && ranges[0][0] === 0 && ranges[0][1] === frames.length) return frames
+    const result: TrackFrameData[] = []
+    for (const [begin, end] of ranges) {
+        for (let i = begin; i < end; i++) result.push(frames[i])
+    }
+    return result
+}
@@ -8,27 +8,55 @@ interface FrameData {
     sy: number
     kx: number
     ky: number
+    /** [a, b, c, d, tx, ty] baked by reanim_converter --matrices; lerped instead of recomputed. */
+    matrix?: ArrayLike<number>
 }
 
 type TrackFrameData = FrameData & {
     alpha: number
     image: string | null
+    /** Keyframed tracks only: the track is hidden from the next frame on. */
+    hideAfter?: boolean
 }
 
+/** Axis-aligned bounds in reanim space (y down): [minX, minY, maxX, maxY]. */
+type AnimBounds = [number, number, number, number]
+
 interface AnimationData {
     fps: number
     startFrame: number
     endFrame: number
     duration: number
+    bounds?: AnimBounds | null
+    frameBounds?: (AnimBounds | null)[]
+    /** Chunked output only: the clip chunk holding this animation's frames. */
+    chunk?: string
 }
 
 interface SlotData {
     frames: FrameData[]
 }
 
+/** Typed-array views over a binary animation; see AnimBinary.ts. */
+interface TrackColumns {
+    frameIndex: Float32Array
+    x: Float32Array
+    y: Float32Array
+    sx: Float32Array
+    sy: Float32Array
+    kx: Float32Array
+    ky: Float32Array
+    alpha: Float32Array
+    image: Uint32Array
+    strings: readonly string[]
+}
+
 interface TrackData {
     frames: TrackFrameData[]
     zIndex: number
+    columns?: TrackColumns
+    /** Frames were keyframe-reduced; gaps are interpolated unless marked hideAfter. */
+    keyframed?: boolean
 }
 
 interface AnimNodeData {
@@ -37,4 +65,64 @@ interface AnimNodeData {
     tracks: Record<string, TrackData>
 }
 
-export type { FrameData, AnimNodeData, AnimationData, SlotData, TrackData, TrackFrameData }
+/** One track's frames, stored once per reanim by reanim_converter --shared-tracks. */
+interface SharedTrackData {
+    name: string
+    zIndex: number
+    frames: TrackFrameData[]
+    keyframed?: boolean
+}
+
+/** A node's view of a shared track: frames[begin:end] for each range, concatenated. */
+interface SharedTrackRef {
+    track: number
+    ranges: [number, number][]
+}
+
+interface SharedAnimNodeData {
+    animations: Record<string, AnimationData>
+    slots: Record<string, SlotData>
+    tracks: Record<string, SharedTrackRef>
+}
+
+interface SharedAnimData {
+    sharedTracks: SharedTrackData[]
+    nodes: Record<string, SharedAnimNodeData>
+}
+
+/** Index written by reanim_converter --format chunks; frames live in per-clip chunks. */
+interface AnimChunkIndex {
+    nodes: Record<
+        string,
+        {
+            animations: Record<string, AnimationData>
+            /** Frames live in the clip chunks. */
+            slots: Record<string, Record<string, never>>
+            tracks: Record<string, { zIndex: number; keyframed?: boolean }>
+        }
+    >
+}
+
+/** One clip's frames for every slot and track it touches, plus its per-frame bounds. */
+interface AnimChunkData {
+    tracks: Record<string, TrackFrameData[]>
+    slots: Record<string, FrameData[]>
+    frameBounds?: (AnimBounds | null)[]
+}
+
+export type {
+    AnimBounds,
+    AnimChunkData,
+    AnimChunkIndex,
+    FrameData,
+    AnimNodeData,
+    AnimationData,
+    SharedAnimData,
+    SharedAnimNodeData,
+    SharedTrackData,
+    SharedTrackRef,
+    SlotData,
+    TrackColumns,
+    TrackData,
+    TrackFrameData,
+}
@@ -15,8 +15,18 @@ import {
     Vec3,
     toRadian,
 } from 'cc'
-import type { AnimNodeData, TrackFrameData } from './Animator.d'
+import type {
+    AnimChunkData,
+    AnimChunkIndex,
+    AnimNodeData,
+    SharedAnimData,
+    TrackFrameData,
+} from './Animator.d'
 import { AnimNode } from './AnimNode'
+import { decodeAnimBinary, getColumnImage } from './AnimBinary'
+import { createChunkedNodeData, getAnimChunkBasePath, mergeAnimChunk } from './AnimChunks'
+import { isSharedAnimData, resolveSharedAnimData } from './AnimShared'
+import { AssetLoader } from '../AssetLoader'
 import { SpriteLoader } from '../SpriteLoader'
 import { scaleGameDeltaTime } from '@/game/GameDefinitions'
 
@@ -33,6 +43,12 @@ interface FrameMapValue {
 export class Animator extends Component {
     public static timeScale = 1
 
+    /**
+     * Skip sampling AnimNodes on frames the converter marked as drawing nothing.
+     * Off by default because hidden frames still feed getTrackFrame().
+     */
+    public cullInvisibleFrames = false
+
     private _nodeDataMap: Record<string, AnimNodeData> = {}
     private _animNodes: AnimNode[] = []
     private _trackNodes: Map<string, Node> = new Map()
@@ -55,10 +71,20 @@ export class Animator extends Component {
     private _trackNameCache: string[] | null = null
     private _sortDirty = true
     private _applyingPose = false
+    private _chunkBasePath: string | null = null
+    private _chunkLoads: Map<string, Promise<void>> = new Map()
 
     // ── Initialization ─────────────────────────────────────────
 
-    async parseJson(json: Record<string, AnimNodeData>) {
+    async parseJson(data: Record<string, AnimNodeData> | SharedAnimData | AnimChunkIndex) {
+        const chunkBasePath = getAnimChunkBasePath(data)
+        if (chunkBasePath !== null) {
+            await this.parseChunkIndex(data as AnimChunkIndex, chunkBasePath)
+            return
+        }
+        const json = isSharedAnimData(data)
+            ? resolveSharedAnimData(data)
+            : (data as Record<string, AnimNodeData>)
         this._nodeDataMap = json
         this._animNodes = []
         this._trackNodes.clear()
@@ -74,10 +100,39 @@ export class Animator extends Component {
         this._sortedTracks.length = 0
         this._trackNameCache = null
         this._sortDirty = true
+        this._chunkBasePath = null
+        this._chunkLoads.clear()
 
         await this._preloadImages(json)
     }
 
+    /** Same as parseJson, for a .bin written by reanim_converter --format binary. */
+    async parseBinary(buffer: ArrayBuffer) {
+        await this.parseJson(decodeAnimBinary(buffer))
+    }
+
+    /**
+     * Same as parseJson, for the index.json written by reanim_converter --format chunks.
+     * Tracks start empty; playing a clip loads its chunk, or await loadClips beforehand.
+     */
+    async parseChunkIndex(index: AnimChunkIndex, basePath: string) {
+        await this.parseJson(createChunkedNodeData(index))
+        this._chunkBasePath = basePath
+    }
+
+    /** Loads the chunks behind a node's clips (every clip when omitted). */
+    async loadClips(nodeName: string, clips?: string[]) {
+        const data = this._nodeDataMap[nodeName]
+        if (!data || this._chunkBasePath === null) return
+        const chunkNames = new Set<string>()
+        for (const clip of clips ?? Object.keys(data.animations)) {
+            const chunk = data.animations[clip]?.chunk
+            if (chunk) chunkNames.add(chunk)
+            else warn(`[Animator] Clip '${clip}' has no chunk in '${nodeName}'`)
+        }
+        await Promise.all(Array.from(chunkNames, (chunk) => this._loadChunk(chunk)))
+    }
+
     // ── Public API ─────────────────────────────────────────────
 
     public addAnimNode(name: string): AnimNode | null {
@@ -86,11 +141,21 @@ export class Animator extends Component {
             warn(`[Animator] AnimNode data '${name}' not found`)
             return null
         }
-        const node = new AnimNode(data, () => this._applyCurrentPose())
+        const onPlay = this._chunkBasePath === null ? undefined : (clip: string) => {
+            void this.loadClips(name, [clip]).then(() => {
+                if (this.isValid) this._applyCurrentPose()
+            })
+        }
+        const node = new AnimNode(data, () => this._applyCurrentPose(), onPlay)
         this._animNodes.push(node)
         return node
     }
 
+    /** A node's data as parsed: shared tracks expanded, chunked tracks filled as clips load. */
+    public getNodeData(name: string): AnimNodeData | null {
+        return this._nodeDataMap[name] ?? null
+    }
+
     public stopAnimNode(animNode: AnimNode | null) {
         if (!animNode) return
 
@@ -114,13 +179,13 @@ export class Animator extends Component {
     }
 
     public hidePrefix(prefix: string) {
-        for (const trackName of this._getTrackNames()) {
+        for (const trackName of this.getTrackNames()) {
             if (trackName.startsWith(prefix)) this.hideTrack(trackName)
         }
     }
 
     public showPrefix(prefix: string) {
-        for (const trackName of this._getTrackNames()) {
+        for (const trackName of this.getTrackNames()) {
             if (trackName.startsWith(prefix)) this.showTrack(trackName)
         }
     }
@@ -219,6 +284,7 @@ export class Animator extends Component {
 
             // 1. Update all AnimNodes (compute frames)
             for (const animNode of this._animNodes) {
+                animNode.skipInvisibleFrames = this.cullInvisibleFrames
                 animNode.update(scaledDt)
             }
 
@@ -480,6 +546,42 @@ export class Animator extends Component {
         return additiveSpriteMaterial
     }
 
+    // ── Clip Chunks ────────────────────────────────────────────
+
+    private _loadChunk(chunk: string): Promise<void> {
+        let pending = this._chunkLoads.get(chunk)
+        if (pending) return pending
+
+        const nodeDataMap = this._nodeDataMap
+        const path = `${this._chunkBasePath}/${chunk}`
+        pending = AssetLoader.load<JsonAsset>(path, JsonAsset).then(async (asset) => {
+            // Skip chunks that finish after parseJson switched to other data.
+            if (!asset || this._nodeDataMap !== nodeDataMap) return
+            const chunkData = asset.json as AnimChunkData
+            for (const name in nodeDataMap) {
+                mergeAnimChunk(nodeDataMap[name], chunkData, chunk)
+            }
+            await this._preloadChunkImages(chunkData)
+        })
+        this._chunkLoads.set(chunk, pending)
+        return pending
+    }
+
+    private async _preloadChunkImages(chunk: AnimChunkData) {
+        const seenImages = new Set<string>()
+        const promises: Promise<SpriteFrame | null>[] = []
+        for (const trackName in chunk.tracks) {
+            for (const frame of chunk.tracks[trackName]) {
+                const imageName = Animator._normalizeImageName(frame.image)
+                if (imageName && !seenImages.has(imageName)) {
+                    seenImages.add(imageName)
+                    promises.push(SpriteLoader.load(imageName))
+                }
+            }
+        }
+        await Promise.all(promises)
+    }
+
     // ── Image Preloading ───────────────────────────────────────
 
     private async _preloadImages(json: Record<string, AnimNodeData>) {
@@ -491,8 +593,12 @@ export class Animator extends Component {
             const tracks = nodeData.tracks
             for (const trackName in tracks) {
                 const track = tracks[trackName]
-                for (const frame of track.frames) {
-                    const imageName = Animator._normalizeImageName(frame?.image)
+                const columns = track.columns
+                const frameCount = columns ? columns.image.length : track.frames.length
+                for (let i = 0; i < frameCount; i++) {
+                    // Binary tracks expose images without materializing frames.
+                    const image = columns ? getColumnImage(columns, i) : track.frames[i]?.image
+                    const imageName = Animator._normalizeImageName(image)
                     if (imageName && !seenImages.has(imageName)) {
                         seenImages.add(imageName)
                         promises.push(SpriteLoader.load(imageName))
@@ -517,7 +623,7 @@ export class Animator extends Component {
         return SpriteLoader.load(name)
     }
 
-    private _getTrackNames() {
+    public getTrackNames(): readonly string[] {
         if (this._trackNameCache) return this._trackNameCache
 
         const trackNames = new Set<string>()
@@ -1,4 +1,18 @@
 import { Animator } from './Animator'
 import { AnimNode } from './AnimNode'
+import { decodeAnimBinary } from './AnimBinary'
+import { loadAnimJson } from './AnimChunks'
+import { chooseAnimLodFactor, getAnimLodPath, isAnimLodPath } from './AnimLod'
+import { resolveAnimNodeData, resolveSharedAnimData } from './AnimShared'
 
-export { Animator, AnimNode }
+export {
+    Animator,
+    AnimNode,
+    chooseAnimLodFactor,
+    decodeAnimBinary,
+    getAnimLodPath,
+    isAnimLodPath,
+    loadAnimJson,
+    resolveAnimNodeData,
+    resolveSharedAnimData,
+}
@@ -56,6 +56,15 @@ export class AssetLoader {
         return promise
     }
 
+    static has(path: string, type: any): boolean {
+        return resources.getInfoWithPath(path, type) !== null
+    }
+
+    /** Paths of every asset of the type under a directory, without loading them. */
+    static listDir(path: string, type: any): string[] {
+        return resources.getDirWithPath(path, type).map((info) => info.path)
+    }
+
     static clearPending() {
         this._pending.clear()
         this._pendingDirs.clear()
@@ -9,7 +9,6 @@ import {
     Size,
     Sprite,
     SpriteFrame,
-    Texture2D,
     Vec2,
 } from 'cc'
 import { GAME_TICK_SECONDS, scaleGameDeltaTime } from '@/game/GameDefinitions'
@@ -586,18 +585,20 @@ class TodParticleEmitter {
         if (frameCount === 1 && columnCount === 1 && rowCount === 1) return atlas
 
         const frameIndex = Math.floor(Math.random() * frameCount)
-        const texture = atlas.texture as Texture2D
-        const textureWidth = texture.width || atlas.originalSize.width
-        const textureHeight = texture.height || atlas.originalSize.height
-        const width = textureWidth / columnCount
-        const height = textureHeight / rowCount
+        // The sheet may be trimmed and/or sit inside a packed atlas page, so slice its untrimmed
+        // extent around the frame rect rather than the whole texture.
+        const { rect, offset, originalSize } = atlas
+        const sheetX = rect.x - ((originalSize.width - rect.width) / 2 + offset.x)
+        const sheetY = rect.y - ((originalSize.height - rect.height) / 2 - offset.y)
+        const width = originalSize.width / columnCount
+        const height = originalSize.height / rowCount
         const column = Math.min(columnCount - 1, Math.max(0, this.definition.imageCol + frameIndex))
         const row = Math.min(rowCount - 1, Math.max(0, this.definition.imageRow))
         const frame = new SpriteFrame()
         frame.packable = false
         frame.reset({
             texture: atlas.texture,
-            rect: new Rect(column * width, row * height, width, height),
+            rect: new Rect(sheetX + column * width, sheetY + row * height, width, height),
             originalSize: new Size(width, height),
             offset: new Vec2(0, 0),
             isRotate: false,
@@ -0,0 +1,99 @@
+import { ImageAsset, JsonAsset, SpriteFrame, Texture2D } from 'cc'
+import { AssetLoader } from './AssetLoader'
+import { SpriteWebp } from './SpriteWebp'
+
+const ALPHA_MASK_MANIFEST_PATH = 'texture_alpha_masks'
+
+/**
+ * JPEG textures shipped with a separate 8-bit alpha mask (process_pak.py --split-alpha).
+ * The manifest maps a texture name to its mask's name; both sit under textures/ and are
+ * merged into one RGBA texture on load, on web and native alike.
+ */
+export class SpriteAlphaMask {
+    private static _masks: Record<string, string> | null = null
+    private static _loading: Promise<Record<string, string> | null> | null = null
+
+    static async load(): Promise<Record<string, string> | null> {
+        if (this._masks) return this._masks
+        if (this._loading) return this._loading
+
+        this._loading = (async () => {
+            const asset = await AssetLoader.load<JsonAsset>(
+                ALPHA_MASK_MANIFEST_PATH,
+                JsonAsset,
+                null,
+            )
+            this._masks = (asset?.json as Record<string, string> | undefined) ?? null
+            return this._masks
+        })()
+
+        return this._loading
+    }
+
+    static async getMask(name: string): Promise<string | null> {
+        const masks = await this.load()
+        return masks?.[name] ?? null
+    }
+
+    static async loadSpriteFrame(name: string, mask: string): Promise<SpriteFrame | null> {
+        const [colourAsset, maskAsset] = await Promise.all([
+            AssetLoader.load<ImageAsset>(`textures/${name}`, ImageAsset, null),
+            SpriteWebp.resolve(`textures/${mask}`).then((path) =>
+                AssetLoader.load<ImageAsset>(path, ImageAsset, null),
+            ),
+        ])
+        if (!colourAsset || !maskAsset) return null
+
+        const { width, height } = colourAsset
+        const colour = readPixels(colourAsset)
+        const alpha = readPixels(maskAsset)
+        if (!colour || !alpha || maskAsset.width !== width || maskAsset.height !== height) {
+            return null
+        }
+
+        const pixelCount = width * height
+        const colourStride = colour.length / pixelCount
+        const alphaStride = alpha.length / pixelCount
+        const rgba = new Uint8Array(pixelCount * 4)
+        for (let i = 0; i < pixelCount; i++) {
+            const c = i * colourStride
+            const o = i * 4
+            rgba[o] = colour[c]
+            rgba[o + 1] = colour[colourStride >= 3 ? c + 1 : c]
+            rgba[o + 2] = colour[colourStride >= 3 ? c + 2 : c]
+            rgba[o + 3] = alpha[i * alphaStride]
+        }
+
+        const texture = new Texture2D()
+        texture.image = new ImageAsset({
+            _data: rgba,
+            _compressed: false,
+            width,
+            height,
+            format: Texture2D.PixelFormat.RGBA8888,
+        })
+        const spriteFrame = new SpriteFrame()
+        spriteFrame.texture = texture
+        return spriteFrame
+    }
+}
+
+/** Decoded pixel bytes of an image asset, 1–4 bytes per pixel. */
+function readPixels(asset: ImageAsset): Uint8Array | null {
+    const data = asset.data
+    // Native builds decode into an image element that keeps its pixels in _data.
+    const bytes = ArrayBuffer.isView(data) ? data : (data as { _data?: unknown } | null)?._data
+    if (ArrayBuffer.isView(bytes)) {
+        return new Uint8Array(bytes.buffer, bytes.byteOffset, bytes.byteLength)
+    }
+    if (!data || typeof document === 'undefined') return null
+
+    const canvas = document.createElement('canvas')
+    canvas.width = asset.width
+    canvas.height = asset.height
+    const context = canvas.getContext('2d')
+    if (!context) return null
+    context.drawImage(data as CanvasImageSource, 0, 0)
+    const { data: pixels } = context.getImageData(0, 0, asset.width, asset.height)
+    return new Uint8Array(pixels.buffer, pixels.byteOffset, pixels.byteLength)
+}
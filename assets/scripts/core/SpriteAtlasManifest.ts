@@ -0,0 +1,46 @@
+import { JsonAsset } from 'cc'
+import { AssetLoader } from './AssetLoader'
+import type { SpriteSampling } from './SpriteResourceManifest'
+
+export interface SpriteAtlasFrame {
+    atlas: string
+    /** x, y, width, height in atlas pixels, origin top-left. */
+    rect: [number, number, number, number]
+    sampling: SpriteSampling
+}
+
+interface SpriteAtlasManifestData {
+    atlases: Record<string, { width: number; height: number; sampling: SpriteSampling }>
+    frames: Record<string, SpriteAtlasFrame>
+}
+
+const ATLAS_DIR = 'atlases'
+const ATLAS_MANIFEST_PATH = `${ATLAS_DIR}/atlas_manifest`
+
+/** Sprites packed by tools/texture_atlas_packer.py; absent when no atlases were built. */
+export class SpriteAtlasManifest {
+    private static _manifest: SpriteAtlasManifestData | null = null
+    private static _loading: Promise<SpriteAtlasManifestData | null> | null = null
+
+    static async load(): Promise<SpriteAtlasManifestData | null> {
+        if (this._manifest) return this._manifest
+        if (this._loading) return this._loading
+
+        this._loading = (async () => {
+            const asset = await AssetLoader.load<JsonAsset>(ATLAS_MANIFEST_PATH, JsonAsset, null)
+            this._manifest = (asset?.json as SpriteAtlasManifestData | undefined) ?? null
+            return this._manifest
+        })()
+
+        return this._loading
+    }
+
+    static async getFrame(name: string): Promise<SpriteAtlasFrame | null> {
+        const manifest = await this.load()
+        return manifest?.frames[name] ?? null
+    }
+
+    static getAtlasPath(atlas: string): string {
+        return `${ATLAS_DIR}/${atlas}`
+    }
+}
@@ -1,6 +1,10 @@
-import { dynamicAtlasManager, macro, SpriteFrame, Texture2D, warn } from 'cc'
+import { dynamicAtlasManager, macro, Rect, Size, SpriteFrame, Texture2D, Vec2, warn } from 'cc'
 import { AssetLoader } from './AssetLoader'
+import { SpriteAlphaMask } from './SpriteAlphaMask'
+import { SpriteAtlasManifest, type SpriteAtlasFrame } from './SpriteAtlasManifest'
 import { SpriteResourceManifest, type SpriteSampling } from './SpriteResourceManifest'
+import { SpriteTrimManifest } from './SpriteTrimManifest'
+import { SpriteWebp } from './SpriteWebp'
 
 export class SpriteLoader {
     private static _cache: Map<string, SpriteFrame> = new Map()
@@ -51,6 +55,7 @@ export class SpriteLoader {
         const mainSf = await this._loadRaw(name)
 
         if (mainSf) {
+            await this._restoreTrim(name, mainSf)
             this._applySpriteSampling(mainSf, SpriteResourceManifest.getSampling(name))
             this._cache.set(name, mainSf)
         } else {
@@ -100,10 +105,75 @@ export class SpriteLoader {
 
     // ── Raw Loading ────────────────────────────────────────────
 
-    private static _loadRaw(name: string): Promise<SpriteFrame | null> {
-        return AssetLoader.load(`textures/${name}/spriteFrame`, SpriteFrame, null).then((sf) => {
+    private static async _loadRaw(name: string): Promise<SpriteFrame | null> {
+        const atlasFrame = await SpriteAtlasManifest.getFrame(name)
+        if (atlasFrame) {
+            const sf = await this._loadAtlasFrame(atlasFrame)
             if (sf) return sf
-            return AssetLoader.load(`textures/${name}`, SpriteFrame, null)
+        }
+
+        const alphaMask = await SpriteAlphaMask.getMask(name)
+        if (alphaMask) {
+            // The colour JPEG alone would draw as an opaque rectangle, so never fall back to it.
+            const sf = await SpriteAlphaMask.loadSpriteFrame(name, alphaMask)
+            if (!sf) warn(`[SpriteLoader] Could not merge '${name}' with alpha mask '${alphaMask}'`)
+            return sf
+        }
+
+        const path = `textures/${name}`
+        const webpPath = await SpriteWebp.resolve(path)
+        if (webpPath !== path) {
+            const sf = await this._loadTexture(webpPath)
+            if (sf) return sf
+        }
+        return this._loadTexture(path)
+    }
+
+    private static async _loadTexture(path: string): Promise<SpriteFrame | null> {
+        const sf = await AssetLoader.load<SpriteFrame>(`${path}/spriteFrame`, SpriteFrame, null)
+        if (sf) return sf
+        return AssetLoader.load(path, SpriteFrame, null)
+    }
+
+    private static async _loadAtlasFrame(frame: SpriteAtlasFrame): Promise<SpriteFrame | null> {
+        const atlasPath = SpriteAtlasManifest.getAtlasPath(frame.atlas)
+        const webpPath = await SpriteWebp.resolve(atlasPath)
+        let texture: Texture2D | null = null
+        if (webpPath !== atlasPath) {
+            texture = await AssetLoader.load<Texture2D>(`${webpPath}/texture`, Texture2D, null)
+        }
+        if (!texture) {
+            texture = await AssetLoader.load<Texture2D>(`${atlasPath}/texture`, Texture2D, null)
+        }
+        if (!texture) return null
+
+        const [x, y, width, height] = frame.rect
+        const spriteFrame = new SpriteFrame()
+        spriteFrame.reset({
+            texture,
+            rect: new Rect(x, y, width, height),
+            originalSize: new Size(width, height),
+            offset: new Vec2(0, 0),
+            isRotate: false,
+        })
+        return spriteFrame
+    }
+
+    /** Give a trimmed texture its untrimmed size back so callers place it as before. */
+    private static async _restoreTrim(name: string, spriteFrame: SpriteFrame) {
+        const trim = await SpriteTrimManifest.get(name)
+        const rect = spriteFrame.rect
+        // Skip stale entries for textures that were written untrimmed since.
+        if (!trim || rect.width !== trim.rect[2] || rect.height !== trim.rect[3]) return
+
+        const [width, height] = trim.size
+        const [x, y, trimmedWidth, trimmedHeight] = trim.rect
+        spriteFrame.reset({
+            originalSize: new Size(width, height),
+            offset: new Vec2(
+                spriteFrame.offset.x + x + trimmedWidth / 2 - width / 2,
+                spriteFrame.offset.y + height / 2 - (y + trimmedHeight / 2),
+            ),
         })
     }
 
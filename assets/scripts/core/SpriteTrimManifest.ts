@@ -0,0 +1,35 @@
+import { JsonAsset } from 'cc'
+import { AssetLoader } from './AssetLoader'
+
+export interface SpriteTrim {
+    /** Untrimmed width, height. */
+    size: [number, number]
+    /** Kept area within the untrimmed image: x, y, width, height, origin top-left. */
+    rect: [number, number, number, number]
+}
+
+const TRIM_MANIFEST_PATH = 'texture_trim'
+
+/** Textures cropped by reanim_converter.py --trim-textures; absent when nothing was trimmed. */
+export class SpriteTrimManifest {
+    private static _trims: Record<string, SpriteTrim> | null = null
+    private static _loading: Promise<Record<string, SpriteTrim> | null> | null = null
+
+    static async load(): Promise<Record<string, SpriteTrim> | null> {
+        if (this._trims) return this._trims
+        if (this._loading) return this._loading
+
+        this._loading = (async () => {
+            const asset = await AssetLoader.load<JsonAsset>(TRIM_MANIFEST_PATH, JsonAsset, null)
+            this._trims = (asset?.json as Record<string, SpriteTrim> | undefined) ?? null
+            return this._trims
+        })()
+
+        return this._loading
+    }
+
+    static async get(name: string): Promise<SpriteTrim | null> {
+        const trims = await this.load()
+        return trims?.[name] ?? null
+    }
+}
@@ -0,0 +1,33 @@
+import { JsonAsset, sys } from 'cc'
+import { AssetLoader } from './AssetLoader'
+
+const WEBP_VARIANT_SUFFIX = '__webp'
+
+/**
+ * WebP copies written next to PNG textures by tools/webp_export.py. Each resource directory
+ * has a manifest (<dir>_webp) of the names that have one; the PNG stays as the fallback for
+ * runtimes without WebP support.
+ */
+export class SpriteWebp {
+    private static _manifests: Map<string, Promise<Record<string, string> | null>> = new Map()
+
+    static load(dir: string): Promise<Record<string, string> | null> {
+        let loading = this._manifests.get(dir)
+        if (!loading) {
+            loading = AssetLoader.load<JsonAsset>(`${dir}_webp`, JsonAsset, null).then(
+                (asset) => (asset?.json as Record<string, string> | undefined) ?? null,
+            )
+            this._manifests.set(dir, loading)
+        }
+        return loading
+    }
+
+    /** Resource path to load for `path` (dir/name): its WebP variant where that is usable. */
+    static async resolve(path: string): Promise<string> {
+        const slash = path.indexOf('/')
+        if (slash < 0 || !sys.hasFeature(sys.Feature.WEBP)) return path
+
+        const manifest = await this.load(path.slice(0, slash))
+        return manifest?.[path.slice(slash + 1)] ? `${path}${WEBP_VARIANT_SUFFIX}` : path
+    }
+}
@@ -0,0 +1,79 @@
+import { JsonAsset } from 'cc'
+import { AssetLoader } from './AssetLoader'
+import { SpriteLoader } from './SpriteLoader'
+
+interface TextureUsageEntry {
+    textures: string[]
+    /** Decoded RGBA8 size of the textures. */
+    bytes: number
+}
+
+interface TextureUsageIndex {
+    textures: Record<string, { width: number; height: number; bytes: number }>
+    reanims: Record<string, TextureUsageEntry & { clips: Record<string, TextureUsageEntry> }>
+    particles: Record<string, TextureUsageEntry>
+    missing: string[]
+}
+
+/** Which entities use which textures; see tools/texture_usage_index.py. */
+export interface TextureUsageRequest {
+    reanims?: readonly string[]
+    /** "reanim:node/clip" entries, for preloading only the clips a level plays. */
+    clips?: readonly string[]
+    particles?: readonly string[]
+}
+
+const TEXTURE_USAGE_PATH = 'texture_usage'
+
+export class TextureUsage {
+    private static _index: TextureUsageIndex | null = null
+    private static _loading: Promise<TextureUsageIndex | null> | null = null
+
+    static async load(): Promise<TextureUsageIndex | null> {
+        if (this._index) return this._index
+        if (this._loading) return this._loading
+
+        this._loading = (async () => {
+            const asset = await AssetLoader.load<JsonAsset>(
+                TEXTURE_USAGE_PATH,
+                JsonAsset,
+                'Texture usage index',
+            )
+            this._index = (asset?.json as TextureUsageIndex | undefined) ?? null
+            this._loading = null
+            return this._index
+        })()
+
+        return this._loading
+    }
+
+    /** Texture names needed by the requested entities, plus their decoded byte total. */
+    static async resolve(
+        request: TextureUsageRequest,
+    ): Promise<{ textures: string[]; bytes: number }> {
+        const index = await this.load()
+        const names = new Set<string>()
+        if (index) {
+            for (const name of request.reanims ?? []) {
+                for (const texture of index.reanims[name]?.textures ?? []) names.add(texture)
+            }
+            for (const key of request.clips ?? []) {
+                const separator = key.indexOf(':')
+                const clip = index.reanims[key.slice(0, separator)]?.clips[key.slice(separator + 1)]
+                for (const texture of clip?.textures ?? []) names.add(texture)
+            }
+            for (const name of request.particles ?? []) {
+                for (const texture of index.particles[name]?.textures ?? []) names.add(texture)
+            }
+        }
+
+        let bytes = 0
+        for (const name of names) bytes += index?.textures[name]?.bytes ?? 0
+        return { textures: Array.from(names), bytes }
+    }
+
+    static async preload(request: TextureUsageRequest): Promise<void> {
+        const { textures } = await this.resolve(request)
+        await Promise.all(textures.map((name) => SpriteLoader.load(name)))
+    }
+}
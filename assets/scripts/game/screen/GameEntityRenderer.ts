@@ -1087,7 +1087,7 @@ export abstract class GameEntityRenderer extends GameScreenEndSequences {
                 const tint = plantType === 'explodenut'
                     ? new Color(255, 64, 64, opacity)
                     : new Color(255, 255, 255, opacity)
-                this._setAnimatorColor(animator, animationJson, tint)
+                this._setAnimatorColor(animator, tint)
                 const currentPlant = plantId == null
                     ? null
                     : this._session.plants.find((item) => item.id === plantId)
@@ -1123,17 +1123,13 @@ export abstract class GameEntityRenderer extends GameScreenEndSequences {
         this._playPlantAnimation(plant.id, plant.bodyAnimation.animation, plant.bodyAnimation.time)
     }
 
-    protected _setAnimatorOpacity(animator: Animator, animationJson: Record<string, any>, opacity: number) {
-        this._setAnimatorColor(animator, animationJson, new Color(255, 255, 255, opacity))
+    protected _setAnimatorOpacity(animator: Animator, opacity: number) {
+        this._setAnimatorColor(animator, new Color(255, 255, 255, opacity))
     }
 
-    protected _setAnimatorColor(animator: Animator, animationJson: Record<string, any>, color: Color) {
-        for (const nodeData of Object.values(animationJson)) {
-            const tracks = (nodeData as { tracks?: Record<string, unknown> }).tracks
-            if (!tracks) continue
-            for (const trackName of Object.keys(tracks)) {
-                animator.setTrackColor(trackName, color)
-            }
+    protected _setAnimatorColor(animator: Animator, color: Color) {
+        for (const trackName of animator.getTrackNames()) {
+            animator.setTrackColor(trackName, color)
         }
     }
 
@@ -1419,10 +1415,7 @@ export abstract class GameEntityRenderer extends GameScreenEndSequences {
         if (view.baseColorSignature === signature) return
         view.baseColorSignature = signature
 
-        const animationJson = this._zombieAnimations.get(zombie.type)?.json
-        if (view.animator && animationJson) {
-            this._setAnimatorColor(view.animator, animationJson as Record<string, any>, color)
-        }
+        if (view.animator) this._setAnimatorColor(view.animator, color)
     }
 
     protected _syncZombieBaseColor(view: ZombieView, zombie: ZombieEntity) {
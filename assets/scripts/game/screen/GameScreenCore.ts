@@ -22,7 +22,7 @@ import {
     Vec3,
 } from 'cc'
 import { DEBUG } from 'cc/env'
-import { Animator } from '@/core/Animator'
+import { Animator, resolveAnimNodeData } from '@/core/Animator'
 import { AnimNode } from '@/core/Animator/AnimNode'
 import { ParticleDefinitionLoader, TodParticleSystem, type TodParticleEffect } from '@/core/Particle'
 import { FontLoader, type BitmapFontAssets } from '@/core/FontLoader'
@@ -4063,9 +4063,10 @@ export abstract class GameScreenCore extends Component {
     }
 
     protected _collectAnimationImages(json: Record<string, any>, output: Set<string>) {
-        for (const nodeName in json) {
-            const tracks = json[nodeName]?.tracks
-            for (const trackName in tracks ?? {}) {
+        const nodes = resolveAnimNodeData(json)
+        for (const nodeName in nodes) {
+            const tracks = nodes[nodeName]?.tracks ?? {}
+            for (const trackName in tracks) {
                 for (const frame of tracks[trackName]?.frames ?? []) {
                     if (frame?.image) output.add(frame.image)
                 }
@@ -1,5 +1,5 @@
 import { JsonAsset, type SpriteFrame } from 'cc'
-import { AssetLoader } from '@/core/AssetLoader'
+import { loadAnimJson } from '@/core/Animator'
 import { FontLoader, type BitmapFontAssets } from '@/core/FontLoader'
 import { SpriteLoader } from '@/core/SpriteLoader'
 
@@ -228,7 +228,7 @@ export class AlmanacScreenAssets {
     static async loadAnimations(): Promise<AlmanacAnimationMap> {
         const animations = await Promise.all(
             ALMANAC_ANIMATIONS.map((name) =>
-                AssetLoader.load(`animations/${name}`, JsonAsset, `almanac animation: ${name}`),
+                loadAnimJson(`animations/${name}`, `almanac animation: ${name}`),
             ),
         )
         const map: AlmanacAnimationMap = {}
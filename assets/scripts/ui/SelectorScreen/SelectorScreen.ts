@@ -263,7 +263,7 @@ export class SelectorScreen extends AnimationComponent {
         const bodyAnimator = this._createZombieHandAnimator(clippedNode, 'BodyAnimator')
         const rockAnimator = this._createZombieHandAnimator(zombieHandNode, 'RockAnimator')
 
-        const trackNames = Object.keys(this.zombieArmAnimation.json.default?.tracks ?? {})
+        const trackNames = bodyAnimator.getTrackNames()
         for (const trackName of trackNames) {
             if (trackName.startsWith('rock')) {
                 bodyAnimator.hideTrack(trackName)
@@ -341,7 +341,7 @@ export class SelectorScreen extends AnimationComponent {
     }
 
     private _lastTrackFrame(animationName: string, trackName: string) {
-        const frames = this.animation?.json?.[animationName]?.tracks?.[trackName]?.frames
+        const frames = this.animator?.getNodeData(animationName)?.tracks[trackName]?.frames
         return Array.isArray(frames) ? frames[frames.length - 1] as { frameIndex?: number } : null
     }
 
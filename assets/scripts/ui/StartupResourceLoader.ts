@@ -1,6 +1,7 @@
 import { JsonAsset } from 'cc'
 import { DEBUG } from 'cc/env'
 import { AssetLoader } from '@/core/AssetLoader'
+import { isAnimLodPath, loadAnimJson } from '@/core/Animator'
 import { FONT_NAMES, FontLoader } from '@/core/FontLoader'
 import { LawnStringLoader } from '@/core/LawnStringLoader'
 import { ParticleDefinitionLoader } from '@/core/Particle'
@@ -242,7 +243,10 @@ export class StartupResourceLoader {
     static async loadJson(path: string): Promise<JsonAsset | null> {
         if (this._jsonCache.has(path)) return this._jsonCache.get(path)!
 
-        const asset = await AssetLoader.load(path, JsonAsset, `JSON resource: ${path}`)
+        const label = `JSON resource: ${path}`
+        const asset = path.startsWith('animations/')
+            ? await loadAnimJson(path, label)
+            : await AssetLoader.load<JsonAsset>(path, JsonAsset, label)
         this._jsonCache.set(path, asset)
         return asset
     }
@@ -284,21 +288,14 @@ export class StartupResourceLoader {
                 .filter((animation): animation is JsonAsset => !!animation)
         }
 
-        const [dirAnimations, explicitAnimations] = await Promise.all([
-            AssetLoader.loadDir(
-                'animations',
-                JsonAsset,
-                'animation resources',
-            ),
-            Promise.all(STARTUP_ANIMATION_PATHS.map((path) => this.loadJson(path))),
-        ])
-        for (const animation of dirAnimations) {
-            this._jsonCache.set(`animations/${animation.name}`, animation)
-        }
-        return [
-            ...dirAnimations,
-            ...explicitAnimations.filter((animation): animation is JsonAsset => !!animation),
-        ]
+        // Only animations/<name>: clip chunks under animations/<name>/ load as they play,
+        // and _lod<N> variants only where a scene asks for them.
+        const dirPaths = AssetLoader.listDir('animations', JsonAsset).filter(
+            (path) => /^animations\/[^/]+$/.test(path) && !isAnimLodPath(path),
+        )
+        const paths = [...new Set([...dirPaths, ...STARTUP_ANIMATION_PATHS])]
+        return (await Promise.all(paths.map((path) => this.loadJson(path))))
+            .filter((animation): animation is JsonAsset => !!animation)
     }
 
     private static async _loadStartupTextures(
@@ -201,7 +201,7 @@ export class ZenGardenScreen extends MenuScreenBase {
 
         const animator = this._createAnimator(parent, name)
         await animator.parseJson(this._animations.treeOfWisdom.json)
-        for (const trackName of Object.keys(this._animations.treeOfWisdom.json.tree?.tracks ?? {})) {
+        for (const trackName of Object.keys(animator.getNodeData('tree')?.tracks ?? {})) {
             if (!visiblePrefixes.some((prefix) => trackName.startsWith(prefix))) {
                 animator.hideTrack(trackName)
             }
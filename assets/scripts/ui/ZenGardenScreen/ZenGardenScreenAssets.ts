@@ -1,6 +1,6 @@
 import { FontLoader, type BitmapFontAssets } from '@/core/FontLoader'
 import { SpriteLoader } from '@/core/SpriteLoader'
-import { AssetLoader } from '@/core/AssetLoader'
+import { loadAnimJson } from '@/core/Animator'
 import { JsonAsset, type SpriteFrame } from 'cc'
 
 const ZEN_GARDEN_SCREEN_SPRITES = [
@@ -105,7 +105,7 @@ export class ZenGardenScreenAssets {
     static async loadAnimations(): Promise<ZenGardenScreenAnimations | null> {
         const [treeOfWisdom, treeOfWisdomClouds] = await Promise.all(
             ZEN_GARDEN_SCREEN_ANIMATIONS.map((name) =>
-                AssetLoader.load(`animations/${name}`, JsonAsset, `animation: ${name}`),
+                loadAnimJson(`animations/${name}`, `animation: ${name}`),
             ),
         )
         if (!treeOfWisdom || !treeOfWisdomClouds) {
@@ -0,0 +1,105 @@
+"""Shared reader for PopCap .compiled caches (reanim and particle definitions)."""
+
+from __future__ import annotations
+
+import struct
+import zlib
+from collections.abc import Iterator
+from pathlib import Path
+
+
+COOKIE = 0xDEADFED4
+MAX_STRING_LENGTH = 100000
+READ_CHUNK_SIZE = 1 << 16
+
+HEADER = struct.Struct("<II")
+U32 = struct.Struct("<I")
+I32 = struct.Struct("<i")
+
+
+class CacheReader:
+    """Sequential reader over a decompressed cache; reads return views, not copies."""
+
+    def __init__(self, data: bytes | bytearray | memoryview, kind: str = "compiled") -> None:
+        self.data = memoryview(data)
+        self.pos = 0
+        self.kind = kind
+
+    def read(self, size: int) -> memoryview:
+        end = self.pos + size
+        if size < 0 or end > len(self.data):
+            raise ValueError(f"Unexpected end of {self.kind} cache")
+        chunk = self.data[self.pos:end]
+        self.pos = end
+        return chunk
+
+    def unpack(self, record: struct.Struct) -> tuple:
+        return record.unpack(self.read(record.size))
+
+    def iter_unpack(self, record: struct.Struct, count: int) -> Iterator[tuple]:
+        if count == 0:
+            return iter(())
+        return record.iter_unpack(self.read(record.size * count))
+
+    def read_u32(self) -> int:
+        return self.unpack(U32)[0]
+
+    def read_i32(self) -> int:
+        return self.unpack(I32)[0]
+
+    def read_string(self) -> str:
+        length = self.read_i32()
+        if length < 0 or length > MAX_STRING_LENGTH:
+            raise ValueError(f"Invalid string length: {length}")
+        if length == 0:
+            return ""
+        return str(self.read(length), "utf-8", errors="replace")
+
+    def check_consumed(self) -> None:
+        if self.pos != len(self.data):
+            raise ValueError(f"Unread trailing cache bytes: {len(self.data) - self.pos}")
+
+
+def unpack_compiled(path: Path) -> bytearray:
+    """Inflate a compiled cache chunk by chunk straight into a buffer of the declared size."""
+    with path.open("rb") as f:
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError(f"{path} is too small")
+
+        cookie, uncompressed_size = HEADER.unpack(header)
+        if cookie != COOKIE:
+            raise ValueError(f"{path} has invalid cookie 0x{cookie:08X}")
+
+        data = bytearray(uncompressed_size)
+        view = memoryview(data)
+        pos = 0
+        decompressor = zlib.decompressobj()
+
+        def append(piece: bytes) -> None:
+            nonlocal pos
+            end = pos + len(piece)
+            if end > uncompressed_size:
+                raise ValueError(
+                    f"{path} decompressed to more than the expected {uncompressed_size} bytes"
+                )
+            view[pos:end] = piece
+            pos = end
+
+        while chunk := f.read(READ_CHUNK_SIZE):
+            while chunk:
+                # Never inflate more than fits (+1 so an oversized stream fails in
+                # append); input held back by max_length stays in unconsumed_tail.
+                append(decompressor.decompress(chunk, uncompressed_size - pos + 1))
+                chunk = decompressor.unconsumed_tail
+            if decompressor.eof:
+                break
+        append(decompressor.flush())
+
+    if not decompressor.eof:
+        raise ValueError(f"{path} has a truncated zlib stream")
+    if pos != uncompressed_size:
+        raise ValueError(
+            f"{path} decompressed to {pos} bytes, expected {uncompressed_size}"
+        )
+    return data
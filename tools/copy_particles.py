@@ -7,11 +7,18 @@ loads copied images through SpriteLoader using names under textures/particles.
 """
 
 import argparse
-import shutil
 from pathlib import Path
 
 from PIL import Image
 
+from file_links import DEFAULT_LINK_STRATEGY, LINK_STRATEGIES, link_file
+from sprite_texture_preprocessor import (
+    OutputCache,
+    PngReduction,
+    print_png_reductions,
+    write_preprocessed_resource,
+)
+
 
 SUPPORTED_PARTICLE_IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg"}
 
@@ -26,7 +33,14 @@ def is_valid_image(path: Path) -> bool:
         return False
 
 
-def copy_particles(src_dir: Path, dst_dir: Path, overwrite: bool = False) -> int:
+def copy_particles(
+    src_dir: Path,
+    dst_dir: Path,
+    overwrite: bool = False,
+    reductions: list[PngReduction] | None = None,
+    cache: OutputCache | None = None,
+    link: str = DEFAULT_LINK_STRATEGY,
+) -> int:
     dst_dir.mkdir(parents=True, exist_ok=True)
 
     copied = 0
@@ -43,7 +57,15 @@ def copy_particles(src_dir: Path, dst_dir: Path, overwrite: bool = False) -> int
         if dst.exists() and not overwrite:
             continue
 
-        shutil.copy2(src, dst)
+        if cache is not None:
+            if not write_preprocessed_resource(
+                src, dst, reductions=reductions, cache=cache, link=link
+            ):
+                continue
+        elif reductions is not None and dst.suffix == ".png":
+            write_preprocessed_resource(src, dst, reductions=reductions, link=link)
+        else:
+            link_file(src, dst, link)
         print(f"[particles] Wrote: {dst}")
         copied += 1
 
@@ -65,13 +87,27 @@ def main():
         help="Destination under the Cocos resources texture directory.",
     )
     parser.add_argument("--overwrite", action="store_true", help="Replace existing copied files.")
+    parser.add_argument(
+        "--reduce-png",
+        action="store_true",
+        help="Write PNGs as indexed or grayscale PNGs when that is lossless and smaller.",
+    )
+    parser.add_argument(
+        "--link",
+        choices=LINK_STRATEGIES,
+        default=DEFAULT_LINK_STRATEGY,
+        help="How images are placed (see file_links.py).",
+    )
     args = parser.parse_args()
 
     if not args.src.exists():
         raise FileNotFoundError(f"Particle source directory does not exist: {args.src}")
 
-    count = copy_particles(args.src, args.dst, args.overwrite)
+    reductions: list[PngReduction] | None = [] if args.reduce_png else None
+    count = copy_particles(args.src, args.dst, args.overwrite, reductions, link=args.link)
     print(f"[particles] Copied {count} particle image files -> {args.dst}")
+    if reductions is not None:
+        print_png_reductions(reductions, "[particles]")
 
 
 if __name__ == "__main__":
@@ -12,6 +12,7 @@ import shutil
 import subprocess
 from pathlib import Path
 
+from file_links import DEFAULT_LINK_STRATEGY, LINK_STRATEGIES, link_file
 
 SUPPORTED_SOUND_SUFFIXES = (".au", ".ogg", ".mp3", ".wav")
 OUTPUT_SUFFIX = ".wav"
@@ -20,10 +21,16 @@ def _resource_stem(path: Path) -> str:
     return path.with_suffix("").name.lower()
 
 
-def convert_sound(ffmpeg: str, src: Path, dst: Path, overwrite: bool) -> None:
+def convert_sound(
+    ffmpeg: str,
+    src: Path,
+    dst: Path,
+    overwrite: bool,
+    link: str = DEFAULT_LINK_STRATEGY,
+) -> None:
     if src.suffix.lower() == OUTPUT_SUFFIX:
         if overwrite or not dst.exists():
-            shutil.copy2(src, dst)
+            link_file(src, dst, link)
         return
 
     ffmpeg_path = resolve_ffmpeg(ffmpeg)
@@ -38,6 +45,9 @@ def convert_sound(ffmpeg: str, src: Path, dst: Path, overwrite: bool) -> None:
         "-acodec",
         "pcm_s16le",
     ]
+    # ffmpeg -y truncates dst in place; drop a hardlink left by an earlier .wav passthrough.
+    if overwrite:
+        dst.unlink(missing_ok=True)
     if src.suffix.lower() != ".au":
         args.extend(["-ar", "44100", "-ac", "2"])
     args.append(str(dst))
@@ -62,7 +72,13 @@ def resolve_ffmpeg(ffmpeg: str) -> str:
     )
 
 
-def copy_sounds(src_dir: Path, dst_dir: Path, overwrite: bool = False, ffmpeg: str = "ffmpeg") -> int:
+def copy_sounds(
+    src_dir: Path,
+    dst_dir: Path,
+    overwrite: bool = False,
+    ffmpeg: str = "ffmpeg",
+    link: str = DEFAULT_LINK_STRATEGY,
+) -> int:
     dst_dir.mkdir(parents=True, exist_ok=True)
 
     sound_files: dict[str, list[Path]] = {}
@@ -88,7 +104,7 @@ def copy_sounds(src_dir: Path, dst_dir: Path, overwrite: bool = False, ffmpeg: s
                 if old_dst != dst:
                     old_dst.unlink()
 
-        convert_sound(ffmpeg, src, dst, overwrite=True)
+        convert_sound(ffmpeg, src, dst, overwrite=True, link=link)
         print(f"[sounds] Wrote: {dst}")
         copied += 1
 
@@ -111,12 +127,18 @@ def main():
     )
     parser.add_argument("--overwrite", action="store_true", help="Replace existing copied files.")
     parser.add_argument("--ffmpeg", default="ffmpeg", help="ffmpeg executable used for WAV conversion.")
+    parser.add_argument(
+        "--link",
+        choices=LINK_STRATEGIES,
+        default=DEFAULT_LINK_STRATEGY,
+        help="How .wav sources are placed (see file_links.py).",
+    )
     args = parser.parse_args()
 
     if not args.src.exists():
         raise FileNotFoundError(f"Sound source directory does not exist: {args.src}")
 
-    count = copy_sounds(args.src, args.dst, args.overwrite, args.ffmpeg)
+    count = copy_sounds(args.src, args.dst, args.overwrite, args.ffmpeg, args.link)
     print(f"[sounds] Copied {count} sound effect files -> {args.dst}")
 
 
@@ -6,17 +6,20 @@ from __future__ import annotations
 import argparse
 import math
 import struct
-import zlib
 from dataclasses import dataclass
 from pathlib import Path
 from xml.sax.saxutils import escape
 
+from compiled_cache import CacheReader, unpack_compiled
 
-COOKIE = 0xDEADFED4
-PARTICLE_DEFINITION_SIZE = 8
+
+PARTICLE_DEFINITION = struct.Struct("<4xi")
 EMITTER_DEFINITION_SIZE = 0x164
 PARTICLE_FIELD_SIZE = 0x14
-FLOAT_TRACK_NODE_SIZE = 20
+FLOAT_TRACK_NODE = struct.Struct("<fffii")
+FLOAT_TRACK_NODE_SIZE = FLOAT_TRACK_NODE.size
+EMITTER_FLAGS_OFFSET = 0x14
+EMITTER_TYPE_OFFSET = 0x18
 
 PARTICLE_FLAGS = [
     (0, "RandomLaunchSpin"),
@@ -101,31 +104,6 @@ TRACK_FIELDS = [
 ]
 
 
-class CacheReader:
-    def __init__(self, data: bytes) -> None:
-        self.data = data
-        self.pos = 0
-
-    def read(self, size: int) -> bytes:
-        end = self.pos + size
-        if end > len(self.data):
-            raise ValueError("Unexpected end of compiled particle cache")
-        chunk = self.data[self.pos:end]
-        self.pos = end
-        return chunk
-
-    def read_i32(self) -> int:
-        return struct.unpack("<i", self.read(4))[0]
-
-    def read_string(self) -> str:
-        length = self.read_i32()
-        if length < 0 or length > 100000:
-            raise ValueError(f"Invalid string length: {length}")
-        if length == 0:
-            return ""
-        return self.read(length).decode("utf-8", errors="replace")
-
-
 @dataclass
 class TrackNode:
     time: float
@@ -144,7 +122,7 @@ class ParticleField:
 
 @dataclass
 class Emitter:
-    raw: bytes
+    raw: memoryview
     image: str
     name: str
     on_duration: str
@@ -153,32 +131,11 @@ class Emitter:
     system_fields: list[ParticleField]
 
 
-def unpack_compiled(path: Path) -> bytes:
-    raw = path.read_bytes()
-    if len(raw) < 8:
-        raise ValueError(f"{path} is too small")
-
-    cookie, uncompressed_size = struct.unpack_from("<II", raw, 0)
-    if cookie != COOKIE:
-        raise ValueError(f"{path} has invalid cookie 0x{cookie:08X}")
-
-    data = zlib.decompress(raw[8:])
-    if len(data) != uncompressed_size:
-        raise ValueError(
-            f"{path} decompressed to {len(data)} bytes, expected {uncompressed_size}"
-        )
-    return data
-
-
 def parse_track_nodes(reader: CacheReader, count: int) -> list[TrackNode]:
-    nodes: list[TrackNode] = []
-    for _ in range(count):
-        time, low, high, curve, distribution = struct.unpack("<fffii", reader.read(FLOAT_TRACK_NODE_SIZE))
-        nodes.append(TrackNode(time, low, high, curve, distribution))
-    return nodes
+    return [TrackNode(*values) for values in reader.iter_unpack(FLOAT_TRACK_NODE, count)]
 
 
-def read_track(reader: CacheReader, raw: bytes, offset: int) -> list[TrackNode]:
+def read_track(reader: CacheReader, raw: memoryview, offset: int) -> list[TrackNode]:
     raw_count = struct.unpack_from("<i", raw, offset + 4)[0]
     count = reader.read_i32()
     if count != raw_count:
@@ -188,7 +145,7 @@ def read_track(reader: CacheReader, raw: bytes, offset: int) -> list[TrackNode]:
     return parse_track_nodes(reader, count)
 
 
-def parse_field_array(reader: CacheReader, raw: bytes, offset: int) -> list[ParticleField]:
+def parse_field_array(reader: CacheReader, raw: memoryview, offset: int) -> list[ParticleField]:
     count = struct.unpack_from("<i", raw, offset + 4)[0]
     def_size = reader.read_i32()
     if def_size != PARTICLE_FIELD_SIZE:
@@ -209,12 +166,11 @@ def parse_field_array(reader: CacheReader, raw: bytes, offset: int) -> list[Part
     return fields
 
 
-def parse_particle_cache(data: bytes) -> list[Emitter]:
-    reader = CacheReader(data)
-    reader.read(4)  # schema hash
+def parse_particle_cache(data: bytes | bytearray) -> list[Emitter]:
+    reader = CacheReader(data, "compiled particle")
+    reader.read_u32()  # schema hash
 
-    definition = reader.read(PARTICLE_DEFINITION_SIZE)
-    emitter_count = struct.unpack_from("<i", definition, 4)[0]
+    (emitter_count,) = reader.unpack(PARTICLE_DEFINITION)
 
     emitter_def_size = reader.read_i32()
     if emitter_def_size != EMITTER_DEFINITION_SIZE:
@@ -245,8 +201,7 @@ def parse_particle_cache(data: bytes) -> list[Emitter]:
             )
         )
 
-    if reader.pos != len(reader.data):
-        raise ValueError(f"Unread trailing cache bytes: {len(reader.data) - reader.pos}")
+    reader.check_consumed()
 
     return emitters
 
@@ -294,11 +249,11 @@ def particle_to_xml(emitters: list[Emitter]) -> str:
             value = struct.unpack_from("<i", emitter.raw, offset)[0]
             if value:
                 lines.append(f"\t<{tag}>{value}</{tag}>")
-        flags = struct.unpack_from("<i", emitter.raw, 0x14)[0]
+        flags = struct.unpack_from("<i", emitter.raw, EMITTER_FLAGS_OFFSET)[0]
         for bit, tag in PARTICLE_FLAGS:
             if flags & (1 << bit):
                 lines.append(f"\t<{tag}>1</{tag}>")
-        emitter_type = struct.unpack_from("<i", emitter.raw, 0x18)[0]
+        emitter_type = struct.unpack_from("<i", emitter.raw, EMITTER_TYPE_OFFSET)[0]
         if emitter_type:
             lines.append(f"\t<EmitterType>{EMITTER_TYPES.get(emitter_type, str(emitter_type))}</EmitterType>")
         if emitter.name:
@@ -6,45 +6,30 @@ from __future__ import annotations
 import argparse
 import math
 import struct
-import zlib
+import sys
+from array import array
+from collections.abc import Sequence
 from dataclasses import dataclass
 from pathlib import Path
 from xml.sax.saxutils import escape
 
+from compiled_cache import CacheReader, unpack_compiled
 
-COOKIE = 0xDEADFED4
-REANIMATOR_DEFINITION_SIZE = 16
-REANIMATOR_TRACK_SIZE = 12
+
+REANIMATOR_DEFINITION = struct.Struct("<4xif4x")
+REANIMATOR_TRACK = struct.Struct("<8xi")
+REANIMATOR_TRACK_SIZE = REANIMATOR_TRACK.size
 REANIMATOR_TRANSFORM_SIZE = 44
+# Eight floats followed by three string pointers that are only valid in-game.
+TRANSFORM_FLOAT_FIELDS = ("x", "y", "kx", "ky", "sx", "sy", "frame", "alpha")
+TRANSFORM_STRIDE = REANIMATOR_TRANSFORM_SIZE // 4
 DEFAULT_FIELD_PLACEHOLDER = -10000.0
 
-
-class CacheReader:
-    def __init__(self, data: bytes) -> None:
-        self.data = data
-        self.pos = 0
-
-    def read(self, size: int) -> bytes:
-        end = self.pos + size
-        if end > len(self.data):
-            raise ValueError("Unexpected end of compiled reanim cache")
-        chunk = self.data[self.pos:end]
-        self.pos = end
-        return chunk
-
-    def read_u32(self) -> int:
-        return struct.unpack("<I", self.read(4))[0]
-
-    def read_i32(self) -> int:
-        return struct.unpack("<i", self.read(4))[0]
-
-    def read_string(self) -> str:
-        length = self.read_i32()
-        if length < 0 or length > 100000:
-            raise ValueError(f"Invalid string length: {length}")
-        if length == 0:
-            return ""
-        return self.read(length).decode("utf-8", errors="replace")
+# Reanims the game loads under a second name: alias -> compiled source.
+REANIM_ALIASES = {
+    "zombie_disco": "zombie_jackson",
+    "zombie_backup": "zombie_dancer",
+}
 
 
 @dataclass
@@ -62,10 +47,40 @@ class Transform:
     text: str
 
 
+@dataclass
+class TransformColumns:
+    """Per-field columns of a track's transforms, one entry per frame."""
+
+    x: Sequence[float]
+    y: Sequence[float]
+    kx: Sequence[float]
+    ky: Sequence[float]
+    sx: Sequence[float]
+    sy: Sequence[float]
+    frame: Sequence[float]
+    alpha: Sequence[float]
+    image: list[str]
+    font: list[str]
+    text: list[str]
+
+    def __len__(self) -> int:
+        return len(self.image)
+
+
 @dataclass
 class Track:
     name: str
-    transforms: list[Transform]
+    columns: TransformColumns
+
+    @property
+    def transforms(self) -> list[Transform]:
+        c = self.columns
+        return [
+            Transform(*values)
+            for values in zip(
+                c.x, c.y, c.kx, c.ky, c.sx, c.sy, c.frame, c.alpha, c.image, c.font, c.text
+            )
+        ]
 
 
 @dataclass
@@ -74,82 +89,58 @@ class Reanim:
     tracks: list[Track]
 
 
-def unpack_compiled(path: Path) -> bytes:
-    raw = path.read_bytes()
-    if len(raw) < 8:
-        raise ValueError(f"{path} is too small")
-
-    cookie, uncompressed_size = struct.unpack_from("<II", raw, 0)
-    if cookie != COOKIE:
-        raise ValueError(f"{path} has invalid cookie 0x{cookie:08X}")
-
-    data = zlib.decompress(raw[8:])
-    if len(data) != uncompressed_size:
-        raise ValueError(
-            f"{path} decompressed to {len(data)} bytes, expected {uncompressed_size}"
-        )
-    return data
-
-
-def parse_transform(raw: bytes, image: str, font: str, text: str) -> Transform:
-    values = struct.unpack_from("<8f", raw, 0)
-    return Transform(
-        x=values[0],
-        y=values[1],
-        kx=values[2],
-        ky=values[3],
-        sx=values[4],
-        sy=values[5],
-        frame=values[6],
-        alpha=values[7],
-        image=image,
-        font=font,
-        text=text,
-    )
+def cast_float_block(block: memoryview) -> Sequence[float]:
+    if sys.byteorder == "little":
+        return block.cast("f")
+    floats = array("f")
+    floats.frombytes(block)
+    floats.byteswap()
+    return floats
+
 
+def parse_transform_block(block: memoryview) -> dict[str, Sequence[float]]:
+    """Split a track's packed transform records into strided float columns without copying."""
+    floats = cast_float_block(block)
+    return {
+        field: floats[index::TRANSFORM_STRIDE]
+        for index, field in enumerate(TRANSFORM_FLOAT_FIELDS)
+    }
 
-def parse_reanim_cache(data: bytes) -> Reanim:
-    reader = CacheReader(data)
+
+def parse_reanim_cache(data: bytes | bytearray) -> Reanim:
+    reader = CacheReader(data, "compiled reanim")
     reader.read_u32()  # schema hash
 
-    definition = reader.read(REANIMATOR_DEFINITION_SIZE)
-    track_count = struct.unpack_from("<i", definition, 4)[0]
-    fps = struct.unpack_from("<f", definition, 8)[0]
+    track_count, fps = reader.unpack(REANIMATOR_DEFINITION)
 
     track_def_size = reader.read_i32()
     if track_def_size != REANIMATOR_TRACK_SIZE:
         raise ValueError(f"Unexpected ReanimatorTrack size: {track_def_size}")
 
-    raw_tracks = [
-        reader.read(REANIMATOR_TRACK_SIZE)
-        for _ in range(track_count)
-    ]
+    transform_counts = [count for (count,) in reader.iter_unpack(REANIMATOR_TRACK, track_count)]
 
     tracks: list[Track] = []
-    for raw_track in raw_tracks:
-        transform_count = struct.unpack_from("<i", raw_track, 8)[0]
+    for transform_count in transform_counts:
         name = reader.read_string()
 
         transform_def_size = reader.read_i32()
         if transform_def_size != REANIMATOR_TRANSFORM_SIZE:
             raise ValueError(f"Unexpected ReanimatorTransform size: {transform_def_size}")
 
-        raw_transforms = [
-            reader.read(REANIMATOR_TRANSFORM_SIZE)
-            for _ in range(transform_count)
-        ]
+        float_columns = parse_transform_block(reader.read(REANIMATOR_TRANSFORM_SIZE * transform_count))
 
-        transforms = []
-        for raw_transform in raw_transforms:
-            image = reader.read_string()
-            font = reader.read_string()
-            text = reader.read_string()
-            transforms.append(parse_transform(raw_transform, image, font, text))
+        images: list[str] = []
+        fonts: list[str] = []
+        texts: list[str] = []
+        for _ in range(transform_count):
+            images.append(reader.read_string())
+            fonts.append(reader.read_string())
+            texts.append(reader.read_string())
 
-        tracks.append(Track(name=name, transforms=transforms))
+        columns = TransformColumns(**float_columns, image=images, font=fonts, text=texts)
+        tracks.append(Track(name=name, columns=columns))
 
-    if reader.pos != len(reader.data):
-        raise ValueError(f"Unread trailing cache bytes: {len(reader.data) - reader.pos}")
+    reader.check_consumed()
 
     return Reanim(fps=fps, tracks=tracks)
 
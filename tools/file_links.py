@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Place passthrough files as copies, hardlinks or copy-on-write clones.
+
+Strategies for link_file:
+
+- "copy": shutil.copy2
+- "hardlink": os.link; dst shares the source's inode, so only use it when
+  sources are replaced rather than rewritten in place (pak_extractor rewrites
+  tools/raw files in place, which would also change linked outputs)
+- "reflink": copy-on-write clone (FICLONE on btrfs/xfs, clonefile on APFS);
+  dst is independent of the source but costs no data blocks
+- "auto": reflink where the filesystem supports it, else copy
+
+Any link that cannot be made (other device, unsupported filesystem) falls
+back to a plain copy.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import sys
+from pathlib import Path
+
+
+LINK_STRATEGIES = ("copy", "hardlink", "reflink", "auto")
+DEFAULT_LINK_STRATEGY = "copy"
+
+# _IOW(0x94, 9, int) from linux/fs.h
+FICLONE = 0x40049409
+
+
+def _clonefile(src: Path, dst: Path) -> bool:
+    import ctypes
+
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        clonefile = libc.clonefile
+    except (OSError, AttributeError):
+        return False
+    return clonefile(os.fsencode(src), os.fsencode(dst), 0) == 0
+
+
+def _ficlone(src: Path, dst: Path) -> bool:
+    try:
+        import fcntl
+    except ImportError:
+        return False
+
+    try:
+        with open(src, "rb") as source, open(dst, "wb") as target:
+            fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+    except OSError:
+        dst.unlink(missing_ok=True)
+        return False
+    shutil.copystat(src, dst)
+    return True
+
+
+def reflink(src: Path, dst: Path) -> bool:
+    """Clone src to a new dst; returns False (leaving no dst) when unsupported."""
+    if sys.platform == "darwin":
+        return _clonefile(src, dst)
+    return _ficlone(src, dst)
+
+
+def hardlink(src: Path, dst: Path) -> bool:
+    try:
+        os.link(src, dst)
+    except OSError:
+        return False
+    return True
+
+
+def link_file(src: Path, dst: Path, strategy: str = DEFAULT_LINK_STRATEGY) -> str:
+    """Replace dst with src's content; returns the method used ("copy", "hardlink", "reflink")."""
+    if strategy not in LINK_STRATEGIES:
+        raise ValueError(f"Unknown link strategy {strategy!r}; expected one of {LINK_STRATEGIES}")
+
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    # Replace rather than overwrite dst: writing into it would also change any
+    # file it is hardlinked to, such as the source of an earlier hardlink run.
+    dst.unlink(missing_ok=True)
+    if strategy == "hardlink" and hardlink(src, dst):
+        return "hardlink"
+    if strategy in ("reflink", "auto") and reflink(src, dst):
+        return "reflink"
+    shutil.copy2(src, dst)
+    return "copy"
+
+
+def is_linked(src: Path, dst: Path) -> bool:
+    """Whether dst is a hardlink of src, i.e. already up to date without reading either."""
+    try:
+        return os.path.samefile(src, dst)
+    except OSError:
+        return False
@@ -4,9 +4,8 @@ from typing import Any
 from PIL import Image
 
 from generate_packet_plant_cache import (
-    ANIMATION_DIR,
     TEXTURE_DIR,
-    load_json,
+    load_animation,
     load_texture,
     paste_transformed,
     render_frame_to_matrix,
@@ -59,8 +58,7 @@ def sample_lawnmower_tracks(animation_json: dict[str, Any]) -> list[dict[str, An
 
 
 def render_lawnmower_cache() -> Image.Image:
-    animation_path = ANIMATION_DIR / "lawnmower.json"
-    animation_json = load_json(animation_path)
+    animation_json = load_animation("lawnmower")
     canvas = Image.new("RGBA", (OUTPUT_WIDTH, OUTPUT_HEIGHT), (0, 0, 0, 0))
 
     for item in sample_lawnmower_tracks(animation_json):
@@ -1,4 +1,3 @@
-import json
 import math
 from functools import lru_cache
 from pathlib import Path
@@ -6,6 +5,15 @@ from typing import Any
 
 from PIL import Image
 
+from reanim_outputs import find_converted_reanim, load_converted_reanim
+from sprite_texture_preprocessor import (
+    get_alpha_mask_manifest_path,
+    get_trim_manifest_path,
+    load_texture_manifest,
+    open_alpha_masked_image,
+    untrim_image,
+)
+
 
 PACKET_WIDTH = 50
 PACKET_HEIGHT = 70
@@ -119,8 +127,15 @@ NODE_CONFIGS: dict[int, dict[str, Any]] = {
 }
 
 
-def load_json(path: Path) -> dict[str, Any]:
-    return json.loads(path.read_text(encoding="utf-8"))
+def find_animation(name: str) -> Path | None:
+    return find_converted_reanim(ANIMATION_DIR, name)
+
+
+def load_animation(name: str) -> dict[str, Any]:
+    path = find_animation(name)
+    if path is None:
+        raise FileNotFoundError(f"No converted reanim '{name}' in {ANIMATION_DIR}")
+    return load_converted_reanim(path)
 
 
 def style_for(seed_id: int) -> dict[str, float]:
@@ -427,12 +442,27 @@ def sand_alpha_edges(image: Image.Image) -> Image.Image:
     return result
 
 
+@lru_cache(maxsize=None)
+def load_texture_trims() -> dict[str, Any]:
+    return load_texture_manifest(get_trim_manifest_path(TEXTURE_DIR))
+
+
+@lru_cache(maxsize=None)
+def load_texture_alpha_masks() -> dict[str, str]:
+    return load_texture_manifest(get_alpha_mask_manifest_path(TEXTURE_DIR))
+
+
 @lru_cache(maxsize=None)
 def load_texture(name: str) -> Image.Image:
     path = TEXTURE_DIR / f"{name}.png"
+    mask = load_texture_alpha_masks().get(name)
+    if not path.exists() and mask is not None:
+        image = open_alpha_masked_image(TEXTURE_DIR / f"{name}.jpg", TEXTURE_DIR / f"{mask}.png")
+        return sand_alpha_edges(image)
     if not path.exists():
         raise FileNotFoundError(path)
-    return sand_alpha_edges(Image.open(path))
+    image = untrim_image(Image.open(path), load_texture_trims().get(name))
+    return sand_alpha_edges(image)
 
 
 def paste_transformed(canvas: Image.Image, source: Image.Image, matrix: tuple[float, float, float, float, float, float], alpha: float):
@@ -506,7 +536,7 @@ def render_plant_cache(seed_id: int, animation_json: dict[str, Any], style: dict
 
 def render_seed(seed_id: int) -> Image.Image:
     animation_name = ANIMATION_NAMES[seed_id]
-    animation_json = load_json(ANIMATION_DIR / f"{animation_name}.json")
+    animation_json = load_animation(animation_name)
     style = style_for(seed_id)
     canvas = Image.new("RGBA", (PACKET_WIDTH, PACKET_HEIGHT), (0, 0, 0, 0))
     cache, offset_x, offset_y = render_plant_cache(seed_id, animation_json, style)
@@ -7,10 +7,11 @@ from generate_packet_plant_cache import (
     ANIMATION_DIR,
     ANIMATION_NAMES,
     SEED_COUNT,
-    load_json,
+    find_animation,
     render_plant_cache,
     style_for,
 )
+from reanim_outputs import load_converted_reanim
 
 
 ATLAS_COLUMNS = 8
@@ -30,12 +31,12 @@ def render_seed(seed_id: int) -> Image.Image:
     if animation_name is None:
         return cell
 
-    animation_path = ANIMATION_DIR / f"{animation_name}.json"
-    if not animation_path.exists():
-        print(f"[plant-preview-cache] WARN: missing animation json for seed {seed_id}: {animation_path}")
+    animation_path = find_animation(animation_name)
+    if animation_path is None:
+        print(f"[plant-preview-cache] WARN: missing animation for seed {seed_id}: {ANIMATION_DIR / animation_name}")
         return cell
 
-    animation_json = load_json(animation_path)
+    animation_json = load_converted_reanim(animation_path)
     cache, offset_x, offset_y = render_plant_cache(seed_id, animation_json, style_for(seed_id))
     cell.alpha_composite(cache, (offset_x - COMMON_OFFSET_X, offset_y - COMMON_OFFSET_Y))
     return cell
@@ -6,12 +6,14 @@ from PIL import Image
 
 from generate_packet_plant_cache import (
     ANIMATION_DIR,
-    load_json,
+    find_animation,
+    load_animation,
     load_texture,
     paste_transformed,
     render_frame_to_matrix,
     sample_frames,
 )
+from reanim_outputs import load_converted_reanim
 
 
 ATLAS_COLUMNS = 8
@@ -195,15 +197,18 @@ def render_zombie_cache(zombie_id: int) -> Image.Image:
     base_y = CACHE_BASE_Y + cache_offset_y
 
     if definition.get("flag"):
-        flag_json = load_json(ANIMATION_DIR / "zombie_flagpole.json")
+        flag_json = load_animation("zombie_flagpole")
         draw_reanim(cache, flag_json, "Zombie_flag", base_x, base_y, {})
 
-    animation_path = ANIMATION_DIR / f"{definition['animation']}.json"
-    if not animation_path.exists():
-        print(f"[zombie-preview-cache] WARN: missing animation json for zombie {zombie_id}: {animation_path}")
+    animation_path = find_animation(definition["animation"])
+    if animation_path is None:
+        print(
+            f"[zombie-preview-cache] WARN: missing animation for zombie {zombie_id}: "
+            f"{ANIMATION_DIR / definition['animation']}"
+        )
         return cache
 
-    animation_json = load_json(animation_path)
+    animation_json = load_converted_reanim(animation_path)
     draw_reanim(cache, animation_json, definition["layer"], base_x, base_y, definition)
     for extra_layer in definition.get("extraLayers", []):
         offset_x, offset_y = extra_layer.get("offset", (0.0, 0.0))
@@ -1,15 +1,39 @@
 #!/usr/bin/env python3
-"""Convert extracted PvZ particle XML definitions to runtime JSON."""
+"""Convert extracted PvZ particle XML definitions to runtime JSON.
+
+Compiled definitions (.xml.compiled) can also be converted directly from the
+decompiler's Emitter objects, with the same JSON as decompiling to XML first.
+"""
 
 from __future__ import annotations
 
 import argparse
 import json
+import math
 import re
+import struct
 from pathlib import Path
 from typing import Any
 from xml.etree import ElementTree
 
+from compiled_cache import unpack_compiled
+from decompile_particle_compiled import (
+    EMITTER_FLAGS_OFFSET,
+    EMITTER_TYPE_OFFSET,
+    EMITTER_TYPES,
+    PARTICLE_FLAGS,
+    Emitter,
+    ParticleField,
+    TrackNode,
+    format_float,
+    output_name,
+    parse_particle_cache,
+    particle_to_xml,
+)
+from decompile_particle_compiled import FIELD_TYPES as COMPILED_FIELD_TYPES
+from decompile_particle_compiled import INT_FIELDS as COMPILED_INT_FIELDS
+from resource_index import ImageTreeIndex, load_resource_index
+
 TRACK_FIELDS = {
     "SystemDuration": "systemDuration",
     "SpawnRate": "spawnRate",
@@ -121,6 +145,48 @@ def parse_track(text: str | None, default: float = 0.0) -> dict[str, Any]:
     return {"nodes": nodes} if nodes else constant(default)
 
 
+def _read_track_value(value: float) -> str | None:
+    """value as parse_track reads it from decompiled XML; None where TOKEN_RE skips it."""
+    text = format_float(value)
+    return text if TOKEN_RE.fullmatch(text) else None
+
+
+def parse_track_nodes(track_nodes: list[TrackNode], default: float = 0.0) -> dict[str, Any]:
+    """parse_track(format_track(track_nodes)) without the text round trip."""
+    nodes: list[dict[str, Any]] = []
+    pending_values: list[float] = []
+    for node in track_nodes:
+        low = format_float(node.low)
+        high = low
+        if not math.isclose(node.low, node.high, rel_tol=0.0, abs_tol=0.000001):
+            high = format_float(node.high)
+        if node.time:
+            nodes.append({
+                "time": normalize_number(float(format_float(node.time))),
+                "low": normalize_number(float(low)),
+                "high": normalize_number(float(high)),
+            })
+            continue
+        # Untimed values are loose tokens: the first one or two of the whole
+        # track make up its leading node.
+        values = (node.low,) if high is low else (node.low, node.high)
+        for value in values:
+            text = _read_track_value(value)
+            if text is not None:
+                pending_values.append(float(text))
+
+    if pending_values:
+        low_value = pending_values[0]
+        high_value = pending_values[1] if len(pending_values) >= 2 else low_value
+        nodes.insert(0, {
+            "time": 0,
+            "low": normalize_number(low_value),
+            "high": normalize_number(high_value),
+        })
+
+    return {"nodes": nodes} if nodes else constant(default)
+
+
 def parse_bool(text: str | None) -> bool:
     if text is None or not text.strip():
         return True
@@ -141,15 +207,27 @@ def strip_image_prefix(raw: str | None) -> str | None:
     return value
 
 
-def normalize_image(raw: str | None, src_dir: Path) -> str | None:
+PARTICLE_TEXTURE_DIR = Path("assets/resources/textures/particles")
+
+
+def normalize_image(
+    raw: str | None, src_dir: Path, images: ImageTreeIndex | None = None
+) -> str | None:
     value = strip_image_prefix(raw)
     if not value:
         return None
     value = value.lower()
 
-    source_particle_image = src_dir / f"{value}.png"
-    resource_particle_image = Path("assets/resources/textures/particles") / f"{value}.png"
-    if source_particle_image.exists() or resource_particle_image.exists():
+    file_name = f"{value}.png"
+    if images is not None:
+        is_particle_image = images.has_file(src_dir, file_name) or images.has_file(
+            PARTICLE_TEXTURE_DIR, file_name
+        )
+    else:
+        is_particle_image = (src_dir / file_name).exists() or (
+            PARTICLE_TEXTURE_DIR / file_name
+        ).exists()
+    if is_particle_image:
         return f"particles/{value}"
     return value
 
@@ -162,22 +240,15 @@ def normalize_image_id(raw: str | None) -> str | None:
 
 
 def load_image_grid_metadata(resources_xml: Path) -> dict[str, dict[str, int]]:
-    if not resources_xml.exists():
-        return {}
-
-    root = ElementTree.fromstring(resources_xml.read_text(encoding="utf-8", errors="ignore"))
     image_grids: dict[str, dict[str, int]] = {}
-    for image_node in root.findall(".//Image"):
-        image_id = image_node.attrib.get("id")
-        if not image_id:
-            continue
+    for image in load_resource_index(resources_xml):
         grid: dict[str, int] = {}
-        if image_node.attrib.get("cols"):
-            grid["imageColumns"] = int(image_node.attrib["cols"])
-        if image_node.attrib.get("rows"):
-            grid["imageRows"] = int(image_node.attrib["rows"])
+        if image.cols:
+            grid["imageColumns"] = image.cols
+        if image.rows:
+            grid["imageRows"] = image.rows
         if grid:
-            image_grids[image_id.upper()] = grid
+            image_grids[image.id.upper()] = grid
     return image_grids
 
 
@@ -201,11 +272,12 @@ def parse_emitter(
     emitter_node: ElementTree.Element,
     src_dir: Path,
     image_grids: dict[str, dict[str, int]],
+    images: ImageTreeIndex | None = None,
 ) -> dict[str, Any]:
     emitter: dict[str, Any] = {}
     image_node = emitter_node.find("Image")
     image_id = normalize_image_id(image_node.text if image_node is not None else None)
-    image = normalize_image(image_node.text if image_node is not None else None, src_dir)
+    image = normalize_image(image_node.text if image_node is not None else None, src_dir, images)
     if image:
         emitter["image"] = image
     if image_id and image_id in image_grids:
@@ -239,33 +311,143 @@ def parse_emitter(
     return emitter
 
 
-def convert_file(src: Path, dst_dir: Path, image_grids: dict[str, dict[str, int]] | None = None) -> Path:
-    raw = src.read_text(encoding="utf-8", errors="ignore")
-    root = ElementTree.fromstring(f"<root>{raw}</root>")
-    resolved_image_grids = image_grids or {}
-    definition = {
-        "source": src.name,
-        "emitters": [
-            parse_emitter(node, src.parent, resolved_image_grids)
-            for node in root.findall("Emitter")
-        ],
+COMPILED_INT_OFFSETS = dict(COMPILED_INT_FIELDS)
+COMPILED_FLAG_BITS = {tag: bit for bit, tag in PARTICLE_FLAGS}
+
+
+def parse_compiled_field(field: ParticleField) -> dict[str, Any]:
+    raw_type = COMPILED_FIELD_TYPES.get(field.field_type, str(field.field_type))
+    return {
+        "type": FIELD_TYPES.get(raw_type, raw_type.lower() or "unknown"),
+        "x": parse_track_nodes(field.x),
+        "y": parse_track_nodes(field.y),
     }
 
+
+def parse_compiled_emitter(
+    compiled: Emitter,
+    image_dir: Path,
+    image_grids: dict[str, dict[str, int]],
+    images: ImageTreeIndex | None = None,
+) -> dict[str, Any]:
+    """parse_emitter of the decompiled XML for compiled, built from its fields directly."""
+    emitter: dict[str, Any] = {}
+    raw_image = compiled.image or None
+    image_id = normalize_image_id(raw_image)
+    image = normalize_image(raw_image, image_dir, images)
+    if image:
+        emitter["image"] = image
+    if image_id and image_id in image_grids:
+        emitter.update(image_grids[image_id])
+
+    if compiled.name:
+        emitter["name"] = compiled.name.strip()
+
+    emitter_type = struct.unpack_from("<i", compiled.raw, EMITTER_TYPE_OFFSET)[0]
+    if emitter_type:
+        emitter["emitterType"] = EMITTER_TYPES.get(emitter_type, str(emitter_type)).lower()
+
+    for xml_name, json_name in INT_FIELDS.items():
+        value = struct.unpack_from("<i", compiled.raw, COMPILED_INT_OFFSETS[xml_name])[0]
+        if value:
+            emitter[json_name] = value
+
+    flags = struct.unpack_from("<i", compiled.raw, EMITTER_FLAGS_OFFSET)[0]
+    for xml_name, json_name in FLAG_FIELDS.items():
+        if flags & (1 << COMPILED_FLAG_BITS[xml_name]):
+            emitter[json_name] = True
+
+    for xml_name, json_name in TRACK_FIELDS.items():
+        nodes = compiled.tracks[xml_name]
+        if nodes:
+            emitter[json_name] = parse_track_nodes(nodes)
+
+    emitter["fields"] = [parse_compiled_field(field) for field in compiled.fields]
+    emitter["systemFields"] = [parse_compiled_field(field) for field in compiled.system_fields]
+    return emitter
+
+
+def write_definition(source: str, emitters: list[dict[str, Any]], dst_dir: Path) -> Path:
+    definition = {"source": source, "emitters": emitters}
     dst_dir.mkdir(parents=True, exist_ok=True)
-    dst = dst_dir / f"{src.stem.lower()}.json"
+    dst = dst_dir / f"{Path(source).stem.lower()}.json"
     dst.write_text(json.dumps(definition, separators=(",", ":")), encoding="utf-8")
     return dst
 
 
+def convert_file(
+    src: Path,
+    dst_dir: Path,
+    image_grids: dict[str, dict[str, int]] | None = None,
+    images: ImageTreeIndex | None = None,
+) -> Path:
+    raw = src.read_text(encoding="utf-8", errors="ignore")
+    root = ElementTree.fromstring(f"<root>{raw}</root>")
+    resolved_image_grids = image_grids or {}
+    emitters = [
+        parse_emitter(node, src.parent, resolved_image_grids, images)
+        for node in root.findall("Emitter")
+    ]
+    return write_definition(src.name, emitters, dst_dir)
+
+
+def convert_compiled_file(
+    src: Path,
+    dst_dir: Path,
+    image_dir: Path,
+    image_grids: dict[str, dict[str, int]] | None = None,
+    images: ImageTreeIndex | None = None,
+    xml_dir: Path | None = None,
+) -> Path:
+    """Convert a .xml.compiled definition without going through XML text.
+
+    image_dir stands in for the XML's directory when resolving particle
+    images. With xml_dir, the decompiled XML is written there as well.
+    """
+    compiled = parse_particle_cache(unpack_compiled(src))
+    source = output_name(src)
+    if xml_dir is not None:
+        xml_dir.mkdir(parents=True, exist_ok=True)
+        (xml_dir / source).write_text(particle_to_xml(compiled), encoding="utf-8")
+    resolved_image_grids = image_grids or {}
+    emitters = [
+        parse_compiled_emitter(emitter, image_dir, resolved_image_grids, images)
+        for emitter in compiled
+    ]
+    return write_definition(source, emitters, dst_dir)
+
+
 def convert_directory(
     src_dir: Path,
     dst_dir: Path,
     resources_xml: Path = Path("./tools/raw/properties/resources.xml"),
+    images: ImageTreeIndex | None = None,
+    compiled_dir: Path | None = None,
+    write_xml: bool = False,
 ) -> int:
+    """Convert the XML definitions in src_dir.
+
+    With compiled_dir, its .xml.compiled files are converted directly instead
+    and only XML files without a compiled counterpart are read from src_dir;
+    write_xml also writes the decompiled XML to src_dir.
+    """
     image_grids = load_image_grid_metadata(resources_xml)
+    if images is None:
+        images = ImageTreeIndex(src_dir)
     count = 0
+    converted: set[str] = set()
+    if compiled_dir is not None and compiled_dir.exists():
+        for src in sorted(compiled_dir.glob("*.xml.compiled")):
+            dst = convert_compiled_file(
+                src, dst_dir, src_dir, image_grids, images, src_dir if write_xml else None
+            )
+            print(f"[particle-convert] Wrote: {dst}")
+            converted.add(output_name(src))
+            count += 1
     for src in sorted(src_dir.glob("*.xml")):
-        dst = convert_file(src, dst_dir, image_grids)
+        if src.name.lower() in converted:
+            continue
+        dst = convert_file(src, dst_dir, image_grids, images)
         print(f"[particle-convert] Wrote: {dst}")
         count += 1
     return count
@@ -276,11 +458,29 @@ def main():
     parser.add_argument("--src", type=Path, default=Path("./tools/raw/particles"))
     parser.add_argument("--dst", type=Path, default=Path("./assets/resources/particles"))
     parser.add_argument("--resources", type=Path, default=Path("./tools/raw/properties/resources.xml"))
+    parser.add_argument(
+        "--compiled",
+        type=Path,
+        help="Directory of .xml.compiled definitions to convert directly, e.g. "
+        "./tools/raw/compiled/particles. --src then only supplies images and "
+        "definitions that exist only as XML.",
+    )
+    parser.add_argument(
+        "--write-xml",
+        action="store_true",
+        help="With --compiled, also write the decompiled XML to --src.",
+    )
     args = parser.parse_args()
 
-    if not args.src.exists():
+    if not args.src.exists() and args.compiled is None:
         raise FileNotFoundError(f"Particle XML directory does not exist: {args.src}")
-    count = convert_directory(args.src, args.dst, args.resources)
+    count = convert_directory(
+        args.src,
+        args.dst,
+        args.resources,
+        compiled_dir=args.compiled,
+        write_xml=args.write_xml,
+    )
     print(f"[particle-convert] Converted {count} particle definitions -> {args.dst}")
 
 
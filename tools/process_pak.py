@@ -5,54 +5,80 @@ PvZ asset pipeline
 Steps:
   1. Extract main.pak -> tools/raw/
   2. Rename files to lowercase
-  3. Decompile compiled particles/reanim
-  4. Convert reanim animations
+  3. Decompile particle XML (with --write-particle-xml) and reanim XML
+     (with --write-reanim-xml) for debugging
+  4. Convert reanim animations straight from their compiled caches
+     (part textures cropped to their alpha bounds with --trim-textures)
   5. Convert fonts
   6. Convert LawnStrings
   7. Copy images to textures
   8. Copy particle images to texture resources
-  9. Convert particle definitions
+  9. Convert particle definitions straight from their compiled caches
  10. Convert sounds to WAV audio resources
  11. Convert MO3 music to WAV audio stems
  12. Generate cached packet plant atlas
  13. Generate cached plant preview atlas
  14. Generate cached zombie preview atlas
  15. Generate cached lawn mower sprite
+ 16. Write the texture usage index
+ 17. Audit unreferenced textures (moved out with --exclude-unused-textures)
+ 18. Pack sprite atlases and move the packed textures out (with --pack-atlases)
+ 19. Add WebP variants of textures and atlases (with --webp; removed without)
 """
 
+import argparse
 from pathlib import Path
-import shutil
 
 from pak_extractor import parse_pak, extract_entries, _decrypt
 from rename_raw_to_lower import rename_all_to_lower
 from decompile_particle_compiled import convert_directory as decompile_particle_directory
-from decompile_reanim_compiled import convert_file as decompile_reanim_file
+from decompile_reanim_compiled import REANIM_ALIASES, convert_file as decompile_reanim_file
 from particle_converter import convert_directory as convert_particle_directory
-from reanim_converter import main as convert_reanim
+from reanim_converter import ReanimOutputOptions, convert_reanims
 from font_converter import main as convert_font
 from lawnstrings_converter import convert_lawnstrings
 from copy_particles import copy_particles
 from copy_sounds import copy_sounds
+from file_links import DEFAULT_LINK_STRATEGY, LINK_STRATEGIES, link_file
 from convert_music import convert_music
 from generate_packet_plant_cache import main as generate_packet_plant_cache
 from generate_plant_preview_cache import main as generate_plant_preview_cache
 from generate_zombie_preview_cache import main as generate_zombie_preview_cache
 from generate_lawnmower_cache import main as generate_lawnmower_cache
 from sprite_texture_preprocessor import (
+    PngReduction,
     get_alpha_companion_name,
+    get_alpha_mask_manifest_path,
+    OutputCache,
     get_output_name,
     is_alpha_companion_name,
     load_alphagrid_resources,
+    load_texture_manifest,
+    print_png_reductions,
+    save_texture_manifest,
     select_image_resources,
     write_preprocessed_resource,
 )
-
-
-def copy_images(src_dir: Path, dst_dir: Path) -> int:
+from resource_index import ImageTreeIndex
+from texture_atlas_packer import get_packed_texture_names, move_packed_textures, pack_atlases
+from texture_audit import load_manifest_prefixes, run_texture_audit
+from texture_usage_index import write_usage_index
+from webp_export import export_webp_textures, remove_stale_webp
+
+
+def copy_images(
+    src_dir: Path,
+    dst_dir: Path,
+    reductions: list[PngReduction] | None = None,
+    alpha_masks: dict[str, str] | None = None,
+    cache: OutputCache | None = None,
+    link: str = DEFAULT_LINK_STRATEGY,
+    images: ImageTreeIndex | None = None,
+) -> int:
     """Copy all image files from src_dir to dst_dir, return count of newly copied files."""
     dst_dir.mkdir(parents=True, exist_ok=True)
 
-    resources = select_image_resources(src_dir)
+    resources = select_image_resources(src_dir, images)
     alphagrid_resources = load_alphagrid_resources(src_dir.parent / "properties/resources.xml")
     alphagrid_sources = {alpha_name for alpha_name, _output_name in alphagrid_resources.values()}
 
@@ -73,13 +99,25 @@ def copy_images(src_dir: Path, dst_dir: Path) -> int:
             if legacy_dst.exists():
                 legacy_dst.unlink()
 
-        if write_preprocessed_resource(src, dst, resource_name=resource_name, alpha_src=alpha_src, alpha_grid_src=alpha_grid_src):
+        if write_preprocessed_resource(
+            src,
+            dst,
+            resource_name=resource_name,
+            alpha_src=alpha_src,
+            alpha_grid_src=alpha_grid_src,
+            reductions=reductions,
+            alpha_masks=alpha_masks,
+            cache=cache,
+            link=link,
+        ):
             print(f"[pipeline] Wrote: {dst}")
             copied += 1
     return copied
 
 
-def decompile_reanim_directory(src_dir: Path, out_dir: Path) -> int:
+def decompile_reanim_directory(
+    src_dir: Path, out_dir: Path, link: str = DEFAULT_LINK_STRATEGY
+) -> int:
     count = 0
     if not src_dir.exists():
         return count
@@ -88,23 +126,77 @@ def decompile_reanim_directory(src_dir: Path, out_dir: Path) -> int:
         print(f"[reanim-decompile] Wrote: {dst}")
         count += 1
 
-    aliases = {
-        "zombie_jackson.reanim": "zombie_disco.reanim",
-        "zombie_dancer.reanim": "zombie_backup.reanim",
-    }
-    for source_name, alias_name in aliases.items():
-        source = out_dir / source_name
-        alias = out_dir / alias_name
+    for alias_name, source_name in REANIM_ALIASES.items():
+        source = out_dir / f"{source_name}.reanim"
+        alias = out_dir / f"{alias_name}.reanim"
         if source.exists() and not alias.exists():
-            shutil.copyfile(source, alias)
+            link_file(source, alias, link)
             print(f"[reanim-decompile] Wrote alias: {alias} <- {source.name}")
             count += 1
     return count
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Import PvZ main.pak assets into the Cocos project.")
+    parser.add_argument(
+        "--write-reanim-xml",
+        action="store_true",
+        help="Also decompile reanims to tools/raw/reanim/*.reanim XML for debugging.",
+    )
+    parser.add_argument(
+        "--write-particle-xml",
+        action="store_true",
+        help="Also decompile particles to tools/raw/particles/*.xml for debugging.",
+    )
+    parser.add_argument(
+        "--exclude-unused-textures",
+        action="store_true",
+        help="Move textures nothing references to tools/raw/unused_textures (see texture_audit.py).",
+    )
+    parser.add_argument(
+        "--trim-textures",
+        action="store_true",
+        help="Crop transparent margins off reanim part textures (see reanim_converter.py).",
+    )
+    parser.add_argument(
+        "--reduce-png",
+        action="store_true",
+        help="Write textures as indexed or grayscale PNGs when that is lossless and smaller.",
+    )
+    parser.add_argument(
+        "--split-alpha",
+        action="store_true",
+        help="Keep JPEGs with alpha as JPEG plus an 8-bit PNG alpha mask instead of RGBA PNGs.",
+    )
+    parser.add_argument(
+        "--webp",
+        action="store_true",
+        help="Add WebP variants of textures per webp_export.WEBP_POLICY where they pass the "
+        "quality check and are smaller; the PNG stays as the fallback.",
+    )
+    parser.add_argument(
+        "--pack-atlases",
+        action="store_true",
+        help="Pack textures into assets/resources/atlases (see texture_atlas_packer.py).",
+    )
+    parser.add_argument(
+        "--texture-cache",
+        action="store_true",
+        help="Skip re-encoding textures whose sources and options are unchanged, using the "
+        "hash manifest in tools/raw/texture_cache.json.",
+    )
+    parser.add_argument(
+        "--link",
+        choices=LINK_STRATEGIES,
+        default=DEFAULT_LINK_STRATEGY,
+        help="How passthrough files (unmodified images, .wav sounds, reanim aliases) are "
+        "placed: copy, hardlink, reflink, or auto (reflink where supported, else copy).",
+    )
+    args = parser.parse_args()
+
     pak_path = Path("./tools/main.pak")
     raw_dir = Path("./tools/raw")
+    texture_cache_path = raw_dir / "texture_cache.json" if args.texture_cache else None
 
     # ── Step 1: Extract pak ───────────────────────────────────────────
     print("=" * 60)
@@ -131,23 +223,43 @@ def main():
     print("=" * 60)
 
     particle_compiled_dir = raw_dir / "compiled/particles"
-    particle_count = decompile_particle_directory(
-        particle_compiled_dir, raw_dir / "particles"
-    )
+    particle_count = 0
+    if args.write_particle_xml:
+        particle_count = decompile_particle_directory(
+            particle_compiled_dir, raw_dir / "particles"
+        )
     reanim_compiled_dir = raw_dir / "compiled/reanim"
-    reanim_count = decompile_reanim_directory(
-        reanim_compiled_dir, raw_dir / "reanim"
-    )
+    reanim_count = 0
+    if args.write_reanim_xml:
+        reanim_count = decompile_reanim_directory(
+            reanim_compiled_dir, raw_dir / "reanim", args.link
+        )
     print(
         f"[pipeline] Decompiled {particle_count} particle XML files and "
         f"{reanim_count} reanim files\n"
     )
+    # Steps 1-3 are the only writers to raw_dir; later steps share one listing of it.
+    raw_images = ImageTreeIndex(raw_dir)
 
     # ── Step 4: Convert reanim ─────────────────────────────────────
     print("=" * 60)
     print("[pipeline] Step 4: Convert reanim animations")
     print("=" * 60)
-    convert_reanim()
+    convert_reanims(
+        Path("./tools"),
+        reanim_compiled_dir,
+        raw_dir / "reanim",
+        Path("./assets/resources/animations"),
+        Path("./assets/resources/textures"),
+        ReanimOutputOptions(
+            trim_textures=args.trim_textures,
+            reduce_png=args.reduce_png,
+            split_alpha=args.split_alpha,
+            texture_cache=texture_cache_path,
+            link_strategy=args.link,
+        ),
+        images=raw_images,
+    )
 
     # ── Step 5: Convert fonts ──────────────────────────────────────
     print()
@@ -176,8 +288,25 @@ def main():
 
     images_dir = raw_dir / "images"
     texture_dir = Path("./assets/resources/textures")
-    img_count = copy_images(images_dir, texture_dir)
+    reductions: list[PngReduction] | None = [] if args.reduce_png else None
+    alpha_mask_path = get_alpha_mask_manifest_path(texture_dir)
+    alpha_masks = load_texture_manifest(alpha_mask_path) if args.split_alpha else None
+    texture_cache = OutputCache(texture_cache_path) if texture_cache_path is not None else None
+    img_count = copy_images(
+        images_dir,
+        texture_dir,
+        reductions,
+        alpha_masks,
+        texture_cache,
+        args.link,
+        images=raw_images,
+    )
     print(f"[pipeline] Copied {img_count} new images -> {texture_dir}")
+    if alpha_masks is not None:
+        save_texture_manifest(alpha_mask_path, alpha_masks)
+        print(f"[pipeline] Alpha-masked JPEG textures: {len(alpha_masks)} -> {alpha_mask_path}")
+    if reductions is not None:
+        print_png_reductions(reductions, "[pipeline]")
 
     # ── Step 8: Copy particle images ───────────────────────────────
     print()
@@ -187,15 +316,31 @@ def main():
 
     particles_dir = raw_dir / "particles"
     particle_texture_dir = Path("./assets/resources/textures/particles")
-    particle_count = copy_particles(particles_dir, particle_texture_dir)
+    particle_reductions: list[PngReduction] | None = [] if args.reduce_png else None
+    particle_count = copy_particles(
+        particles_dir,
+        particle_texture_dir,
+        reductions=particle_reductions,
+        cache=texture_cache,
+        link=args.link,
+    )
+    if texture_cache is not None:
+        texture_cache.save()
     print(f"[pipeline] Copied {particle_count} new particle images -> {particle_texture_dir}")
+    if particle_reductions is not None:
+        print_png_reductions(particle_reductions, "[pipeline]")
 
     # ── Step 9: Convert particle definitions ───────────────────────
     print()
     print("=" * 60)
     print("[pipeline] Step 9: Convert particle definitions")
     print("=" * 60)
-    convert_particle_directory(particles_dir, Path("./assets/resources/particles"))
+    convert_particle_directory(
+        particles_dir,
+        Path("./assets/resources/particles"),
+        images=raw_images,
+        compiled_dir=particle_compiled_dir,
+    )
 
     # ── Step 10: Convert sounds ────────────────────────────────────
     print()
@@ -205,7 +350,7 @@ def main():
 
     sounds_dir = raw_dir / "sounds"
     audio_dir = Path("./assets/resources/audio/sfx")
-    sound_count = copy_sounds(sounds_dir, audio_dir, overwrite=True)
+    sound_count = copy_sounds(sounds_dir, audio_dir, overwrite=True, link=args.link)
     print(f"[pipeline] Converted {sound_count} sounds -> {audio_dir}")
 
     # ── Step 11: Convert music ────────────────────────────────────
@@ -250,6 +395,69 @@ def main():
 
     generate_lawnmower_cache()
 
+    # ── Step 16: Write the texture usage index ────────────────────
+    print()
+    print("=" * 60)
+    print("[pipeline] Step 16: Write the texture usage index")
+    print("=" * 60)
+
+    usage_index = write_usage_index(
+        Path("./assets/resources/animations"),
+        Path("./assets/resources/particles"),
+        Path("./assets/resources/textures"),
+        Path("./assets/resources/texture_usage.json"),
+    )
+
+    # ── Step 17: Audit unreferenced textures ──────────────────────
+    print()
+    print("=" * 60)
+    print("[pipeline] Step 17: Audit unreferenced textures")
+    print("=" * 60)
+
+    run_texture_audit(
+        exclude_dir=raw_dir / "unused_textures" if args.exclude_unused_textures else None,
+        verbose=False,
+    )
+
+    # ── Step 18: Pack sprite atlases ──────────────────────────────
+    if args.pack_atlases:
+        print()
+        print("=" * 60)
+        print("[pipeline] Step 18: Pack sprite atlases")
+        print("=" * 60)
+
+        atlas_manifest = pack_atlases(
+            Path("./assets/resources/textures"),
+            Path("./assets/resources/atlases"),
+            usage_index,
+            load_manifest_prefixes(Path("./assets/scripts/core/SpriteResourceManifest.ts")),
+        )
+        # Packed sprites load from their atlas; the standalone copies would ship twice.
+        packed_dir = raw_dir / "packed_textures"
+        moved = move_packed_textures(
+            Path("./assets/resources/textures"),
+            get_packed_texture_names(Path("./assets/resources/textures"), atlas_manifest),
+            packed_dir,
+        )
+        print(f"[pipeline] Moved {moved} packed textures -> {packed_dir}")
+
+    # ── Step 19: WebP variants ────────────────────────────────────
+    print()
+    print("=" * 60)
+    print("[pipeline] Step 19: Update WebP variants of textures and atlases")
+    print("=" * 60)
+
+    for webp_dir in (Path("./assets/resources/textures"), Path("./assets/resources/atlases")):
+        if not webp_dir.is_dir():
+            continue
+        if args.webp:
+            # Drops variants of PNGs that earlier steps rewrote before re-encoding.
+            export_webp_textures(webp_dir, verbose=False)
+        else:
+            removed = remove_stale_webp(webp_dir, keep_current=False)
+            if removed:
+                print(f"[pipeline] Removed {removed} WebP variants from {webp_dir}")
+
     print()
     print("=" * 60)
     print("[pipeline] All done!")
@@ -0,0 +1,301 @@
+"""Encode converted reanim nodes into the compact binary runtime format (.bin),
+and decode it again for the tools that read converted animations.
+
+Layout (little-endian, every section 4-byte aligned, offsets absolute):
+
+    header      magic "PVZA", u16 version, u16 header size,
+                u32 string table offset, u32 string count,
+                u32 node table offset, u32 node count,
+                u32 column data offset, u32 column data size
+    strings     u32 end offset per string (relative to the first byte after
+                the offset list), then the concatenated UTF-8 bytes
+    nodes       u32 words, per node:
+                  name, animation count, slot count, track count
+                  per animation: name, f32 fps, start, end, duration,
+                                 bounds offset, frame bounds offset
+                  per slot:      name, frame count, flags, column offset
+                  per track:     name, i32 z index, frame count, flags,
+                                 column offset
+    columns     float32 columns, one after another per slot/track:
+                  slots:  frameIndex x y sx sy kx ky
+                  tracks: frameIndex x y sx sy kx ky alpha, then a u32
+                          image string index column (NO_STRING for none);
+                          keyframed tracks (TRACK_KEYFRAMED flag) add a u8
+                          hideAfter column, padded to 4 bytes
+                  FRAME_MATRICES flag (slots and tracks): six interleaved
+                  float32 per frame, [a b c d tx ty], after the above
+
+Bounds are four float32 values, frame bounds four per frame with NaN for
+frames that draw nothing. NO_OFFSET marks missing bounds.
+"""
+
+from __future__ import annotations
+
+import math
+import struct
+from typing import Any
+
+
+MAGIC = b"PVZA"
+VERSION = 3
+HEADER = struct.Struct("<4sHHIIIIII")
+NO_STRING = 0xFFFFFFFF
+NO_OFFSET = 0xFFFFFFFF
+TRACK_KEYFRAMED = 1
+FRAME_MATRICES = 2
+
+SLOT_COLUMNS = ("frameIndex", "x", "y", "sx", "sy", "kx", "ky")
+TRACK_COLUMNS = (*SLOT_COLUMNS, "alpha")
+
+
+def _align4(data: bytearray) -> None:
+    data.extend(b"\0" * (-len(data) % 4))
+
+
+class _StringTable:
+    def __init__(self) -> None:
+        self.strings: list[str] = []
+        self.indices: dict[str, int] = {}
+
+    def index(self, value: str) -> int:
+        index = self.indices.get(value)
+        if index is None:
+            index = self.indices[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+    def encode(self) -> bytes:
+        encoded = [value.encode("utf-8") for value in self.strings]
+        ends: list[int] = []
+        end = 0
+        for value in encoded:
+            end += len(value)
+            ends.append(end)
+        data = bytearray(struct.pack(f"<{len(ends)}I", *ends))
+        data.extend(b"".join(encoded))
+        _align4(data)
+        return bytes(data)
+
+
+class _ColumnData:
+    def __init__(self) -> None:
+        self.data = bytearray()
+
+    def add_floats(self, values: list[float]) -> int:
+        offset = len(self.data)
+        self.data.extend(struct.pack(f"<{len(values)}f", *values))
+        return offset
+
+    def add_u32(self, values: list[int]) -> int:
+        offset = len(self.data)
+        self.data.extend(struct.pack(f"<{len(values)}I", *values))
+        return offset
+
+    def add_u8(self, values: list[int]) -> int:
+        offset = len(self.data)
+        self.data.extend(bytes(values))
+        _align4(self.data)
+        return offset
+
+
+def _has_matrices(frames: list[dict[str, Any]]) -> bool:
+    return bool(frames) and all("matrix" in frame for frame in frames)
+
+
+def encode_anim_binary(anim_nodes: dict[str, Any]) -> bytes:
+    strings = _StringTable()
+    columns = _ColumnData()
+    # Column offsets are relative to the data section until the header is laid out.
+    words: list[tuple[str, Any]] = []
+
+    def u32(value: int) -> None:
+        words.append(("I", value))
+
+    def data_ref(offset: int | None) -> None:
+        words.append(("D", offset))
+
+    for node_name, node in anim_nodes.items():
+        animations = node["animations"]
+        slots = node["slots"]
+        tracks = node["tracks"]
+        u32(strings.index(node_name))
+        u32(len(animations))
+        u32(len(slots))
+        u32(len(tracks))
+
+        for anim_name, anim in animations.items():
+            u32(strings.index(anim_name))
+            words.append(("f", float(anim["fps"])))
+            u32(anim["startFrame"])
+            u32(anim["endFrame"])
+            u32(anim["duration"])
+            bounds = anim.get("bounds")
+            data_ref(columns.add_floats(bounds) if bounds is not None else None)
+            frame_bounds = anim.get("frameBounds")
+            if frame_bounds is None:
+                data_ref(None)
+            else:
+                flat: list[float] = []
+                for value in frame_bounds:
+                    flat.extend(value if value is not None else (math.nan,) * 4)
+                data_ref(columns.add_floats(flat))
+
+        for slot_name, slot in slots.items():
+            frames = slot["frames"]
+            u32(strings.index(slot_name))
+            u32(len(frames))
+            has_matrices = _has_matrices(frames)
+            u32(FRAME_MATRICES if has_matrices else 0)
+            offset = len(columns.data)
+            for key in SLOT_COLUMNS:
+                columns.add_floats([frame[key] for frame in frames])
+            if has_matrices:
+                columns.add_floats([value for frame in frames for value in frame["matrix"]])
+            data_ref(offset)
+
+        for track_name, track in tracks.items():
+            frames = track["frames"]
+            u32(strings.index(track_name))
+            words.append(("i", track["zIndex"]))
+            u32(len(frames))
+            keyframed = bool(track.get("keyframed"))
+            has_matrices = _has_matrices(frames)
+            u32((TRACK_KEYFRAMED if keyframed else 0) | (FRAME_MATRICES if has_matrices else 0))
+            offset = len(columns.data)
+            for key in TRACK_COLUMNS:
+                columns.add_floats([frame[key] for frame in frames])
+            columns.add_u32([
+                strings.index(frame["image"]) if frame["image"] else NO_STRING
+                for frame in frames
+            ])
+            if keyframed:
+                columns.add_u8([1 if frame.get("hideAfter") else 0 for frame in frames])
+            if has_matrices:
+                columns.add_floats([value for frame in frames for value in frame["matrix"]])
+            data_ref(offset)
+
+    string_data = strings.encode()
+    string_offset = HEADER.size
+    node_offset = string_offset + len(string_data)
+    data_offset = node_offset + 4 * len(words)
+
+    node_data = bytearray()
+    for kind, value in words:
+        if kind == "D":
+            node_data.extend(struct.pack("<I", NO_OFFSET if value is None else data_offset + value))
+        else:
+            node_data.extend(struct.pack(f"<{kind}", value))
+
+    header = HEADER.pack(
+        MAGIC,
+        VERSION,
+        HEADER.size,
+        string_offset,
+        len(strings.strings),
+        node_offset,
+        len(anim_nodes),
+        data_offset,
+        len(columns.data),
+    )
+    return header + string_data + bytes(node_data) + bytes(columns.data)
+
+
+def _read_floats(data: bytes, offset: int, count: int) -> list[float]:
+    return list(struct.unpack_from(f"<{count}f", data, offset))
+
+
+def _read_bounds(values: list[float], index: int) -> list[float] | None:
+    if math.isnan(values[index]):
+        return None
+    return values[index:index + 4]
+
+
+def decode_anim_binary(data: bytes) -> dict[str, Any]:
+    """Converted reanim nodes of a .bin; float values come back as float32."""
+    magic, version, _header_size, string_offset, string_count, pos, node_count, _, _ = (
+        HEADER.unpack_from(data)
+    )
+    if magic != MAGIC:
+        raise ValueError("Not a reanim binary (bad magic)")
+    if version != VERSION:
+        raise ValueError(f"Unsupported reanim binary version {version}")
+
+    ends = struct.unpack_from(f"<{string_count}I", data, string_offset)
+    bytes_start = string_offset + 4 * string_count
+    strings: list[str] = []
+    start = 0
+    for end in ends:
+        strings.append(data[bytes_start + start:bytes_start + end].decode("utf-8"))
+        start = end
+
+    def read(fmt: str) -> Any:
+        nonlocal pos
+        (value,) = struct.unpack_from(f"<{fmt}", data, pos)
+        pos += 4
+        return value
+
+    def read_columns(offset: int, count: int, keys: tuple[str, ...]) -> list[dict[str, Any]]:
+        columns = [_read_floats(data, offset + i * count * 4, count) for i in range(len(keys))]
+        frames = [dict(zip(keys, values)) for values in zip(*columns)]
+        for frame in frames:
+            frame["frameIndex"] = int(frame["frameIndex"])
+        return frames
+
+    def attach_matrices(frames: list[dict[str, Any]], offset: int) -> None:
+        values = _read_floats(data, offset, 6 * len(frames))
+        for i, frame in enumerate(frames):
+            frame["matrix"] = values[i * 6:i * 6 + 6]
+
+    anim_nodes: dict[str, Any] = {}
+    for _ in range(node_count):
+        node_name = strings[read("I")]
+        anim_count, slot_count, track_count = read("I"), read("I"), read("I")
+
+        animations: dict[str, Any] = {}
+        for _ in range(anim_count):
+            anim_name = strings[read("I")]
+            anim: dict[str, Any] = {"fps": read("f")}
+            anim["startFrame"], anim["endFrame"], anim["duration"] = read("I"), read("I"), read("I")
+            bounds_offset, frame_bounds_offset = read("I"), read("I")
+            if bounds_offset != NO_OFFSET:
+                anim["bounds"] = _read_floats(data, bounds_offset, 4)
+            if frame_bounds_offset != NO_OFFSET:
+                values = _read_floats(data, frame_bounds_offset, 4 * anim["duration"])
+                anim["frameBounds"] = [
+                    _read_bounds(values, i) for i in range(0, len(values), 4)
+                ]
+            animations[anim_name] = anim
+
+        slots: dict[str, Any] = {}
+        for _ in range(slot_count):
+            slot_name = strings[read("I")]
+            count, flags, offset = read("I"), read("I"), read("I")
+            frames = read_columns(offset, count, SLOT_COLUMNS)
+            if flags & FRAME_MATRICES:
+                attach_matrices(frames, offset + 4 * len(SLOT_COLUMNS) * count)
+            slots[slot_name] = {"frames": frames}
+
+        tracks: dict[str, Any] = {}
+        for _ in range(track_count):
+            track_name = strings[read("I")]
+            track: dict[str, Any] = {"zIndex": read("i")}
+            count, flags, offset = read("I"), read("I"), read("I")
+            frames = read_columns(offset, count, TRACK_COLUMNS)
+            image_offset = offset + 4 * len(TRACK_COLUMNS) * count
+            images = struct.unpack_from(f"<{count}I", data, image_offset)
+            for frame, image in zip(frames, images):
+                frame["image"] = strings[image] if image != NO_STRING else None
+            extra_offset = image_offset + 4 * count
+            if flags & TRACK_KEYFRAMED:
+                track["keyframed"] = True
+                for frame, hide_after in zip(frames, data[extra_offset:extra_offset + count]):
+                    if hide_after:
+                        frame["hideAfter"] = True
+                extra_offset += count + (-count % 4)
+            if flags & FRAME_MATRICES:
+                attach_matrices(frames, extra_offset)
+            track["frames"] = frames
+            tracks[track_name] = track
+
+        anim_nodes[node_name] = {"animations": animations, "slots": slots, "tracks": tracks}
+    return anim_nodes
@@ -0,0 +1,114 @@
+"""Per-clip chunked output for converted reanims.
+
+split_anim_chunks turns a reanim's nodes into a small index plus one chunk
+per animation clip, so the runtime only loads the clips it plays:
+
+    <reanim>/index.json
+        {"nodes": {node: {"animations": {clip: {..., "chunk": name}},
+                          "slots": {slot: {}},
+                          "tracks": {track: {"zIndex", "keyframed"?}}}}}
+    <reanim>/<chunk>.json
+        {"tracks": {track: [frames in the clip's range]},
+         "slots": {slot: [frames in the clip's range]},
+         "frameBounds"?: [the clip's per-frame bounds]}
+
+The index holds no frames: slot and track frames and per-frame bounds all
+live in the chunks. Nodes whose clip chunks are identical share one.
+join_anim_chunks puts the nodes back together for tools that read them.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from typing import Any
+
+
+def slice_clip_frames(
+    parts: dict[str, Any], anim: dict[str, Any]
+) -> dict[str, list[dict[str, Any]]]:
+    """Frames of each slot or track within the clip's [startFrame, endFrame] range."""
+    sliced: dict[str, list[dict[str, Any]]] = {}
+    for part_name, part in parts.items():
+        frames = part["frames"]
+        frame_indices = [frame["frameIndex"] for frame in frames]
+        start = bisect_left(frame_indices, anim["startFrame"])
+        clip_frames = frames[start:bisect_right(frame_indices, anim["endFrame"])]
+        if clip_frames:
+            sliced[part_name] = clip_frames
+    return sliced
+
+
+def get_clip_chunk(node: dict[str, Any], anim: dict[str, Any]) -> dict[str, Any]:
+    chunk: dict[str, Any] = {
+        "tracks": slice_clip_frames(node["tracks"], anim),
+        "slots": slice_clip_frames(node["slots"], anim),
+    }
+    if "frameBounds" in anim:
+        chunk["frameBounds"] = anim["frameBounds"]
+    return chunk
+
+
+def split_anim_chunks(anim_nodes: dict[str, Any]) -> tuple[dict[str, Any], dict[str, dict[str, Any]]]:
+    chunks: dict[str, dict[str, Any]] = {}
+    nodes: dict[str, Any] = {}
+
+    for node_name, node in anim_nodes.items():
+        animations: dict[str, Any] = {}
+        for clip_name, anim in node["animations"].items():
+            chunk = get_clip_chunk(node, anim)
+            chunk_name = clip_name
+            if chunk_name in chunks and chunks[chunk_name] != chunk:
+                chunk_name = f"{node_name}__{clip_name}"
+            chunks.setdefault(chunk_name, chunk)
+            info = {key: value for key, value in anim.items() if key != "frameBounds"}
+            animations[clip_name] = {**info, "chunk": chunk_name}
+
+        tracks: dict[str, Any] = {}
+        for track_name, track in node["tracks"].items():
+            info: dict[str, Any] = {"zIndex": track["zIndex"]}
+            if track.get("keyframed"):
+                info["keyframed"] = True
+            tracks[track_name] = info
+
+        nodes[node_name] = {
+            "animations": animations,
+            "slots": {
+                slot_name: {key: value for key, value in slot.items() if key != "frames"}
+                for slot_name, slot in node["slots"].items()
+            },
+            "tracks": tracks,
+        }
+
+    return {"nodes": nodes}, chunks
+
+
+def join_anim_chunks(index: dict[str, Any], chunks: dict[str, dict[str, Any]]) -> dict[str, Any]:
+    """Nodes of index with the frames of all their clip chunks merged back in."""
+    anim_nodes: dict[str, Any] = {}
+    for node_name, node in index["nodes"].items():
+        slot_frames: dict[str, dict[int, dict[str, Any]]] = {name: {} for name in node["slots"]}
+        track_frames: dict[str, dict[int, dict[str, Any]]] = {name: {} for name in node["tracks"]}
+        animations: dict[str, Any] = {}
+        for clip_name, info in node["animations"].items():
+            chunk = chunks[info["chunk"]]
+            anim = {key: value for key, value in info.items() if key != "chunk"}
+            if "frameBounds" in chunk:
+                anim["frameBounds"] = chunk["frameBounds"]
+            animations[clip_name] = anim
+            for merged, parts in ((slot_frames, chunk["slots"]), (track_frames, chunk["tracks"])):
+                for part_name, frames in parts.items():
+                    if part_name in merged:
+                        merged[part_name].update((frame["frameIndex"], frame) for frame in frames)
+
+        anim_nodes[node_name] = {
+            "animations": animations,
+            "slots": {
+                name: {**slot, "frames": [frames[i] for i in sorted(frames)]}
+                for (name, slot), frames in zip(node["slots"].items(), slot_frames.values())
+            },
+            "tracks": {
+                name: {**track, "frames": [frames[i] for i in sorted(frames)]}
+                for (name, track), frames in zip(node["tracks"].items(), track_frames.values())
+            },
+        }
+    return anim_nodes
@@ -1,12 +1,50 @@
+import argparse
 import json
+import math
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from dataclasses import dataclass
 from xml.etree import ElementTree
 from pathlib import Path
 from typing import Any
 
+from PIL import Image
+
+from decompile_reanim_compiled import (
+    REANIM_ALIASES,
+    Reanim,
+    Track,
+    is_placeholder,
+    parse_reanim_cache,
+    unpack_compiled,
+)
+from generate_packet_plant_cache import frame_to_matrix, render_frame_to_matrix
+from reanim_binary import encode_anim_binary
+from reanim_chunks import split_anim_chunks
+from reanim_keyframes import (
+    DEFAULT_LOSSY_TOLERANCE,
+    KEYFRAME_MODES,
+    get_tolerance,
+    reduce_anim_nodes,
+)
+from reanim_lod import decimate_anim_nodes, get_lod_name
+from reanim_pruning import collect_source_strings, prune_anim_nodes
+from reanim_shared import share_anim_tracks
+from file_links import DEFAULT_LINK_STRATEGY, LINK_STRATEGIES
+from resource_index import ImageTreeIndex
 from sprite_texture_preprocessor import (
+    ALPHA_MASK_SUFFIX,
+    TRIM_MANIFEST_NAME,
+    OutputCache,
+    PngReduction,
     get_alpha_companion_name,
+    get_alpha_mask_manifest_path,
     get_output_name,
+    get_trim_manifest_path,
     is_alpha_companion_name,
+    load_texture_manifest,
+    print_png_reductions,
+    save_texture_manifest,
     select_image_resources,
     write_preprocessed_resource,
 )
@@ -98,6 +136,95 @@ def parse_track_data(track_node: ElementTree.Element) -> tuple[str, int, list[di
     return name, duration, frames
 
 
+def parse_xml_tracks(anim_xml: ElementTree.Element) -> tuple[int, list[tuple[str, int, list[dict[str, Any]]]]]:
+    fps_node = anim_xml.find('fps')
+    fps = int(fps_node.text) if fps_node is not None and fps_node.text else 12
+    return fps, [parse_track_data(t_node) for t_node in anim_xml.findall('track')]
+
+
+def compiled_value(value: float) -> float:
+    # Match the 6-decimal text the decompiler writes, so both paths emit identical JSON.
+    return round(value, 6) + 0.0
+
+
+def parse_compiled_track(track: Track) -> tuple[str, int, list[dict[str, Any]]]:
+    """Same as parse_track_data, reading a decompiled Track's columns instead of XML."""
+    columns = track.columns
+    duration = len(columns)
+    value_columns = [
+        (key, [None if is_placeholder(value) else compiled_value(value) for value in column])
+        for key, column in (
+            ('x', columns.x),
+            ('y', columns.y),
+            ('sx', columns.sx),
+            ('sy', columns.sy),
+            ('kx', columns.kx),
+            ('ky', columns.ky),
+            ('alpha', columns.alpha),
+        )
+    ]
+    frame_flags = [None if is_placeholder(value) else compiled_value(value) for value in columns.frame]
+
+    curr = {
+        'x': 0.0, 'y': 0.0, 'sx': 1.0, 'sy': 1.0,
+        'kx': 0.0, 'ky': 0.0, 'alpha': 1.0, 'image': None,
+        'frameIndex': 0
+    }
+    is_active = not (duration > 0 and frame_flags[0] == -1)
+    frames = []
+
+    for i in range(duration):
+        curr['frameIndex'] = i
+
+        f_val = frame_flags[i]
+        if f_val == 0:
+            is_active = True
+        elif f_val == -1:
+            is_active = False
+
+        for key, values in value_columns:
+            value = values[i]
+            if value is not None:
+                curr[key] = value
+
+        val_i = columns.image[i].strip()
+        if val_i:
+            assert val_i.startswith('IMAGE_REANIM_'), "Unexpected image format"
+            curr['image'] = val_i.replace('IMAGE_REANIM_', '', 1).lower()
+
+        if is_active:
+            frames.append(curr.copy())
+
+    return track.name.strip(), duration, frames
+
+
+def parse_compiled_tracks(reanim: Reanim) -> tuple[int, list[tuple[str, int, list[dict[str, Any]]]]]:
+    fps = 12 if math.isclose(reanim.fps, 12.0, rel_tol=0.0, abs_tol=0.001) else int(compiled_value(reanim.fps))
+    return fps, [parse_compiled_track(track) for track in reanim.tracks]
+
+
+def find_compiled_reanim(compiled_dir: Path, anim_name: str) -> Path | None:
+    for name in (anim_name, REANIM_ALIASES.get(anim_name)):
+        if name is None:
+            continue
+        path = compiled_dir / f"{name}.reanim.compiled"
+        if path.exists():
+            return path
+    return None
+
+
+def load_anim_tracks(
+    compiled_dir: Path,
+    xml_dir: Path,
+    anim_name: str,
+) -> tuple[int, list[tuple[str, int, list[dict[str, Any]]]]]:
+    """Read a reanim straight from its compiled cache, falling back to decompiled XML."""
+    compiled_path = find_compiled_reanim(compiled_dir, anim_name)
+    if compiled_path is not None:
+        return parse_compiled_tracks(parse_reanim_cache(unpack_compiled(compiled_path)))
+    return parse_xml_tracks(load_anim_xml(xml_dir, anim_name))
+
+
 def warn_missing_track(anim_name: str, node_name: str, track_name: str, usage: str) -> None:
     print(
         f"[reanim] WARN: {anim_name}.{node_name} {usage} track '{track_name}' "
@@ -165,14 +292,118 @@ def get_slot_data(
     }
 
 
+def load_texture_sizes(
+    xml_dir: Path, images: ImageTreeIndex | None = None
+) -> dict[str, tuple[int, int]]:
+    sizes: dict[str, tuple[int, int]] = {}
+    for resource_name, src in select_image_resources(xml_dir, images).items():
+        if is_alpha_companion_name(resource_name):
+            continue
+        with Image.open(src) as image:
+            sizes[resource_name] = image.size
+    return sizes
+
+
+def get_frame_bounds(
+    frame: dict[str, Any],
+    texture_sizes: dict[str, tuple[int, int]],
+) -> tuple[float, float, float, float] | None:
+    image = frame.get('image')
+    if not image or frame['alpha'] <= 0:
+        return None
+    size = texture_sizes.get(image)
+    if size is None:
+        return None
+
+    width, height = size
+    a, b, c, d, tx, ty = render_frame_to_matrix(frame)
+    xs = [tx, a * width + tx, c * height + tx, a * width + c * height + tx]
+    ys = [ty, b * width + ty, d * height + ty, b * width + d * height + ty]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def union_bounds(
+    left: tuple[float, float, float, float] | None,
+    right: tuple[float, float, float, float] | None,
+) -> tuple[float, float, float, float] | None:
+    if left is None:
+        return right
+    if right is None:
+        return left
+    return (
+        min(left[0], right[0]),
+        min(left[1], right[1]),
+        max(left[2], right[2]),
+        max(left[3], right[3]),
+    )
+
+
+def round_bounds(bounds: tuple[float, float, float, float] | None) -> list[float] | None:
+    if bounds is None:
+        return None
+    return [round(value, 2) for value in bounds]
+
+
+def add_animation_bounds(
+    animations: dict[str, dict[str, Any]],
+    tracks: dict[str, dict[str, Any]],
+    texture_sizes: dict[str, tuple[int, int]],
+) -> None:
+    """Store per-frame and per-clip axis-aligned bounds of every drawable track.
+
+    Bounds are in reanim space (y down) and ``null`` marks frames where no
+    track draws anything, so the runtime can skip them without sampling.
+    """
+    bounds_by_frame: dict[int, tuple[float, float, float, float] | None] = {}
+    for track in tracks.values():
+        for frame in track['frames']:
+            frame_bounds = get_frame_bounds(frame, texture_sizes)
+            if frame_bounds is not None:
+                fi = frame['frameIndex']
+                bounds_by_frame[fi] = union_bounds(bounds_by_frame.get(fi), frame_bounds)
+
+    for anim_data in animations.values():
+        frame_bounds = [
+            bounds_by_frame.get(fi)
+            for fi in range(anim_data['startFrame'], anim_data['endFrame'] + 1)
+        ]
+        clip_bounds = None
+        for bounds in frame_bounds:
+            clip_bounds = union_bounds(clip_bounds, bounds)
+        anim_data['bounds'] = round_bounds(clip_bounds)
+        anim_data['frameBounds'] = [round_bounds(bounds) for bounds in frame_bounds]
+
+
+def merge_frame_ranges(ranges: Iterable[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Sort inclusive frame ranges and merge the ones that overlap or touch."""
+    merged: list[tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def slice_frames_in_ranges(
+    frames: list[dict[str, Any]],
+    frame_indices: list[int],
+    ranges: list[tuple[int, int]],
+) -> list[dict[str, Any]]:
+    """Frames inside any of the merged ranges; frame_indices is frames' sorted frameIndex column."""
+    sliced: list[dict[str, Any]] = []
+    for start, end in ranges:
+        sliced.extend(frames[bisect_left(frame_indices, start):bisect_right(frame_indices, end)])
+    return sliced
+
+
 def get_anim_nodes(
     source_anim_name: str,
     anim_info: dict[str, Any],
-    anim_xml: ElementTree.Element,
+    fps: int,
+    parsed_tracks: list[tuple[str, int, list[dict[str, Any]]]],
+    texture_sizes: dict[str, tuple[int, int]] | None = None,
 ) -> dict[str, Any]:
-    fps_node = anim_xml.find('fps')
-    fps = int(fps_node.text) if fps_node is not None and fps_node.text else 12
-
     tracks: dict[str, dict[str, Any]] = {}
     anim_duration = None
 
@@ -185,8 +416,7 @@ def get_anim_nodes(
             index += 1
         return f"{track_name}_{index}"
 
-    for z, t_node in enumerate(anim_xml.findall('track')):
-        track_name, track_duration, track_frames = parse_track_data(t_node)
+    for z, (track_name, track_duration, track_frames) in enumerate(parsed_tracks):
         resolved_track_name = unique_track_name(track_name)
         tracks[resolved_track_name] = {
             'frames': track_frames,
@@ -200,7 +430,12 @@ def get_anim_nodes(
 
     if anim_duration is None:
         raise ValueError(
-            "No tracks found in XML, cannot determine animation duration.")
+            "No tracks found in reanim, cannot determine animation duration.")
+
+    track_frame_indices = {
+        name: [frame['frameIndex'] for frame in track['frames']]
+        for name, track in tracks.items()
+    }
 
     anim_nodes = {}
     for node_name, node_info in anim_info.items():
@@ -239,30 +474,23 @@ def get_anim_nodes(
             if slot_data is not None:
                 slots[slot_name] = slot_data
 
-        anim_ranges = [
+        anim_ranges = merge_frame_ranges(
             (anim_data['startFrame'], anim_data['endFrame'])
             for anim_data in animations.values()
-        ]
-
-        def filter_frames_in_range(track_data: dict[str, Any]) -> list[dict[str, Any]]:
-            filtered = []
-            for frame in track_data['frames']:
-                fi = frame['frameIndex']
-                for start, end in anim_ranges:
-                    if start <= fi <= end:
-                        filtered.append(frame)
-                        break
-            return filtered
+        )
 
         related_tracks = {}
         for k, v in tracks.items():
-            filtered = filter_frames_in_range(v)
+            filtered = slice_frames_in_ranges(v['frames'], track_frame_indices[k], anim_ranges)
             if filtered:
                 related_tracks[k] = {
                     'frames': filtered,
                     'zIndex': v['zIndex']
                 }
 
+        if texture_sizes is not None:
+            add_animation_bounds(animations, related_tracks, texture_sizes)
+
         anim_nodes[node_name] = {
             'animations': animations,
             'slots': slots,
@@ -276,49 +504,366 @@ def save_anim_data(output_dir: Path, anim_name: str, anim_nodes: dict[str, Any])
     output_dir.mkdir(parents=True, exist_ok=True)
     with open(output_dir / f"{anim_name}.json", 'w') as f:
         json.dump(anim_nodes, f, separators=(',', ':'))
-    node_names = ', '.join(anim_nodes.keys())
+    nodes = anim_nodes["nodes"] if "sharedTracks" in anim_nodes else anim_nodes
+    node_names = ', '.join(nodes.keys())
     print(f"[reanim]   Nodes: {node_names}")
     print(f"[reanim] Wrote: {output_dir / f'{anim_name}.json'}")
 
 
-def copy_textures(xml_dir: Path, texture_dir: Path):
-    """Copy all image files from xml_dir to texture_dir."""
+def save_anim_binary(output_dir: Path, anim_name: str, anim_nodes: dict[str, Any]):
+    output_dir.mkdir(parents=True, exist_ok=True)
+    dst = output_dir / f"{anim_name}.bin"
+    dst.write_bytes(encode_anim_binary(anim_nodes))
+    print(f"[reanim] Wrote: {dst}")
+
+
+def save_anim_chunks(output_dir: Path, anim_name: str, anim_nodes: dict[str, Any]):
+    chunk_dir = output_dir / anim_name
+    chunk_dir.mkdir(parents=True, exist_ok=True)
+    index, chunks = split_anim_chunks(anim_nodes)
+    # Chunks of clips that were renamed or removed since the last run.
+    for stale in chunk_dir.glob("*.json"):
+        if stale.stem != "index" and stale.stem not in chunks:
+            stale.unlink()
+            stale.with_name(f"{stale.name}.meta").unlink(missing_ok=True)
+    with open(chunk_dir / "index.json", 'w') as f:
+        json.dump(index, f, separators=(',', ':'))
+    for chunk_name, chunk in chunks.items():
+        with open(chunk_dir / f"{chunk_name}.json", 'w') as f:
+            json.dump(chunk, f, separators=(',', ':'))
+    print(f"[reanim] Wrote: {chunk_dir} (index + {len(chunks)} clip chunks)")
+
+
+def copy_textures(
+    xml_dir: Path,
+    texture_dir: Path,
+    trim: bool = False,
+    reduce_png: bool = False,
+    split_alpha: bool = False,
+    cache: OutputCache | None = None,
+    link: str = DEFAULT_LINK_STRATEGY,
+    images: ImageTreeIndex | None = None,
+):
+    """Copy all image files from xml_dir to texture_dir.
+
+    With trim, transparent margins are cropped and recorded in the trim manifest.
+    With reduce_png, PNGs are written indexed or grayscale where that is lossless.
+    With split_alpha, JPEGs with alpha stay JPEG next to a PNG alpha mask.
+    With cache, textures whose sources and options are unchanged are not re-encoded.
+    Textures that need no preprocessing are placed with the link strategy.
+    """
     texture_dir.mkdir(parents=True, exist_ok=True)
 
-    resources = select_image_resources(xml_dir)
+    resources = select_image_resources(xml_dir, images)
+    trim_manifest_path = get_trim_manifest_path(texture_dir)
+    trim_manifest = load_texture_manifest(trim_manifest_path) if trim else None
+    reductions: list[PngReduction] | None = [] if reduce_png else None
+    alpha_mask_path = get_alpha_mask_manifest_path(texture_dir)
+    alpha_masks = load_texture_manifest(alpha_mask_path) if split_alpha else None
     copied = 0
     skipped = 0
+    trimmed = 0
+    saved_pixels = 0
     for resource_name, src in sorted(resources.items()):
         if is_alpha_companion_name(resource_name) and resource_name[:-1] in resources:
             continue
         alpha_src = resources.get(get_alpha_companion_name(resource_name))
         dst_name = get_output_name(src, resource_name, force_png=alpha_src is not None)
         dst = texture_dir / dst_name
-        if write_preprocessed_resource(src, dst, resource_name=resource_name, alpha_src=alpha_src):
+        if write_preprocessed_resource(
+            src,
+            dst,
+            resource_name=resource_name,
+            alpha_src=alpha_src,
+            trim_manifest=trim_manifest,
+            reductions=reductions,
+            alpha_masks=alpha_masks,
+            cache=cache,
+            link=link,
+        ):
             print(f"[reanim] Wrote: {dst}")
             copied += 1
         else:
             skipped += 1
+        entry = trim_manifest.get(dst.stem) if trim_manifest is not None else None
+        if entry is not None:
+            trimmed += 1
+            width, height = entry["size"]
+            saved_pixels += width * height - entry["rect"][2] * entry["rect"][3]
 
     print(f"[reanim] Textures: {copied} copied, {skipped} skipped")
+    if reductions is not None:
+        print_png_reductions(reductions, "[reanim]")
+    if alpha_masks is not None:
+        save_texture_manifest(alpha_mask_path, alpha_masks)
+        print(f"[reanim] Alpha-masked JPEG textures: {len(alpha_masks)} -> {alpha_mask_path}")
+    if trim_manifest is not None:
+        save_texture_manifest(trim_manifest_path, trim_manifest)
+        print(
+            f"[reanim] Trimmed {trimmed} textures, saved {saved_pixels} pixels "
+            f"-> {trim_manifest_path}"
+        )
 
 
-def main():
-    config_dir = Path("./tools")
-    xml_dir = Path("./tools/raw/reanim")
-    output_dir = Path("./assets/resources/animations")
-    texture_dir = Path("./assets/resources/textures")
+OUTPUT_FORMATS = ("json", "binary", "chunks")
+
 
+@dataclass(frozen=True)
+class ReanimOutputOptions:
+    formats: tuple[str, ...] = ("json",)
+    keyframes: str = "off"
+    keyframe_tolerance: float = DEFAULT_LOSSY_TOLERANCE
+    shared_tracks: bool = False
+    prune_tracks: bool = False
+    matrices: bool = False
+    lod_factors: tuple[int, ...] = ()
+    trim_textures: bool = False
+    reduce_png: bool = False
+    split_alpha: bool = False
+    texture_cache: Path | None = None
+    link_strategy: str = DEFAULT_LINK_STRATEGY
+    # Sources whose string literals may name tracks; those are never pruned.
+    prune_keep_sources: tuple[Path, ...] = (Path("./assets/scripts"), Path("./tools"))
+
+
+def json_size(data: Any) -> int:
+    return len(json.dumps(data, separators=(',', ':')))
+
+
+def apply_track_pruning(
+    anim_nodes: dict[str, Any],
+    anim_info: dict[str, Any],
+    referenced: set[str],
+) -> None:
+    size_before = json_size(anim_nodes)
+    report = prune_anim_nodes(anim_nodes, anim_info, referenced)
+    if not report.pruned:
+        print("[reanim]   Pruned tracks: none")
+        return
+    size_after = json_size(anim_nodes)
+    print(f"[reanim]   Pruned tracks: {len(report.pruned)}, saved {size_before - size_after} bytes")
+    for item in report.pruned:
+        print(f"[reanim]     {item.node}.{item.track} ({item.reason})")
+
+
+def add_frame_matrices(anim_nodes: dict[str, Any]) -> None:
+    """Store each slot and track frame's 2x3 affine as "matrix": [a, b, c, d, tx, ty]."""
+    for node in anim_nodes.values():
+        for part in (*node["slots"].values(), *node["tracks"].values()):
+            for frame in part["frames"]:
+                if "matrix" not in frame:
+                    frame["matrix"] = [compiled_value(value) for value in frame_to_matrix(frame)]
+
+
+def apply_keyframe_reduction(anim_nodes: dict[str, Any], options: ReanimOutputOptions) -> None:
+    size_before = json_size(anim_nodes)
+    tolerance = get_tolerance(options.keyframes, options.keyframe_tolerance)
+    stats = reduce_anim_nodes(anim_nodes, tolerance)
+    size_after = json_size(anim_nodes)
+    saved = 100 * (1 - size_after / size_before) if size_before else 0.0
+    print(
+        f"[reanim]   Keyframes ({options.keyframes}): {stats.frames_before} -> "
+        f"{stats.frames_after} frames, {size_before} -> {size_after} bytes "
+        f"(-{saved:.1f}%), max error {stats.max_error:.6g}"
+    )
+
+
+def get_shared_anim_data(anim_nodes: dict[str, Any]) -> dict[str, Any]:
+    shared = share_anim_tracks(anim_nodes)
+    size_before = json_size(anim_nodes)
+    size_after = json_size(shared)
+    saved = 100 * (1 - size_after / size_before) if size_before else 0.0
+    print(
+        f"[reanim]   Shared tracks: {len(shared['sharedTracks'])}, "
+        f"{size_before} -> {size_after} bytes (-{saved:.1f}%)"
+    )
+    return shared
+
+
+def save_anim_outputs(
+    output_dir: Path,
+    anim_name: str,
+    anim_nodes: dict[str, Any],
+    options: ReanimOutputOptions,
+) -> None:
+    if options.keyframes != "off":
+        apply_keyframe_reduction(anim_nodes, options)
+    if options.matrices:
+        add_frame_matrices(anim_nodes)
+    if "json" in options.formats:
+        json_data = get_shared_anim_data(anim_nodes) if options.shared_tracks else anim_nodes
+        save_anim_data(output_dir, anim_name, json_data)
+    if "binary" in options.formats:
+        save_anim_binary(output_dir, anim_name, anim_nodes)
+    if "chunks" in options.formats:
+        save_anim_chunks(output_dir, anim_name, anim_nodes)
+
+
+def convert_reanims(
+    config_dir: Path,
+    compiled_dir: Path,
+    xml_dir: Path,
+    output_dir: Path,
+    texture_dir: Path,
+    options: ReanimOutputOptions = ReanimOutputOptions(),
+    images: ImageTreeIndex | None = None,
+) -> None:
+    """images: listing of xml_dir shared with other steps; scanned here when None."""
+    if images is None:
+        images = ImageTreeIndex(xml_dir)
     anim_defs = load_json_config(config_dir)
+    texture_sizes = load_texture_sizes(xml_dir, images)
+    referenced = collect_source_strings(options.prune_keep_sources) if options.prune_tracks else set()
 
     for anim_name, anim_info in anim_defs.items():
         print(f"[reanim] Processing: {anim_name}")
 
-        anim_xml = load_anim_xml(xml_dir, anim_name)
-        anim_nodes = get_anim_nodes(anim_name, anim_info, anim_xml)
-        save_anim_data(output_dir, anim_name, anim_nodes)
+        fps, parsed_tracks = load_anim_tracks(compiled_dir, xml_dir, anim_name)
+        anim_nodes = get_anim_nodes(anim_name, anim_info, fps, parsed_tracks, texture_sizes)
+        if options.prune_tracks:
+            apply_track_pruning(anim_nodes, anim_info, referenced)
+        # Variants are cut from the full-rate frames before any in-place reduction.
+        variants = [
+            (get_lod_name(anim_name, factor), decimate_anim_nodes(anim_nodes, factor))
+            for factor in options.lod_factors
+        ]
+        save_anim_outputs(output_dir, anim_name, anim_nodes, options)
+        for variant_name, variant_nodes in variants:
+            print(f"[reanim]   LOD variant: {variant_name}")
+            save_anim_outputs(output_dir, variant_name, variant_nodes, options)
+
+    cache = OutputCache(options.texture_cache) if options.texture_cache is not None else None
+    copy_textures(
+        xml_dir,
+        texture_dir,
+        trim=options.trim_textures,
+        reduce_png=options.reduce_png,
+        split_alpha=options.split_alpha,
+        cache=cache,
+        link=options.link_strategy,
+        images=images,
+    )
+    if cache is not None:
+        cache.save()
 
-    copy_textures(xml_dir, texture_dir)
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert PvZ reanim animations to runtime JSON.")
+    parser.add_argument("--config", type=Path, default=Path("./tools"), help="Directory containing anim_defs.json.")
+    parser.add_argument(
+        "--compiled",
+        type=Path,
+        default=Path("./tools/raw/compiled/reanim"),
+        help="Directory of .reanim.compiled caches, read directly when present.",
+    )
+    parser.add_argument(
+        "--xml",
+        type=Path,
+        default=Path("./tools/raw/reanim"),
+        help="Directory of reanim part images and fallback .reanim XML files.",
+    )
+    parser.add_argument("--dst", type=Path, default=Path("./assets/resources/animations"))
+    parser.add_argument("--textures", type=Path, default=Path("./assets/resources/textures"))
+    parser.add_argument(
+        "--format",
+        dest="formats",
+        action="append",
+        choices=OUTPUT_FORMATS,
+        help="Output format; repeat to write several. Defaults to json. "
+        "binary writes packed float32 columns to <name>.bin; chunks writes "
+        "<name>/index.json plus one <name>/<clip>.json per animation clip.",
+    )
+    parser.add_argument(
+        "--keyframes",
+        choices=KEYFRAME_MODES,
+        default="off",
+        help="Drop track frames that interpolation reproduces: lossless keeps source precision, "
+        "lossy allows --keyframe-tolerance.",
+    )
+    parser.add_argument(
+        "--keyframe-tolerance",
+        type=float,
+        default=DEFAULT_LOSSY_TOLERANCE,
+        help=f"Max absolute error per channel in lossy mode. Defaults to {DEFAULT_LOSSY_TOLERANCE}.",
+    )
+    parser.add_argument(
+        "--shared-tracks",
+        action="store_true",
+        help="Store each track's frames once per reanim in the JSON; nodes reference them by index.",
+    )
+    parser.add_argument(
+        "--matrices",
+        action="store_true",
+        help="Bake each slot/track frame's affine matrix so the runtime lerps it instead of "
+        "recomputing sin/cos of kx/ky.",
+    )
+    parser.add_argument(
+        "--lod",
+        dest="lod_factors",
+        type=int,
+        action="append",
+        help="Also write <name>_lod<N> keeping every Nth frame of each clip at fps / N; repeatable.",
+    )
+    parser.add_argument(
+        "--trim-textures",
+        action="store_true",
+        help="Crop transparent margins off part textures; original size and offset go to "
+        f"<textures>/../{TRIM_MANIFEST_NAME} for the runtime to restore placement.",
+    )
+    parser.add_argument(
+        "--reduce-png",
+        action="store_true",
+        help="Write part PNGs as indexed or grayscale PNGs when that is lossless and smaller.",
+    )
+    parser.add_argument(
+        "--split-alpha",
+        action="store_true",
+        help="Keep JPEG parts with an alpha image as the original JPEG plus an 8-bit "
+        f"<name>{ALPHA_MASK_SUFFIX}.png mask instead of one RGBA PNG.",
+    )
+    parser.add_argument(
+        "--texture-cache",
+        type=Path,
+        help="Output manifest (JSON) recording source and output hashes; textures whose "
+        "inputs are unchanged and whose outputs are untouched are skipped without re-encoding.",
+    )
+    parser.add_argument(
+        "--link",
+        choices=LINK_STRATEGIES,
+        default=DEFAULT_LINK_STRATEGY,
+        help="How textures that need no preprocessing are placed (see file_links.py).",
+    )
+    parser.add_argument(
+        "--prune-tracks",
+        action="store_true",
+        help="Drop tracks that never draw and are not slots, declared animations, keepTracks "
+        "entries or string literals in --keep-refs sources.",
+    )
+    parser.add_argument(
+        "--keep-refs",
+        type=Path,
+        action="append",
+        help="Source directory scanned for track names to keep; repeatable. "
+        "Defaults to ./assets/scripts and ./tools.",
+    )
+    args = parser.parse_args()
+
+    options = ReanimOutputOptions(
+        formats=tuple(args.formats or ("json",)),
+        keyframes=args.keyframes,
+        keyframe_tolerance=args.keyframe_tolerance,
+        shared_tracks=args.shared_tracks,
+        prune_tracks=args.prune_tracks,
+        matrices=args.matrices,
+        lod_factors=tuple(args.lod_factors or ()),
+        trim_textures=args.trim_textures,
+        reduce_png=args.reduce_png,
+        split_alpha=args.split_alpha,
+        texture_cache=args.texture_cache,
+        link_strategy=args.link,
+        prune_keep_sources=tuple(args.keep_refs or ReanimOutputOptions.prune_keep_sources),
+    )
+    convert_reanims(args.config, args.compiled, args.xml, args.dst, args.textures, options)
 
 
 if __name__ == "__main__":
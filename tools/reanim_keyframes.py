@@ -0,0 +1,135 @@
+"""Keyframe reduction for converted reanim tracks.
+
+Drops frames that linear interpolation between the surrounding kept frames
+reproduces within a tolerance. Reduced tracks are flagged ``keyframed`` and
+the last frame before a hidden stretch carries ``hideAfter``, because the
+runtime can no longer treat every frame-index gap as the track disappearing.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+
+KEYFRAME_MODES = ("off", "lossless", "lossy")
+KEYFRAME_CHANNELS = ("x", "y", "sx", "sy", "kx", "ky", "alpha")
+# Half a unit in the sixth decimal, the precision the converter stores values at.
+LOSSLESS_TOLERANCE = 5e-7
+DEFAULT_LOSSY_TOLERANCE = 0.01
+
+
+@dataclass
+class KeyframeStats:
+    frames_before: int = 0
+    frames_after: int = 0
+    max_error: float = 0.0
+
+    def add(self, other: KeyframeStats) -> None:
+        self.frames_before += other.frames_before
+        self.frames_after += other.frames_after
+        self.max_error = max(self.max_error, other.max_error)
+
+
+def get_tolerance(mode: str, lossy_tolerance: float) -> float:
+    if mode == "lossless":
+        return LOSSLESS_TOLERANCE
+    if mode == "lossy":
+        return lossy_tolerance
+    raise ValueError(f"Unknown keyframe mode: {mode}")
+
+
+def interpolation_error(left: dict[str, Any], right: dict[str, Any], frame: dict[str, Any]) -> float:
+    # Same lerp as AnimNode._lerpTrackFrame.
+    t = (frame["frameIndex"] - left["frameIndex"]) / (right["frameIndex"] - left["frameIndex"])
+    return max(
+        abs(left[key] + (right[key] - left[key]) * t - frame[key])
+        for key in KEYFRAME_CHANNELS
+    )
+
+
+def segment_error(run: list[dict[str, Any]], start: int, end: int, tolerance: float) -> float | None:
+    """Largest error from dropping run[start + 1:end], or None if one must stay."""
+    left = run[start]
+    right = run[end]
+    worst = 0.0
+    for frame in run[start + 1:end]:
+        if frame["image"] != left["image"]:
+            return None
+        error = interpolation_error(left, right, frame)
+        if error > tolerance:
+            return None
+        worst = max(worst, error)
+    return worst
+
+
+def reduce_run(
+    run: list[dict[str, Any]],
+    pinned: set[int],
+    tolerance: float,
+) -> tuple[list[dict[str, Any]], float]:
+    kept = [run[0]]
+    max_error = 0.0
+    anchor = 0
+    while anchor < len(run) - 1:
+        best = anchor + 1
+        best_error = 0.0
+        end = anchor + 1
+        while end < len(run):
+            error = segment_error(run, anchor, end, tolerance)
+            if error is None:
+                break
+            best, best_error = end, error
+            if run[end]["frameIndex"] in pinned:
+                break
+            end += 1
+        kept.append(run[best])
+        max_error = max(max_error, best_error)
+        anchor = best
+    return kept, max_error
+
+
+def split_runs(frames: list[dict[str, Any]]) -> list[list[dict[str, Any]]]:
+    runs: list[list[dict[str, Any]]] = []
+    for frame in frames:
+        if runs and frame["frameIndex"] == runs[-1][-1]["frameIndex"] + 1:
+            runs[-1].append(frame)
+        else:
+            runs.append([frame])
+    return runs
+
+
+def reduce_track_frames(
+    frames: list[dict[str, Any]],
+    pinned: set[int],
+    tolerance: float,
+) -> tuple[list[dict[str, Any]], float]:
+    reduced: list[dict[str, Any]] = []
+    max_error = 0.0
+    runs = split_runs(frames)
+    for index, run in enumerate(runs):
+        kept, error = reduce_run(run, pinned, tolerance)
+        max_error = max(max_error, error)
+        if index < len(runs) - 1:
+            # Frames are shared between nodes, so mark a copy.
+            kept[-1] = {**kept[-1], "hideAfter": True}
+        reduced.extend(kept)
+    return reduced, max_error
+
+
+def reduce_anim_nodes(anim_nodes: dict[str, Any], tolerance: float) -> KeyframeStats:
+    """Reduce every node's tracks in place, keeping each clip's first and last frame."""
+    stats = KeyframeStats()
+    for node in anim_nodes.values():
+        pinned: set[int] = set()
+        for anim in node["animations"].values():
+            pinned.add(anim["startFrame"])
+            pinned.add(anim["endFrame"])
+
+        for track in node["tracks"].values():
+            frames = track["frames"]
+            reduced, error = reduce_track_frames(frames, pinned, tolerance)
+            stats.add(KeyframeStats(len(frames), len(reduced), error))
+            track["frames"] = reduced
+            track["keyframed"] = True
+    return stats
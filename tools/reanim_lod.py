@@ -0,0 +1,94 @@
+"""Reduced frame-rate (LOD) variants of converted reanims.
+
+decimate_anim_nodes keeps every factor-th source frame of each clip, plus its
+last frame so one-shot clips still end on their final pose, and lays the
+clips out back to back on a new timeline, so the variant plays at about
+fps / factor over the same wall-clock time and the runtime keeps
+interpolating between the remaining poses. Because frame numbers change,
+a variant is written as its own file (<reanim>_lod<factor>) and suits
+sprites whose game code does not address frames directly.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Any
+
+
+LOD_SUFFIX = "_lod"
+
+
+def get_lod_name(anim_name: str, factor: int) -> str:
+    return f"{anim_name}{LOD_SUFFIX}{factor}"
+
+
+def get_sample_frames(start: int, end: int, factor: int) -> list[int]:
+    """Every factor-th frame from start, always ending on end so the final pose is kept."""
+    samples = list(range(start, end + 1, factor))
+    if samples and samples[-1] != end:
+        samples.append(end)
+    return samples
+
+
+def resample_frames(
+    frames: list[dict[str, Any]],
+    samples: list[int],
+    offset: int,
+) -> list[dict[str, Any]]:
+    """Frames present at the sampled source indices, renumbered from offset."""
+    frame_indices = [frame["frameIndex"] for frame in frames]
+    resampled = []
+    for new_index, source_index in enumerate(samples, start=offset):
+        pos = bisect_left(frame_indices, source_index)
+        if pos < len(frames) and frame_indices[pos] == source_index:
+            resampled.append({**frames[pos], "frameIndex": new_index})
+    return resampled
+
+
+def decimate_anim_nodes(anim_nodes: dict[str, Any], factor: int) -> dict[str, Any]:
+    if factor < 2:
+        raise ValueError(f"LOD factor must be at least 2, got {factor}")
+
+    variant: dict[str, Any] = {}
+    for node_name, node in anim_nodes.items():
+        animations: dict[str, Any] = {}
+        clip_samples: list[tuple[list[int], int]] = []
+        offset = 0
+        for clip_name, anim in node["animations"].items():
+            samples = get_sample_frames(anim["startFrame"], anim["endFrame"], factor)
+            clip = {
+                **anim,
+                "fps": anim["fps"] / factor,
+                "duration": len(samples),
+                "startFrame": offset,
+                "endFrame": offset + len(samples) - 1,
+            }
+            frame_bounds = anim.get("frameBounds")
+            if frame_bounds is not None:
+                clip["frameBounds"] = [frame_bounds[i - anim["startFrame"]] for i in samples]
+            animations[clip_name] = clip
+            clip_samples.append((samples, offset))
+            offset += len(samples)
+
+        def resample_part(frames: list[dict[str, Any]]) -> list[dict[str, Any]]:
+            resampled: list[dict[str, Any]] = []
+            for samples, clip_offset in clip_samples:
+                resampled.extend(resample_frames(frames, samples, clip_offset))
+            return resampled
+
+        slots = {
+            slot_name: {**slot, "frames": resample_part(slot["frames"])}
+            for slot_name, slot in node["slots"].items()
+        }
+        tracks = {}
+        for track_name, track in node["tracks"].items():
+            frames = resample_part(track["frames"])
+            if frames:
+                tracks[track_name] = {**track, "frames": frames}
+
+        variant[node_name] = {
+            "animations": animations,
+            "slots": slots,
+            "tracks": tracks,
+        }
+    return variant
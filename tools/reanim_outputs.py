@@ -0,0 +1,69 @@
+"""Read converted reanims back, whichever formats reanim_converter wrote.
+
+A reanim <name> in the animation output directory is one of:
+
+- <name>.json: nodes, or shared-track data (reanim_shared)
+- <name>.bin: the binary runtime format (reanim_binary)
+- <name>/index.json plus its clip chunks (reanim_chunks)
+
+When several exist they hold the same nodes; JSON is read first, then the
+binary, then the chunks.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+from reanim_binary import decode_anim_binary
+from reanim_chunks import join_anim_chunks
+from reanim_shared import resolve_shared_anim_tracks
+
+
+def load_anim_json(path: Path) -> dict[str, Any]:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if "sharedTracks" in data:
+        data = resolve_shared_anim_tracks(data)
+    return data
+
+
+def load_anim_chunks(chunk_dir: Path) -> dict[str, Any]:
+    index = json.loads((chunk_dir / "index.json").read_text(encoding="utf-8"))
+    chunk_names = {
+        anim["chunk"] for node in index["nodes"].values() for anim in node["animations"].values()
+    }
+    chunks = {
+        name: json.loads((chunk_dir / f"{name}.json").read_text(encoding="utf-8"))
+        for name in chunk_names
+    }
+    return join_anim_chunks(index, chunks)
+
+
+def find_converted_reanims(animation_dir: Path) -> dict[str, Path]:
+    """Path to read per reanim name: a .json or .bin file, or a chunk directory."""
+    found: dict[str, Path] = {}
+    for path in sorted(animation_dir.glob("*/index.json")):
+        found[path.parent.name] = path.parent
+    for path in sorted(animation_dir.glob("*.bin")):
+        found[path.stem] = path
+    for path in sorted(animation_dir.glob("*.json")):
+        found[path.stem] = path
+    return dict(sorted(found.items()))
+
+
+def find_converted_reanim(animation_dir: Path, name: str) -> Path | None:
+    """Path to read for one reanim, in the same order as find_converted_reanims."""
+    for path in (animation_dir / f"{name}.json", animation_dir / f"{name}.bin"):
+        if path.is_file():
+            return path
+    chunk_dir = animation_dir / name
+    return chunk_dir if (chunk_dir / "index.json").is_file() else None
+
+
+def load_converted_reanim(path: Path) -> dict[str, Any]:
+    if path.is_dir():
+        return load_anim_chunks(path)
+    if path.suffix == ".bin":
+        return decode_anim_binary(path.read_bytes())
+    return load_anim_json(path)
@@ -0,0 +1,83 @@
+"""Drop reanim tracks that can never draw or drive anything.
+
+A track is kept for a node when any of these hold:
+
+- it draws: some frame in the node's ranges has an image and alpha > 0
+- it is one of the node's slots, or an animation declared for any node
+- anim_defs.json lists it under the node's optional "keepTracks"
+- its name appears as a string literal in the scanned sources, since game
+  code looks tracks up by name (attachToTrack("locator"), getTrackFrame,
+  setTrackImageOverride on imageless tracks, cache generators)
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+
+SOURCE_SUFFIXES = (".ts", ".py")
+STRING_LITERAL = re.compile(r"""["'`]([A-Za-z0-9_]+)["'`]""")
+
+
+@dataclass
+class PrunedTrack:
+    node: str
+    track: str
+    reason: str
+
+
+@dataclass
+class PruneReport:
+    pruned: list[PrunedTrack] = field(default_factory=list)
+
+
+def collect_source_strings(source_dirs: Iterable[Path]) -> set[str]:
+    strings: set[str] = set()
+    for source_dir in source_dirs:
+        if not source_dir.is_dir():
+            continue
+        for path in sorted(source_dir.rglob("*")):
+            if path.suffix in SOURCE_SUFFIXES and path.is_file():
+                strings.update(STRING_LITERAL.findall(path.read_text(encoding="utf-8", errors="ignore")))
+    return strings
+
+
+def get_prune_reason(frames: list[dict[str, Any]]) -> str | None:
+    """Why a track never draws, or None if some frame does."""
+    has_image = False
+    for frame in frames:
+        if frame["image"]:
+            has_image = True
+            if frame["alpha"] > 0:
+                return None
+    return "alpha 0" if has_image else "no image"
+
+
+def prune_anim_nodes(
+    anim_nodes: dict[str, Any],
+    anim_info: dict[str, Any],
+    referenced: set[str],
+) -> PruneReport:
+    """Remove provably unused tracks from each node in place."""
+    markers = {
+        anim_name
+        for node_info in anim_info.values()
+        for anim_name in node_info.get("animations", [])
+    }
+    report = PruneReport()
+    for node_name, node in anim_nodes.items():
+        node_info = anim_info.get(node_name, {})
+        keep = markers | referenced | set(node_info.get("slots", [])) | set(node_info.get("keepTracks", []))
+        tracks = node["tracks"]
+        for track_name in list(tracks):
+            if track_name in keep:
+                continue
+            reason = get_prune_reason(tracks[track_name]["frames"])
+            if reason is not None:
+                del tracks[track_name]
+                report.pruned.append(PrunedTrack(node_name, track_name, reason))
+    return report
@@ -0,0 +1,133 @@
+"""Shared-track layout for converted reanim JSON.
+
+get_anim_nodes gives every node its own copy of each track it touches, so a
+reanim split into several nodes serializes the same frames several times.
+share_anim_tracks stores each track's frames once and has nodes point at
+them by index:
+
+    {
+      "sharedTracks": [{"name", "zIndex", "frames", "keyframed"?}, ...],
+      "nodes": {
+        node: {"animations", "slots",
+               "tracks": {name: {"track": index, "ranges": [[begin, end], ...]}}}
+      }
+    }
+
+A node's frames are the concatenation of frames[begin:end] over its ranges.
+Tracks whose frames disagree between nodes (e.g. keyframe-reduced with
+different pins) get separate shared entries.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+class _SharedTrack:
+    def __init__(self, name: str, track: dict[str, Any]) -> None:
+        self.name = name
+        self.z_index = track["zIndex"]
+        self.keyframed = bool(track.get("keyframed"))
+        self.frames: dict[int, dict[str, Any]] = {}
+
+    def accepts(self, track: dict[str, Any]) -> bool:
+        if track["zIndex"] != self.z_index or bool(track.get("keyframed")) != self.keyframed:
+            return False
+        for frame in track["frames"]:
+            existing = self.frames.get(frame["frameIndex"])
+            if existing is not None and existing is not frame and existing != frame:
+                return False
+        return True
+
+    def merge(self, track: dict[str, Any]) -> None:
+        for frame in track["frames"]:
+            self.frames.setdefault(frame["frameIndex"], frame)
+
+
+def frame_ranges(positions: list[int]) -> list[list[int]]:
+    ranges: list[list[int]] = []
+    for position in positions:
+        if ranges and ranges[-1][1] == position:
+            ranges[-1][1] += 1
+        else:
+            ranges.append([position, position + 1])
+    return ranges
+
+
+def share_anim_tracks(anim_nodes: dict[str, Any]) -> dict[str, Any]:
+    shared: list[_SharedTrack] = []
+    by_name: dict[str, list[int]] = {}
+    assignments: dict[str, dict[str, int]] = {}
+
+    for node_name, node in anim_nodes.items():
+        node_assignments = assignments[node_name] = {}
+        for track_name, track in node["tracks"].items():
+            candidates = by_name.setdefault(track_name, [])
+            index = next((i for i in candidates if shared[i].accepts(track)), None)
+            if index is None:
+                index = len(shared)
+                shared.append(_SharedTrack(track_name, track))
+                candidates.append(index)
+            shared[index].merge(track)
+            node_assignments[track_name] = index
+
+    shared_tracks: list[dict[str, Any]] = []
+    positions: list[dict[int, int]] = []
+    for entry in shared:
+        frame_indices = sorted(entry.frames)
+        data: dict[str, Any] = {
+            "name": entry.name,
+            "zIndex": entry.z_index,
+            "frames": [entry.frames[i] for i in frame_indices],
+        }
+        if entry.keyframed:
+            data["keyframed"] = True
+        shared_tracks.append(data)
+        positions.append({frame_index: pos for pos, frame_index in enumerate(frame_indices)})
+
+    nodes: dict[str, Any] = {}
+    for node_name, node in anim_nodes.items():
+        track_refs = {}
+        for track_name, index in assignments[node_name].items():
+            track_positions = positions[index]
+            track_refs[track_name] = {
+                "track": index,
+                "ranges": frame_ranges([
+                    track_positions[frame["frameIndex"]]
+                    for frame in node["tracks"][track_name]["frames"]
+                ]),
+            }
+        nodes[node_name] = {
+            "animations": node["animations"],
+            "slots": node["slots"],
+            "tracks": track_refs,
+        }
+
+    return {"sharedTracks": shared_tracks, "nodes": nodes}
+
+
+def resolve_shared_anim_tracks(data: dict[str, Any]) -> dict[str, Any]:
+    """Inverse of share_anim_tracks, for tools that read the per-node layout."""
+    shared_tracks = data["sharedTracks"]
+    anim_nodes: dict[str, Any] = {}
+    for node_name, node in data["nodes"].items():
+        tracks = {}
+        for track_name, ref in node["tracks"].items():
+            shared = shared_tracks[ref["track"]]
+            track: dict[str, Any] = {
+                "frames": [
+                    frame
+                    for begin, end in ref["ranges"]
+                    for frame in shared["frames"][begin:end]
+                ],
+                "zIndex": shared["zIndex"],
+            }
+            if shared.get("keyframed"):
+                track["keyframed"] = True
+            tracks[track_name] = track
+        anim_nodes[node_name] = {
+            "animations": node["animations"],
+            "slots": node["slots"],
+            "tracks": tracks,
+        }
+    return anim_nodes
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""Indexes of image resources: properties/resources.xml and the raw image files.
+
+load_resource_index parses the XML once per process and caches the result
+as JSON next to it (resources_index.json), keyed by the XML's sha256, so
+later runs only hash the file. Images are looked up by id (case-insensitive)
+or by the resource name of their path, i.e. the lowercased file name
+without image suffixes, as used for textures.
+
+ImageTreeIndex lists a tree of image files once and keeps, per directory,
+the preferred file for each resource name (see IMAGE_SUFFIX_PRIORITY).
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+from collections.abc import Iterable, Iterator
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from xml.etree import ElementTree
+
+
+IMAGE_SUFFIX_PRIORITY = {".png": 0, ".jpg": 1, ".jpeg": 1, ".gif": 2, ".webp": 3}
+INDEX_CACHE_NAME = "resources_index.json"
+# Bump when ImageResource or the parsing rules change.
+INDEX_VERSION = 1
+
+
+def get_image_resource_name(path: Path | str) -> str:
+    name = os.path.basename(path).lower()
+    # Same as stripping Path(name).suffix while it is an image suffix.
+    while True:
+        dot = name.rfind(".")
+        if dot <= 0 or name[dot:] not in IMAGE_SUFFIX_PRIORITY:
+            return name
+        name = name[:dot]
+
+
+def _image_preference(file_name: str) -> tuple[int, int, str]:
+    suffix = file_name[file_name.rfind("."):].lower()
+    return IMAGE_SUFFIX_PRIORITY[suffix], file_name.count("."), file_name
+
+
+def list_image_directory(directory: Path, subdirs: list[Path] | None = None) -> list[str]:
+    """Names of the image files in directory; subdirectories are appended to subdirs."""
+    names: list[str] = []
+    try:
+        entries = os.scandir(directory)
+    except (FileNotFoundError, NotADirectoryError):
+        return names
+    with entries:
+        for entry in entries:
+            if entry.is_dir():
+                if subdirs is not None:
+                    subdirs.append(directory / entry.name)
+                continue
+            dot = entry.name.rfind(".")
+            if dot >= 0 and entry.name[dot:].lower() in IMAGE_SUFFIX_PRIORITY and entry.is_file():
+                names.append(entry.name)
+    return names
+
+
+def select_preferred_images(directory: Path, file_names: Iterable[str]) -> dict[str, Path]:
+    best: dict[str, tuple[tuple[int, int, str], str]] = {}
+    for file_name in file_names:
+        name = get_image_resource_name(file_name)
+        preference = _image_preference(file_name)
+        current = best.get(name)
+        if current is None or preference < current[0]:
+            best[name] = (preference, file_name)
+    return {name: directory / file_name for name, (_preference, file_name) in best.items()}
+
+
+def scan_image_directory(directory: Path) -> dict[str, Path]:
+    """Preferred image file per resource name in directory."""
+    return select_preferred_images(directory, list_image_directory(directory))
+
+
+@dataclass(frozen=True)
+class ImageResource:
+    id: str
+    path: str
+    name: str
+    alphagrid: str | None = None
+    rows: int | None = None
+    cols: int | None = None
+
+
+class ResourceIndex:
+    def __init__(self, images: list[ImageResource]) -> None:
+        self.images = images
+        self._by_id: dict[str, ImageResource] = {}
+        self._by_name: dict[str, ImageResource] = {}
+        for image in images:
+            self._by_id[image.id.upper()] = image
+            self._by_name[image.name] = image
+
+    def __iter__(self) -> Iterator[ImageResource]:
+        return iter(self.images)
+
+    def __len__(self) -> int:
+        return len(self.images)
+
+    def by_id(self, resource_id: str) -> ImageResource | None:
+        return self._by_id.get(resource_id.upper())
+
+    def by_name(self, name: str) -> ImageResource | None:
+        return self._by_name.get(name.lower())
+
+
+def parse_resources_xml(data: bytes) -> list[ImageResource]:
+    root = ElementTree.fromstring(data.decode("utf-8", errors="ignore"))
+    images: list[ImageResource] = []
+    for node in root.iter("Image"):
+        resource_id = node.get("id")
+        if not resource_id:
+            continue
+        path = node.get("path") or ""
+        alphagrid = node.get("alphagrid")
+        rows = node.get("rows")
+        cols = node.get("cols")
+        images.append(
+            ImageResource(
+                id=resource_id,
+                path=path,
+                name=get_image_resource_name(Path(path)),
+                alphagrid=get_image_resource_name(Path(alphagrid)) if alphagrid else None,
+                rows=int(rows) if rows else None,
+                cols=int(cols) if cols else None,
+            )
+        )
+    return images
+
+
+class ImageTreeIndex:
+    """Image files of every directory under root, listed once.
+
+    Directories outside root are listed on first use. The index is a
+    snapshot: build it after the steps that write into the tree.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self._files: dict[Path, set[str]] = {}
+        self._resources: dict[Path, dict[str, Path]] = {}
+        pending = [root]
+        while pending:
+            directory = pending.pop()
+            self._files[directory] = set(list_image_directory(directory, pending))
+
+    def files(self, directory: Path) -> set[str]:
+        files = self._files.get(directory)
+        if files is None:
+            files = self._files[directory] = set(list_image_directory(directory))
+        return files
+
+    def has_file(self, directory: Path, file_name: str) -> bool:
+        return file_name in self.files(directory)
+
+    def resources(self, directory: Path) -> dict[str, Path]:
+        """Preferred image file per resource name in directory."""
+        resources = self._resources.get(directory)
+        if resources is None:
+            resources = select_preferred_images(directory, self.files(directory))
+            self._resources[directory] = resources
+        return resources
+
+    def get(self, directory: Path, name: str) -> Path | None:
+        return self.resources(directory).get(name)
+
+    def __len__(self) -> int:
+        return sum(len(files) for files in self._files.values())
+
+
+def get_index_cache_path(resources_xml: Path) -> Path:
+    return resources_xml.with_name(INDEX_CACHE_NAME)
+
+
+_loaded: dict[Path, tuple[str, ResourceIndex]] = {}
+
+
+def load_resource_index(resources_xml: Path, cache_path: Path | None = None) -> ResourceIndex:
+    """Index of resources_xml; empty when the file does not exist."""
+    if not resources_xml.exists():
+        return ResourceIndex([])
+
+    data = resources_xml.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    key = resources_xml.resolve()
+    loaded = _loaded.get(key)
+    if loaded is not None and loaded[0] == digest:
+        return loaded[1]
+
+    if cache_path is None:
+        cache_path = get_index_cache_path(resources_xml)
+    images: list[ImageResource] | None = None
+    try:
+        cached = json.loads(cache_path.read_text(encoding="utf-8"))
+        if cached.get("version") == INDEX_VERSION and cached.get("sha256") == digest:
+            images = [ImageResource(**entry) for entry in cached["images"]]
+    except (OSError, ValueError, TypeError, KeyError):
+        pass
+
+    if images is None:
+        images = parse_resources_xml(data)
+        # The cache is optional: a read-only raw tree just parses the XML every run.
+        try:
+            cache_path.write_text(
+                json.dumps(
+                    {
+                        "version": INDEX_VERSION,
+                        "sha256": digest,
+                        "images": [asdict(image) for image in images],
+                    },
+                    separators=(",", ":"),
+                ),
+                encoding="utf-8",
+            )
+        except OSError:
+            pass
+
+    index = ResourceIndex(images)
+    _loaded[key] = (digest, index)
+    return index
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--resources", type=Path, default=Path("./tools/raw/properties/resources.xml")
+    )
+    parser.add_argument("query", nargs="*", help="Image ids or resource names to look up.")
+    args = parser.parse_args()
+
+    index = load_resource_index(args.resources)
+    print(f"[resources] {len(index)} images in {args.resources}")
+    for query in args.query:
+        image = index.by_id(query) or index.by_name(query)
+        print(f"[resources]   {query}: {asdict(image) if image is not None else 'not found'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,41 +1,40 @@
 from __future__ import annotations
 
+import hashlib
 import io
-import shutil
+import json
+import sys
+from array import array
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from xml.etree import ElementTree
+from typing import Any
 
-from PIL import Image
+from PIL import Image, ImageChops
 
+from file_links import DEFAULT_LINK_STRATEGY, is_linked, link_file
+from resource_index import (
+    IMAGE_SUFFIX_PRIORITY,
+    ImageTreeIndex,
+    get_image_resource_name,
+    load_resource_index,
+    scan_image_directory,
+)
 
-IMAGE_SUFFIX_PRIORITY = {".png": 0, ".jpg": 1, ".jpeg": 1, ".gif": 2}
+
+JPEG_SUFFIXES = {".jpg", ".jpeg"}
 TRANSPARENT_COLORS: dict[str, tuple[int, int, int]] = {}
+# Written next to the textures directory, i.e. assets/resources/texture_trim.json.
+TRIM_MANIFEST_NAME = "texture_trim.json"
+ALPHA_MASK_MANIFEST_NAME = "texture_alpha_masks.json"
+ALPHA_MASK_SUFFIX = "__alpha"
 
 
-def get_image_resource_name(path: Path) -> str:
-    name = path.name.lower()
-    while Path(name).suffix.lower() in IMAGE_SUFFIX_PRIORITY:
-        name = Path(name).with_suffix("").name
-    return name
-
-
-def select_image_resources(src_dir: Path) -> dict[str, Path]:
-    image_files = [
-        p
-        for p in src_dir.iterdir()
-        if p.is_file() and p.suffix.lower() in IMAGE_SUFFIX_PRIORITY
-    ]
-    images_by_resource: dict[str, list[Path]] = {}
-    for image_file in image_files:
-        images_by_resource.setdefault(get_image_resource_name(image_file), []).append(image_file)
-
-    resources: dict[str, Path] = {}
-    for name, candidates in images_by_resource.items():
-        resources[name] = min(
-            candidates,
-            key=lambda path: (IMAGE_SUFFIX_PRIORITY[path.suffix.lower()], path.name.count(".")),
-        )
-    return resources
+def select_image_resources(src_dir: Path, images: ImageTreeIndex | None = None) -> dict[str, Path]:
+    """Preferred image file per resource name in src_dir, from images when given."""
+    if images is not None:
+        return dict(images.resources(src_dir))
+    return scan_image_directory(src_dir)
 
 
 def is_alpha_companion_name(resource_name: str) -> bool:
@@ -47,21 +46,11 @@ def get_alpha_companion_name(resource_name: str) -> str:
 
 
 def load_alphagrid_resources(resources_xml: Path) -> dict[str, tuple[str, str]]:
-    if not resources_xml.exists():
-        return {}
-
-    root = ElementTree.parse(resources_xml).getroot()
-    result: dict[str, tuple[str, str]] = {}
-    for image in root.iter("Image"):
-        path = image.get("path")
-        alphagrid = image.get("alphagrid")
-        resource_id = image.get("id")
-        if path and alphagrid and resource_id:
-            result[get_image_resource_name(Path(path))] = (
-                get_image_resource_name(Path(alphagrid)),
-                resource_id.lower(),
-            )
-    return result
+    return {
+        image.name: (image.alphagrid, image.id.lower())
+        for image in load_resource_index(resources_xml)
+        if image.path and image.alphagrid
+    }
 
 
 def get_output_name(src: Path, resource_name: str, force_png: bool) -> str:
@@ -70,6 +59,209 @@ def get_output_name(src: Path, resource_name: str, force_png: bool) -> str:
     return src.name.lower()
 
 
+def get_trim_box(image: Image.Image) -> tuple[int, int, int, int] | None:
+    """Alpha bounding box, or None when there is no transparent margin to remove."""
+    box = image.getchannel("A").getbbox()
+    if box is None or box == (0, 0, *image.size):
+        return None
+    return box
+
+
+def get_trim_manifest_path(texture_dir: Path) -> Path:
+    return texture_dir.parent / TRIM_MANIFEST_NAME
+
+
+def get_alpha_mask_manifest_path(texture_dir: Path) -> Path:
+    return texture_dir.parent / ALPHA_MASK_MANIFEST_NAME
+
+
+def load_texture_manifest(path: Path) -> dict[str, Any]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def save_texture_manifest(path: Path, manifest: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = json.dumps(dict(sorted(manifest.items())), separators=(",", ":"))
+    path.write_text(data, encoding="utf-8")
+
+
+def untrim_image(image: Image.Image, entry: dict[str, Any] | None) -> Image.Image:
+    """Pad a trimmed texture back to its original size and placement."""
+    # A stale entry for a texture written untrimmed since is ignored.
+    if entry is None or list(image.size) != entry["rect"][2:]:
+        return image
+    canvas = Image.new("RGBA", tuple(entry["size"]), (0, 0, 0, 0))
+    canvas.paste(image.convert("RGBA"), tuple(entry["rect"][:2]))
+    return canvas
+
+
+@dataclass
+class PngReduction:
+    name: str
+    mode: str
+    before: int
+    after: int
+
+
+def get_palette_image(image: Image.Image) -> Image.Image | None:
+    """Lossless indexed copy of an RGBA image, or None above 256 distinct colours."""
+    colors = image.getcolors(256)
+    if colors is None:
+        return None
+    lookup: dict[int, int] = {}
+    palette: list[int] = []
+    alphas = bytearray()
+    for index, (_count, color) in enumerate(colors):
+        lookup[int.from_bytes(bytes(color), sys.byteorder)] = index
+        palette.extend(color[:3])
+        alphas.append(color[3])
+    # One uint32 per RGBA pixel, so the mapping runs through C-level map/bytes.
+    pixels = array("I")
+    pixels.frombytes(image.tobytes())
+    result = Image.frombytes("P", image.size, bytes(map(lookup.__getitem__, pixels)))
+    result.putpalette(palette)
+    if min(alphas) < 255:
+        result.info["transparency"] = bytes(alphas)
+    return result
+
+
+def get_grayscale_image(image: Image.Image) -> Image.Image | None:
+    """L/LA copy of an RGBA image whose pixels all have r == g == b, else None."""
+    red, green, blue, alpha = image.split()
+    if ImageChops.difference(red, green).getbbox() or ImageChops.difference(green, blue).getbbox():
+        return None
+    if alpha.getextrema() == (255, 255):
+        return red
+    return Image.merge("LA", (red, alpha))
+
+
+def reduce_png(image: Image.Image) -> tuple[str, bytes] | None:
+    """Smallest lossless palette or grayscale PNG encoding of an RGBA image."""
+    best: tuple[str, bytes] | None = None
+    for candidate in (get_palette_image(image), get_grayscale_image(image)):
+        if candidate is None:
+            continue
+        output = io.BytesIO()
+        candidate.save(output, "PNG", optimize=True)
+        if best is None or output.tell() < len(best[1]):
+            best = (candidate.mode, output.getvalue())
+    return best
+
+
+# Bump when the output of write_preprocessed_resource changes for the same inputs.
+OUTPUT_CACHE_VERSION = 1
+
+
+class OutputCache:
+    """Per-output build record: input hash plus the size, mtime and hash of each file written.
+
+    Source hashes are memoized by (size, mtime_ns), so unchanged sources are not
+    re-read either; a re-extracted source is re-hashed but, if its bytes are the
+    same, still skips decoding and encoding.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        data = load_texture_manifest(path)
+        if data.get("version") != OUTPUT_CACHE_VERSION:
+            data = {}
+        self.sources: dict[str, list[Any]] = data.get("sources", {})
+        self.outputs: dict[str, dict[str, Any]] = data.get("outputs", {})
+
+    def hash_file(self, path: Path, known: list[Any] | None = None) -> str:
+        stat = path.stat()
+        if known is None:
+            known = self.sources.get(str(path))
+        if known is not None and known[:2] == [stat.st_size, stat.st_mtime_ns]:
+            return known[2]
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        self.sources[str(path)] = [stat.st_size, stat.st_mtime_ns, digest]
+        return digest
+
+    def hash_inputs(self, sources: Iterable[Path | None], options: dict[str, Any]) -> str:
+        digest = hashlib.sha256(json.dumps(options, sort_keys=True).encode())
+        for src in sources:
+            digest.update(b"\0" + (self.hash_file(src).encode() if src else b"-"))
+        return digest.hexdigest()
+
+    def lookup(self, dst: Path, inputs: str) -> dict[str, Any] | None:
+        entry = self.outputs.get(str(dst))
+        if entry is None or entry["inputs"] != inputs:
+            return None
+        for path, (size, mtime_ns, _digest) in entry["files"].items():
+            try:
+                stat = Path(path).stat()
+            except FileNotFoundError:
+                return None
+            if stat.st_size != size or stat.st_mtime_ns != mtime_ns:
+                return None
+        return entry
+
+    def record(
+        self,
+        dst: Path,
+        inputs: str,
+        files: Iterable[Path],
+        *,
+        trim: dict[str, Any] | None,
+        alpha_mask: str | None,
+        reduction: PngReduction | None,
+    ) -> None:
+        previous = self.outputs.get(str(dst), {}).get("files", {})
+        recorded = {}
+        for path in files:
+            stat = path.stat()
+            digest = self.hash_file(path, previous.get(str(path)))
+            self.sources.pop(str(path), None)
+            recorded[str(path)] = [stat.st_size, stat.st_mtime_ns, digest]
+        entry: dict[str, Any] = {"inputs": inputs, "files": recorded}
+        if trim is not None:
+            entry["trim"] = trim
+        if alpha_mask is not None:
+            entry["alphaMask"] = alpha_mask
+        if reduction is not None:
+            entry["reduction"] = asdict(reduction)
+        self.outputs[str(dst)] = entry
+
+    def save(self) -> None:
+        save_texture_manifest(
+            self.path,
+            {"version": OUTPUT_CACHE_VERSION, "sources": self.sources, "outputs": self.outputs},
+        )
+
+
+def open_alpha_masked_image(colour: Path, mask: Path) -> Image.Image:
+    """Recombine a JPEG colour plane and its PNG alpha mask into RGBA."""
+    with Image.open(colour) as image:
+        result = image.convert("RGBA")
+    with Image.open(mask) as image:
+        result.putalpha(image.convert("L"))
+    return result
+
+
+def _write_alpha_masked_resource(
+    src: Path,
+    alpha_src: Path,
+    colour_dst: Path,
+    mask_dst: Path,
+    link: str,
+) -> bool | None:
+    with Image.open(src) as image:
+        size = image.size
+    with Image.open(alpha_src) as image:
+        alpha = fit_alpha(image.convert("L"), size)
+    if alpha is None:
+        print(f"[textures] Skipped alpha with mismatched size: {src} vs {alpha_src}")
+        return None
+
+    output = io.BytesIO()
+    alpha.save(output, "PNG", optimize=True)
+    changed = _link_if_changed(src, colour_dst, link)
+    return _write_if_changed(mask_dst, output.getvalue()) or changed
+
+
 def write_preprocessed_resource(
     src: Path,
     dst: Path,
@@ -77,12 +269,161 @@ def write_preprocessed_resource(
     resource_name: str | None = None,
     alpha_src: Path | None = None,
     alpha_grid_src: Path | None = None,
+    trim_manifest: dict[str, Any] | None = None,
+    reductions: list[PngReduction] | None = None,
+    alpha_masks: dict[str, str] | None = None,
+    cache: OutputCache | None = None,
+    link: str = DEFAULT_LINK_STRATEGY,
 ) -> bool:
+    """Write src (plus alpha) to dst; returns whether dst changed.
+
+    With trim_manifest, PNG outputs are cropped to their alpha bounding box and
+    trim_manifest[<dst stem>] records {"size": [w, h], "rect": [x, y, w, h]}
+    of the kept area within the original image (the entry is dropped when
+    nothing could be trimmed).
+
+    With reductions, PNG outputs are re-encoded as indexed or grayscale PNGs
+    when that is lossless and smaller; each such image is appended to it.
+
+    With alpha_masks, a JPEG with an alpha image keeps its original JPEG bytes
+    (dst with a .jpg suffix) plus an 8-bit <dst stem>__alpha.png mask, and
+    alpha_masks[<dst stem>] names the mask for the runtime to combine them.
+
+    With cache, a dst whose inputs and options hash as last time and whose
+    outputs still have their recorded size and mtime is skipped without
+    reading or encoding anything; its manifest entries are replayed.
+
+    Files that need no preprocessing are placed with file_links.link_file
+    using the link strategy.
+    """
     name = resource_name if resource_name is not None else get_image_resource_name(src)
-    transparent_color = TRANSPARENT_COLORS.get(name)
     alpha_src = alpha_src or alpha_grid_src
+    options = {
+        "transparentColor": TRANSPARENT_COLORS.get(name),
+        "trim": trim_manifest is not None,
+        "reduce": reductions is not None,
+        "alphaMask": alpha_masks is not None,
+        # A cached copy is not a link: switching strategy must re-place the file.
+        "link": link,
+    }
+    if cache is not None:
+        inputs = cache.hash_inputs((src, alpha_src), options)
+        entry = cache.lookup(dst, inputs)
+        if entry is not None:
+            _replay_side_outputs(dst, entry, trim_manifest, reductions, alpha_masks)
+            return False
+        reduction_count = len(reductions) if reductions is not None else 0
+
+    changed = _write_preprocessed_resource(
+        src,
+        dst,
+        name=name,
+        alpha_src=alpha_src,
+        trim_manifest=trim_manifest,
+        reductions=reductions,
+        alpha_masks=alpha_masks,
+        link=link,
+    )
+
+    if cache is not None:
+        cache.record(
+            dst,
+            inputs,
+            [path for path in _get_output_candidates(dst) if path.exists()],
+            trim=trim_manifest.get(dst.stem) if trim_manifest is not None else None,
+            alpha_mask=alpha_masks.get(dst.stem) if alpha_masks is not None else None,
+            reduction=(
+                reductions[-1]
+                if reductions is not None and len(reductions) > reduction_count
+                else None
+            ),
+        )
+    return changed
+
+
+def _get_output_candidates(dst: Path) -> list[Path]:
+    """Every file write_preprocessed_resource may leave for dst."""
+    return [dst, dst.with_suffix(".jpg"), dst.with_name(f"{dst.stem}{ALPHA_MASK_SUFFIX}.png")]
+
+
+def _replay_side_outputs(
+    dst: Path,
+    entry: dict[str, Any],
+    trim_manifest: dict[str, Any] | None,
+    reductions: list[PngReduction] | None,
+    alpha_masks: dict[str, str] | None,
+) -> None:
+    side_outputs = ((trim_manifest, entry.get("trim")), (alpha_masks, entry.get("alphaMask")))
+    for manifest, value in side_outputs:
+        if manifest is None:
+            continue
+        if value is None:
+            manifest.pop(dst.stem, None)
+        else:
+            manifest[dst.stem] = value
+    if reductions is not None and entry.get("reduction"):
+        reductions.append(PngReduction(**entry["reduction"]))
+
 
-    if alpha_src or transparent_color or src.suffix.lower() == ".gif":
+def _write_preprocessed_resource(
+    src: Path,
+    dst: Path,
+    *,
+    name: str,
+    alpha_src: Path | None,
+    trim_manifest: dict[str, Any] | None,
+    reductions: list[PngReduction] | None,
+    alpha_masks: dict[str, str] | None,
+    link: str,
+) -> bool:
+    transparent_color = TRANSPARENT_COLORS.get(name)
+    is_png = dst.suffix.lower() == ".png"
+    preprocess = bool(alpha_src or transparent_color or src.suffix.lower() == ".gif")
+
+    if alpha_src and not transparent_color and src.suffix.lower() in JPEG_SUFFIXES:
+        colour_dst = dst.with_suffix(".jpg")
+        mask_dst = dst.with_name(f"{dst.stem}{ALPHA_MASK_SUFFIX}.png")
+        if alpha_masks is not None:
+            written = _write_alpha_masked_resource(src, alpha_src, colour_dst, mask_dst, link)
+            if written is not None:
+                if dst != colour_dst:
+                    dst.unlink(missing_ok=True)
+                alpha_masks[dst.stem] = mask_dst.stem
+                return written
+            alpha_masks.pop(dst.stem, None)
+        # Only one layout may exist per texture name, so drop split leftovers.
+        if dst != colour_dst:
+            colour_dst.unlink(missing_ok=True)
+        mask_dst.unlink(missing_ok=True)
+
+    image: Image.Image | None = None
+    if trim_manifest is not None and is_png:
+        image = _preprocess_image(src, alpha_src=alpha_src, transparent_color=transparent_color)
+        box = get_trim_box(image)
+        if box is not None:
+            left, top, right, bottom = box
+            trim_manifest[dst.stem] = {
+                "size": list(image.size),
+                "rect": [left, top, right - left, bottom - top],
+            }
+            image = image.crop(box)
+            preprocess = True
+        else:
+            trim_manifest.pop(dst.stem, None)
+
+    if reductions is not None and is_png:
+        if image is None:
+            image = _preprocess_image(src, alpha_src=alpha_src, transparent_color=transparent_color)
+        data = _encode_png(image) if preprocess else src.read_bytes()
+        reduced = reduce_png(image)
+        if reduced is not None and len(reduced[1]) < len(data):
+            reductions.append(PngReduction(dst.stem, reduced[0], len(data), len(reduced[1])))
+            data = reduced[1]
+        return _write_if_changed(dst, data)
+
+    if preprocess:
+        if image is not None:
+            return _write_if_changed(dst, _encode_png(image))
         data = _preprocess_to_png_bytes(
             src,
             alpha_src=alpha_src,
@@ -90,12 +431,15 @@ def write_preprocessed_resource(
         )
         return _write_if_changed(dst, data)
 
-    if dst.exists() and dst.read_bytes() == src.read_bytes():
-        return False
+    return _link_if_changed(src, dst, link)
 
-    dst.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copy2(src, dst)
-    return True
+
+def print_png_reductions(reductions: list[PngReduction], prefix: str) -> None:
+    for item in reductions:
+        print(f"{prefix}   {item.name}: {item.before} -> {item.after} bytes ({item.mode})")
+    before = sum(item.before for item in reductions)
+    after = sum(item.after for item in reductions)
+    print(f"{prefix} Reduced {len(reductions)} PNGs losslessly: {before} -> {after} bytes")
 
 
 def _preprocess_to_png_bytes(
@@ -104,31 +448,76 @@ def _preprocess_to_png_bytes(
     alpha_src: Path | None,
     transparent_color: tuple[int, int, int] | None,
 ) -> bytes:
+    image = _preprocess_image(src, alpha_src=alpha_src, transparent_color=transparent_color)
+    return _encode_png(image)
+
+
+def _encode_png(image: Image.Image) -> bytes:
+    output = io.BytesIO()
+    image.save(output, "PNG")
+    return output.getvalue()
+
+
+def fit_alpha(alpha: Image.Image, size: tuple[int, int]) -> Image.Image | None:
+    """The alpha plane at the colour image's size, or None if it cannot be fitted.
+
+    An alphagrid image is one cell of a sprite grid and is tiled across every
+    cell, so any alpha whose size divides the colour size evenly is repeated.
+    """
+    if alpha.size == size:
+        return alpha
+    cell_width, cell_height = alpha.size
+    width, height = size
+    if width % cell_width or height % cell_height:
+        return None
+    tiled = Image.new("L", size)
+    for top in range(0, height, cell_height):
+        for left in range(0, width, cell_width):
+            tiled.paste(alpha, (left, top))
+    return tiled
+
+
+def apply_color_key(image: Image.Image, transparent_color: tuple[int, int, int]) -> None:
+    """Clear alpha where RGB equals the key colour and make other alpha-0 pixels opaque."""
+    red, green, blue, alpha = image.split()
+    key = None
+    for channel, value in zip((red, green, blue), transparent_color):
+        match = channel.point(lambda v, value=value: 255 if v == value else 0)
+        key = match if key is None else ImageChops.multiply(key, match)
+    alpha = alpha.point(lambda v: 255 if v == 0 else v)
+    alpha.paste(0, mask=key)
+    image.putalpha(alpha)
+
+
+def _preprocess_image(
+    src: Path,
+    *,
+    alpha_src: Path | None,
+    transparent_color: tuple[int, int, int] | None,
+) -> Image.Image:
     with Image.open(src) as image:
         result = image.convert("RGBA")
 
     if alpha_src:
         with Image.open(alpha_src) as image:
-            alpha = image.convert("L")
-        if alpha.size == result.size:
+            alpha = fit_alpha(image.convert("L"), result.size)
+        if alpha is not None:
             result.putalpha(alpha)
         else:
             print(f"[textures] Skipped alpha with mismatched size: {src} vs {alpha_src}")
 
     if transparent_color:
-        pixels = result.load()
-        width, height = result.size
-        for y in range(height):
-            for x in range(width):
-                r, g, b, a = pixels[x, y]
-                if (r, g, b) == transparent_color:
-                    pixels[x, y] = (r, g, b, 0)
-                elif a == 0:
-                    pixels[x, y] = (r, g, b, 255)
+        apply_color_key(result, transparent_color)
 
-    output = io.BytesIO()
-    result.save(output, "PNG")
-    return output.getvalue()
+    return result
+
+
+def _link_if_changed(src: Path, dst: Path, link: str) -> bool:
+    if is_linked(src, dst) or (dst.exists() and dst.read_bytes() == src.read_bytes()):
+        return False
+
+    link_file(src, dst, link)
+    return True
 
 
 def _write_if_changed(dst: Path, data: bytes) -> bool:
@@ -136,5 +525,7 @@ def _write_if_changed(dst: Path, data: bytes) -> bool:
         return False
 
     dst.parent.mkdir(parents=True, exist_ok=True)
+    # dst may be a hardlink of its source from an earlier passthrough run.
+    dst.unlink(missing_ok=True)
     dst.write_bytes(data)
     return True
@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""Pack sprite textures into power-of-two atlases plus a frame manifest.
+
+Textures are grouped by who uses them (one group per reanim, "shared" for
+textures several reanims use, "particles", and "ui" for the rest) and by
+SpriteResourceManifest sampling, so every atlas page is filtered one way.
+Pages are packed with MaxRects (best short side fit). Every sprite is
+surrounded by `extrude` copies of its edge pixels so linear filtering never
+bleeds a neighbour in.
+
+The manifest (atlases/atlas_manifest.json) maps sprite names to
+{"atlas", "rect": [x, y, w, h], "sampling"}; SpriteLoader resolves names
+against it before falling back to textures/<name>.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import shutil
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from PIL import Image
+
+from sprite_texture_preprocessor import (
+    get_alpha_mask_manifest_path,
+    load_texture_manifest,
+    open_alpha_masked_image,
+)
+from texture_audit import list_textures, load_manifest_prefixes
+from texture_usage_index import build_usage_index
+from webp_export import (
+    WEBP_VARIANT_SUFFIX,
+    get_webp_variant_path,
+    is_webp_variant,
+    remove_stale_webp,
+)
+
+
+DEFAULT_MAX_SIZE = 2048
+DEFAULT_MAX_SPRITE_SIZE = 512
+DEFAULT_EXTRUDE = 1
+MANIFEST_NAME = "atlas_manifest.json"
+
+
+@dataclass
+class Rect:
+    x: int
+    y: int
+    width: int
+    height: int
+
+    def contains(self, other: Rect) -> bool:
+        return (
+            other.x >= self.x
+            and other.y >= self.y
+            and other.x + other.width <= self.x + self.width
+            and other.y + other.height <= self.y + self.height
+        )
+
+    def intersects(self, other: Rect) -> bool:
+        return not (
+            other.x >= self.x + self.width
+            or other.x + other.width <= self.x
+            or other.y >= self.y + self.height
+            or other.y + other.height <= self.y
+        )
+
+
+class MaxRectsBin:
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.free = [Rect(0, 0, width, height)]
+
+    def insert(self, width: int, height: int) -> Rect | None:
+        best: Rect | None = None
+        best_short = best_long = None
+        for free in self.free:
+            if width > free.width or height > free.height:
+                continue
+            leftover_x = free.width - width
+            leftover_y = free.height - height
+            short_side = min(leftover_x, leftover_y)
+            long_side = max(leftover_x, leftover_y)
+            if best is None or (short_side, long_side) < (best_short, best_long):
+                best = Rect(free.x, free.y, width, height)
+                best_short, best_long = short_side, long_side
+        if best is not None:
+            self._place(best)
+        return best
+
+    def _place(self, used: Rect) -> None:
+        next_free: list[Rect] = []
+        for free in self.free:
+            if not free.intersects(used):
+                next_free.append(free)
+                continue
+            if used.x > free.x:
+                next_free.append(Rect(free.x, free.y, used.x - free.x, free.height))
+            if used.x + used.width < free.x + free.width:
+                right = used.x + used.width
+                next_free.append(Rect(right, free.y, free.x + free.width - right, free.height))
+            if used.y > free.y:
+                next_free.append(Rect(free.x, free.y, free.width, used.y - free.y))
+            if used.y + used.height < free.y + free.height:
+                bottom = used.y + used.height
+                next_free.append(Rect(free.x, bottom, free.width, free.y + free.height - bottom))
+        self.free = [
+            rect
+            for i, rect in enumerate(next_free)
+            if not any(
+                j != i and other.contains(rect) and (other != rect or j < i)
+                for j, other in enumerate(next_free)
+            )
+        ]
+
+
+def power_of_two_sizes(max_size: int) -> list[tuple[int, int]]:
+    """Candidate page sizes, smallest area first, never more than 2:1."""
+    sizes = []
+    width = 1
+    while width <= max_size:
+        for height in (width // 2, width):
+            if height >= 1:
+                sizes.append((width, height))
+        width *= 2
+    return sorted(sizes, key=lambda size: (size[0] * size[1], size[0]))
+
+
+@dataclass
+class Sprite:
+    name: str
+    image: Image.Image
+
+
+@dataclass
+class AtlasPage:
+    width: int
+    height: int
+    placements: list[tuple[Sprite, Rect]]
+
+
+def try_pack(
+    sprites: list[Sprite], width: int, height: int, padding: int
+) -> list[tuple[Sprite, Rect]] | None:
+    packer = MaxRectsBin(width, height)
+    placements = []
+    for sprite in sprites:
+        rect = packer.insert(sprite.image.width + 2 * padding, sprite.image.height + 2 * padding)
+        if rect is None:
+            return None
+        placements.append((sprite, rect))
+    return placements
+
+
+def pack_pages(sprites: list[Sprite], max_size: int, padding: int) -> list[AtlasPage]:
+    remaining = sorted(
+        sprites,
+        key=lambda sprite: (max(sprite.image.size), sprite.image.width * sprite.image.height),
+        reverse=True,
+    )
+    pages: list[AtlasPage] = []
+    while remaining:
+        area = sum(
+            (sprite.image.width + 2 * padding) * (sprite.image.height + 2 * padding)
+            for sprite in remaining
+        )
+        for width, height in power_of_two_sizes(max_size):
+            if width * height < area:
+                continue
+            placements = try_pack(remaining, width, height, padding)
+            if placements is not None:
+                pages.append(AtlasPage(width, height, placements))
+                remaining = []
+                break
+        else:
+            # Too much for one page: fill a full-size page greedily and carry the rest over.
+            packer = MaxRectsBin(max_size, max_size)
+            placements = []
+            leftover = []
+            for sprite in remaining:
+                rect = packer.insert(
+                    sprite.image.width + 2 * padding, sprite.image.height + 2 * padding
+                )
+                if rect is None:
+                    leftover.append(sprite)
+                else:
+                    placements.append((sprite, rect))
+            pages.append(AtlasPage(max_size, max_size, placements))
+            remaining = leftover
+    return pages
+
+
+def extrude_into(page: Image.Image, image: Image.Image, x: int, y: int, extrude: int) -> None:
+    """Paste image at (x, y) and repeat its edge pixels `extrude` times outward."""
+    page.paste(image, (x, y))
+    if extrude <= 0:
+        return
+    width, height = image.size
+    left = image.crop((0, 0, 1, height))
+    right = image.crop((width - 1, 0, width, height))
+    for i in range(1, extrude + 1):
+        page.paste(left, (x - i, y))
+        page.paste(right, (x + width - 1 + i, y))
+    top = page.crop((x - extrude, y, x + width + extrude, y + 1))
+    bottom = page.crop((x - extrude, y + height - 1, x + width + extrude, y + height))
+    for i in range(1, extrude + 1):
+        page.paste(top, (x - extrude, y - i))
+        page.paste(bottom, (x - extrude, y + height - 1 + i))
+
+
+def get_sampling(name: str, linear_prefixes: Iterable[str]) -> str:
+    return "linear" if any(name.startswith(prefix) for prefix in linear_prefixes) else "nearest"
+
+
+def get_usage_groups(usage: dict[str, Any]) -> dict[str, str]:
+    users: dict[str, set[str]] = {}
+    for reanim_name, entry in usage["reanims"].items():
+        for texture in entry["textures"]:
+            users.setdefault(texture, set()).add(reanim_name)
+    groups = {
+        texture: next(iter(names)) if len(names) == 1 else "shared"
+        for texture, names in users.items()
+    }
+    for entry in usage["particles"].values():
+        for texture in entry["textures"]:
+            groups.setdefault(texture, "particles")
+    return groups
+
+
+def pack_atlases(
+    texture_dir: Path,
+    output_dir: Path,
+    usage: dict[str, Any],
+    linear_prefixes: set[str],
+    max_size: int = DEFAULT_MAX_SIZE,
+    max_sprite_size: int = DEFAULT_MAX_SPRITE_SIZE,
+    extrude: int = DEFAULT_EXTRUDE,
+) -> dict[str, Any]:
+    usage_groups = get_usage_groups(usage)
+    limit = min(max_sprite_size, max_size - 2 * extrude)
+
+    alpha_masks = load_texture_manifest(get_alpha_mask_manifest_path(texture_dir))
+    mask_names = set(alpha_masks.values())
+    textures = list_textures(texture_dir)
+
+    grouped: dict[tuple[str, str], list[Sprite]] = {}
+    skipped = 0
+    for name, path in textures.items():
+        if name in mask_names:
+            continue
+        mask = textures.get(alpha_masks.get(name, ""))
+        if mask is not None and path.suffix.lower() != ".png":
+            image = open_alpha_masked_image(path, mask)
+        else:
+            with Image.open(path) as source:
+                image = source.convert("RGBA")
+        if image.width > limit or image.height > limit:
+            skipped += 1
+            continue
+        key = (usage_groups.get(name, "ui"), get_sampling(name, linear_prefixes))
+        grouped.setdefault(key, []).append(Sprite(name, image))
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest: dict[str, Any] = {"atlases": {}, "frames": {}}
+    for (group, sampling), sprites in sorted(grouped.items()):
+        for index, page in enumerate(pack_pages(sprites, max_size, extrude)):
+            atlas_name = f"{group.replace('/', '_')}_{sampling}_{index}"
+            canvas = Image.new("RGBA", (page.width, page.height), (0, 0, 0, 0))
+            for sprite, rect in page.placements:
+                x = rect.x + extrude
+                y = rect.y + extrude
+                extrude_into(canvas, sprite.image, x, y, extrude)
+                manifest["frames"][sprite.name] = {
+                    "atlas": atlas_name,
+                    "rect": [x, y, sprite.image.width, sprite.image.height],
+                    "sampling": sampling,
+                }
+            canvas.save(output_dir / f"{atlas_name}.png", optimize=True)
+            manifest["atlases"][atlas_name] = {
+                "width": page.width,
+                "height": page.height,
+                "sampling": sampling,
+            }
+            print(
+                f"[atlas] Wrote: {output_dir / atlas_name}.png "
+                f"({page.width}x{page.height}, {len(page.placements)} sprites)"
+            )
+
+    stale = remove_stale_pages(output_dir, manifest["atlases"])
+    if stale:
+        print(f"[atlas] Removed {stale} pages of an earlier packing")
+    # WebP variants of pages that were just rewritten would show the old sprites.
+    remove_stale_webp(output_dir)
+    manifest["frames"] = dict(sorted(manifest["frames"].items()))
+    (output_dir / MANIFEST_NAME).write_text(
+        json.dumps(manifest, separators=(",", ":")), encoding="utf-8"
+    )
+    print(
+        f"[atlas] {len(manifest['frames'])} sprites in {len(manifest['atlases'])} atlases, "
+        f"{skipped} too large left as standalone textures"
+    )
+    return manifest
+
+
+def remove_stale_pages(output_dir: Path, atlas_names: Iterable[str]) -> int:
+    """Delete page images (and .meta) in output_dir that are not among atlas_names."""
+    keep = set(atlas_names)
+    removed = 0
+    for path in sorted(output_dir.iterdir()):
+        if path.suffix.lower() not in (".png", ".webp"):
+            continue
+        name = path.stem.removesuffix(WEBP_VARIANT_SUFFIX) if is_webp_variant(path) else path.stem
+        if name in keep:
+            continue
+        path.unlink()
+        path.with_name(path.name + ".meta").unlink(missing_ok=True)
+        removed += 1
+    return removed
+
+
+def get_packed_texture_names(texture_dir: Path, manifest: dict[str, Any]) -> list[str]:
+    """Textures an atlas now holds, with the alpha masks they were merged from."""
+    alpha_masks = load_texture_manifest(get_alpha_mask_manifest_path(texture_dir))
+    packed = [*manifest["frames"]]
+    packed += [alpha_masks[name] for name in manifest["frames"] if name in alpha_masks]
+    return packed
+
+
+def move_packed_textures(texture_dir: Path, frames: Iterable[str], dst_dir: Path) -> int:
+    textures = list_textures(texture_dir)
+    moved = 0
+    for name in frames:
+        path = textures.get(name)
+        if path is None:
+            continue
+        files = (path, get_webp_variant_path(path))
+        for src in (*files, *(file.with_name(file.name + ".meta") for file in files)):
+            if src.exists():
+                dst = dst_dir / src.relative_to(texture_dir)
+                dst.parent.mkdir(parents=True, exist_ok=True)
+                shutil.move(str(src), dst)
+        moved += 1
+    return moved
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--textures", type=Path, default=Path("./assets/resources/textures"))
+    parser.add_argument("--animations", type=Path, default=Path("./assets/resources/animations"))
+    parser.add_argument("--particles", type=Path, default=Path("./assets/resources/particles"))
+    parser.add_argument("--dst", type=Path, default=Path("./assets/resources/atlases"))
+    parser.add_argument(
+        "--manifest", type=Path, default=Path("./assets/scripts/core/SpriteResourceManifest.ts")
+    )
+    parser.add_argument(
+        "--max-size", type=int, default=DEFAULT_MAX_SIZE, help="Largest atlas side."
+    )
+    parser.add_argument(
+        "--max-sprite-size",
+        type=int,
+        default=DEFAULT_MAX_SPRITE_SIZE,
+        help="Sprites with a side larger than this stay standalone.",
+    )
+    parser.add_argument(
+        "--extrude", type=int, default=DEFAULT_EXTRUDE, help="Edge pixels repeated per side."
+    )
+    parser.add_argument(
+        "--move-packed",
+        type=Path,
+        help="Move packed source textures (and .meta) here so they leave the bundle.",
+    )
+    args = parser.parse_args()
+
+    usage = build_usage_index(args.animations, args.particles, args.textures)
+    manifest = pack_atlases(
+        args.textures,
+        args.dst,
+        usage,
+        load_manifest_prefixes(args.manifest),
+        max_size=args.max_size,
+        max_sprite_size=args.max_sprite_size,
+        extrude=args.extrude,
+    )
+    if args.move_packed:
+        packed = get_packed_texture_names(args.textures, manifest)
+        moved = move_packed_textures(args.textures, packed, args.move_packed)
+        print(f"[atlas] Moved {moved} packed textures -> {args.move_packed}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""Report (and optionally exclude) textures nothing references.
+
+A texture under assets/resources/textures counts as referenced when its
+name (path relative to textures/, without extension) is:
+
+- an image of a converted reanim track or particle emitter
+- a font layer image
+- a string literal in the scanned sources, or starts with the literal head
+  of a template string such as `seeds_${index}`
+- covered by a SpriteResourceManifest.ts prefix
+- matched by a pattern in the allowlist (fnmatch syntax, one per line)
+
+Excluded textures are moved, with their .meta and WebP variant, to --exclude-dir so a later
+run (or a mistaken allowlist) can be undone by moving them back.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import shutil
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+from pathlib import Path
+
+from reanim_outputs import find_converted_reanims, load_converted_reanim
+from sprite_texture_preprocessor import (
+    IMAGE_SUFFIX_PRIORITY,
+    get_alpha_mask_manifest_path,
+    load_texture_manifest,
+)
+from webp_export import get_webp_variant_path, is_webp_variant
+
+
+SOURCE_SUFFIXES = (".ts", ".py")
+STRING_LITERAL = re.compile(r"""["'`]([A-Za-z0-9_./-]+)["'`]""")
+TEMPLATE_HEAD = re.compile(r"`([A-Za-z0-9_./-]+)\$\{")
+MANIFEST_PREFIX = re.compile(r"'([^']+)'")
+
+
+@dataclass
+class TextureReferences:
+    names: set[str] = field(default_factory=set)
+    prefixes: set[str] = field(default_factory=set)
+    patterns: list[str] = field(default_factory=list)
+
+    def covers(self, name: str) -> bool:
+        if name in self.names:
+            return True
+        if any(name.startswith(prefix) for prefix in self.prefixes):
+            return True
+        return any(fnmatchcase(name, pattern) for pattern in self.patterns)
+
+
+@dataclass
+class TextureAudit:
+    referenced: list[Path] = field(default_factory=list)
+    unreferenced: list[Path] = field(default_factory=list)
+
+    @property
+    def unreferenced_bytes(self) -> int:
+        return sum(path.stat().st_size for path in self.unreferenced)
+
+
+def list_textures(texture_dir: Path) -> dict[str, Path]:
+    textures: dict[str, Path] = {}
+    for path in sorted(texture_dir.rglob("*")):
+        if is_webp_variant(path):
+            continue
+        if path.is_file() and path.suffix.lower() in IMAGE_SUFFIX_PRIORITY:
+            textures[path.relative_to(texture_dir).with_suffix("").as_posix()] = path
+    return textures
+
+
+def collect_animation_images(animation_dir: Path) -> set[str]:
+    images: set[str] = set()
+    # Every output format counts: .json, .bin and <reanim>/ chunk directories.
+    for path in find_converted_reanims(animation_dir).values():
+        for node in load_converted_reanim(path).values():
+            if not isinstance(node, dict) or "tracks" not in node:
+                continue
+            for track in node["tracks"].values():
+                images.update(frame["image"] for frame in track["frames"] if frame.get("image"))
+    return images
+
+
+def collect_particle_images(particle_dir: Path) -> set[str]:
+    images: set[str] = set()
+    for path in sorted(particle_dir.glob("*.json")):
+        definition = json.loads(path.read_text(encoding="utf-8"))
+        images.update(
+            emitter["image"] for emitter in definition.get("emitters", []) if emitter.get("image")
+        )
+    return images
+
+
+def collect_font_images(font_dir: Path) -> set[str]:
+    images: set[str] = set()
+    for path in sorted(font_dir.glob("*.json")):
+        font = json.loads(path.read_text(encoding="utf-8"))
+        images.update(layer["image"] for layer in font.get("layers", []) if layer.get("image"))
+    return images
+
+
+def collect_source_references(source_dirs: Iterable[Path], references: TextureReferences) -> None:
+    for source_dir in source_dirs:
+        if not source_dir.is_dir():
+            continue
+        for path in sorted(source_dir.rglob("*")):
+            if path.suffix not in SOURCE_SUFFIXES or not path.is_file():
+                continue
+            text = path.read_text(encoding="utf-8", errors="ignore")
+            references.names.update(value.lower() for value in STRING_LITERAL.findall(text))
+            references.prefixes.update(value.lower() for value in TEMPLATE_HEAD.findall(text))
+
+
+def load_manifest_prefixes(manifest: Path) -> set[str]:
+    if not manifest.exists():
+        return set()
+    text = manifest.read_text(encoding="utf-8")
+    start = text.find("LINEAR_PREFIXES")
+    end = text.find("]", start)
+    if start < 0 or end < 0:
+        return set()
+    return set(MANIFEST_PREFIX.findall(text[start:end]))
+
+
+def load_allowlist(path: Path | None) -> list[str]:
+    if path is None or not path.exists():
+        return []
+    patterns = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.split("#", 1)[0].strip()
+        if line:
+            patterns.append(line.lower())
+    return patterns
+
+
+def audit_textures(texture_dir: Path, references: TextureReferences) -> TextureAudit:
+    audit = TextureAudit()
+    for name, path in list_textures(texture_dir).items():
+        if references.covers(name.lower()):
+            audit.referenced.append(path)
+        else:
+            audit.unreferenced.append(path)
+    return audit
+
+
+def exclude_textures(paths: Iterable[Path], texture_dir: Path, exclude_dir: Path) -> int:
+    moved = 0
+    for path in paths:
+        files = (path, get_webp_variant_path(path))
+        for src in (*files, *(file.with_name(file.name + ".meta") for file in files)):
+            if not src.exists():
+                continue
+            dst = exclude_dir / src.relative_to(texture_dir)
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(str(src), dst)
+        moved += 1
+    return moved
+
+
+def run_texture_audit(
+    texture_dir: Path = Path("./assets/resources/textures"),
+    animation_dir: Path = Path("./assets/resources/animations"),
+    particle_dir: Path = Path("./assets/resources/particles"),
+    font_dir: Path = Path("./assets/resources/fonts"),
+    source_dirs: tuple[Path, ...] = (Path("./assets/scripts"), Path("./tools")),
+    manifest: Path = Path("./assets/scripts/core/SpriteResourceManifest.ts"),
+    allowlist: Path | None = Path("./tools/texture_allowlist.txt"),
+    exclude_dir: Path | None = None,
+    verbose: bool = True,
+) -> TextureAudit:
+    references = TextureReferences()
+    references.names |= collect_animation_images(animation_dir)
+    references.names |= collect_particle_images(particle_dir)
+    references.names |= collect_font_images(font_dir)
+    collect_source_references(source_dirs, references)
+    references.prefixes |= load_manifest_prefixes(manifest)
+    references.patterns = load_allowlist(allowlist)
+    # Alpha masks written by --split-alpha live and die with their colour texture.
+    alpha_masks = load_texture_manifest(get_alpha_mask_manifest_path(texture_dir))
+    references.names.update(
+        mask for colour, mask in alpha_masks.items() if references.covers(colour.lower())
+    )
+
+    audit = audit_textures(texture_dir, references)
+    print(
+        f"[texture-audit] {len(audit.referenced)} referenced, {len(audit.unreferenced)} "
+        f"unreferenced ({audit.unreferenced_bytes} bytes)"
+    )
+    if verbose:
+        for path in audit.unreferenced:
+            print(f"[texture-audit]   unreferenced: {path.relative_to(texture_dir).as_posix()}")
+    if exclude_dir is not None and audit.unreferenced:
+        moved = exclude_textures(audit.unreferenced, texture_dir, exclude_dir)
+        print(f"[texture-audit] Moved {moved} textures -> {exclude_dir}")
+    return audit
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--textures", type=Path, default=Path("./assets/resources/textures"))
+    parser.add_argument("--animations", type=Path, default=Path("./assets/resources/animations"))
+    parser.add_argument("--particles", type=Path, default=Path("./assets/resources/particles"))
+    parser.add_argument("--fonts", type=Path, default=Path("./assets/resources/fonts"))
+    parser.add_argument(
+        "--sources",
+        type=Path,
+        action="append",
+        help="Source directory scanned for texture names; repeatable. "
+        "Defaults to ./assets/scripts and ./tools.",
+    )
+    parser.add_argument(
+        "--manifest", type=Path, default=Path("./assets/scripts/core/SpriteResourceManifest.ts")
+    )
+    parser.add_argument("--allowlist", type=Path, default=Path("./tools/texture_allowlist.txt"))
+    parser.add_argument(
+        "--exclude",
+        action="store_true",
+        help="Move unreferenced textures and their .meta files to --exclude-dir.",
+    )
+    parser.add_argument("--exclude-dir", type=Path, default=Path("./tools/raw/unused_textures"))
+    parser.add_argument("-q", "--quiet", action="store_true", help="Only print the summary.")
+    args = parser.parse_args()
+
+    run_texture_audit(
+        texture_dir=args.textures,
+        animation_dir=args.animations,
+        particle_dir=args.particles,
+        font_dir=args.fonts,
+        source_dirs=tuple(args.sources or (Path("./assets/scripts"), Path("./tools"))),
+        manifest=args.manifest,
+        allowlist=args.allowlist,
+        exclude_dir=args.exclude_dir if args.exclude else None,
+        verbose=not args.quiet,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""Index which textures each reanim, clip and particle definition references.
+
+Reads the converted animations in any output format (see reanim_outputs)
+and the particle JSON, and writes assets/resources/texture_usage.json:
+
+    {
+      "textures":  {name: {"width", "height", "bytes"}},
+      "reanims":   {reanim: {"textures", "bytes",
+                             "clips": {"node/clip": {"textures", "bytes"}}}},
+      "particles": {particle: {"textures", "bytes"}},
+      "missing":   [names referenced but not found under textures/]
+    }
+
+"bytes" is the decoded RGBA8 size, so a level can total what its plants and
+zombies need and preload exactly that (see TextureUsage.ts).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from PIL import Image
+
+from reanim_lod import LOD_SUFFIX
+from reanim_outputs import find_converted_reanims, load_converted_reanim
+from sprite_texture_preprocessor import IMAGE_SUFFIX_PRIORITY
+
+
+BYTES_PER_PIXEL = 4
+LOD_NAME_RE = re.compile(rf"{re.escape(LOD_SUFFIX)}\d+$")
+
+
+def find_texture(texture_dir: Path, name: str) -> Path | None:
+    for suffix in IMAGE_SUFFIX_PRIORITY:
+        path = texture_dir / f"{name}{suffix}"
+        if path.is_file():
+            return path
+    return None
+
+
+class TextureSizes:
+    def __init__(self, texture_dir: Path) -> None:
+        self.texture_dir = texture_dir
+        self.info: dict[str, dict[str, int]] = {}
+        self.missing: set[str] = set()
+
+    def bytes_for(self, names: Iterable[str]) -> int:
+        total = 0
+        for name in names:
+            info = self.get(name)
+            if info is not None:
+                total += info["bytes"]
+        return total
+
+    def get(self, name: str) -> dict[str, int] | None:
+        if name in self.info:
+            return self.info[name]
+        if name in self.missing:
+            return None
+        path = find_texture(self.texture_dir, name)
+        if path is None:
+            self.missing.add(name)
+            return None
+        with Image.open(path) as image:
+            width, height = image.size
+        info = self.info[name] = {
+            "width": width,
+            "height": height,
+            "bytes": width * height * BYTES_PER_PIXEL,
+        }
+        return info
+
+
+def usage_entry(names: set[str], sizes: TextureSizes) -> dict[str, Any]:
+    textures = sorted(names)
+    return {"textures": textures, "bytes": sizes.bytes_for(textures)}
+
+
+def get_clip_images(node: dict[str, Any], anim: dict[str, Any]) -> set[str]:
+    start = anim["startFrame"]
+    end = anim["endFrame"]
+    images: set[str] = set()
+    for track in node["tracks"].values():
+        for frame in track["frames"]:
+            if start <= frame["frameIndex"] <= end and frame.get("image"):
+                images.add(frame["image"])
+    return images
+
+
+def index_reanim(anim_nodes: dict[str, Any], sizes: TextureSizes) -> dict[str, Any]:
+    clips: dict[str, Any] = {}
+    all_images: set[str] = set()
+    for node_name, node in anim_nodes.items():
+        for clip_name, anim in node["animations"].items():
+            images = get_clip_images(node, anim)
+            all_images |= images
+            clips[f"{node_name}/{clip_name}"] = usage_entry(images, sizes)
+    return {**usage_entry(all_images, sizes), "clips": clips}
+
+
+def index_particle(definition: dict[str, Any], sizes: TextureSizes) -> dict[str, Any]:
+    images = {emitter["image"] for emitter in definition.get("emitters", []) if emitter.get("image")}
+    return usage_entry(images, sizes)
+
+
+def build_usage_index(animation_dir: Path, particle_dir: Path, texture_dir: Path) -> dict[str, Any]:
+    sizes = TextureSizes(texture_dir)
+
+    reanims: dict[str, Any] = {}
+    for name, path in find_converted_reanims(animation_dir).items():
+        # LOD variants reference the same textures as their full-rate reanim.
+        if LOD_NAME_RE.search(name):
+            continue
+        reanims[name] = index_reanim(load_converted_reanim(path), sizes)
+
+    particles: dict[str, Any] = {}
+    for path in sorted(particle_dir.glob("*.json")):
+        particles[path.stem] = index_particle(json.loads(path.read_text(encoding="utf-8")), sizes)
+
+    return {
+        "textures": dict(sorted(sizes.info.items())),
+        "reanims": reanims,
+        "particles": particles,
+        "missing": sorted(sizes.missing),
+    }
+
+
+def write_usage_index(
+    animation_dir: Path,
+    particle_dir: Path,
+    texture_dir: Path,
+    dst: Path,
+) -> dict[str, Any]:
+    index = build_usage_index(animation_dir, particle_dir, texture_dir)
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    dst.write_text(json.dumps(index, separators=(",", ":")), encoding="utf-8")
+    print(
+        f"[texture-usage] Wrote: {dst} ({len(index['reanims'])} reanims, "
+        f"{len(index['particles'])} particles, {len(index['textures'])} textures)"
+    )
+    for name in index["missing"]:
+        print(f"[texture-usage] WARN: referenced texture '{name}' not found")
+    return index
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--animations", type=Path, default=Path("./assets/resources/animations"))
+    parser.add_argument("--particles", type=Path, default=Path("./assets/resources/particles"))
+    parser.add_argument("--textures", type=Path, default=Path("./assets/resources/textures"))
+    parser.add_argument("--dst", type=Path, default=Path("./assets/resources/texture_usage.json"))
+    args = parser.parse_args()
+
+    write_usage_index(args.animations, args.particles, args.textures, args.dst)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""Re-encode PNG textures as WebP for web builds.
+
+Each texture's mode comes from the first matching prefix in WEBP_POLICY,
+like LINEAR_PREFIXES in SpriteResourceManifest.ts:
+
+- "png": left alone
+- "lossless": lossless WebP, decoded back and required to match exactly
+- "lossy": WebP at the policy's quality, kept only if its PSNR and max
+  channel error against the PNG pass --min-psnr / --max-error (measured on
+  premultiplied colour plus alpha, so invisible pixels do not count)
+
+The PNG always stays, as the fallback for runtimes without WebP (native
+builds use the same resources). An accepted WebP is written next to it as
+<name>__webp.webp and listed in <dir>_webp.json beside the texture directory,
+{name: sha256 of the PNG it was encoded from}; SpriteWebp.ts loads it where
+WebP is supported. A WebP that is rejected or not smaller is not kept.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import io
+import json
+import math
+from dataclasses import dataclass
+from pathlib import Path
+
+from PIL import Image, ImageChops
+
+
+@dataclass(frozen=True)
+class WebpPolicy:
+    mode: str
+    quality: int = 100
+
+
+PNG = WebpPolicy("png")
+LOSSLESS = WebpPolicy("lossless")
+LOSSY_HIGH = WebpPolicy("lossy", 92)
+
+# First matching prefix wins; textures matching none use DEFAULT_POLICY.
+# Smoothly filtered, photographic art tolerates lossy encoding; pixel-exact
+# UI, fonts and cached atlases stay lossless.
+WEBP_POLICY: tuple[tuple[str, WebpPolicy], ...] = (
+    ("background", LOSSY_HIGH),
+    ("titlescreen", LOSSY_HIGH),
+    ("selectorscreen_", LOSSY_HIGH),
+    ("crazydave_", LOSSY_HIGH),
+    ("particles/", LOSSY_HIGH),
+)
+DEFAULT_POLICY = LOSSLESS
+
+WEBP_VARIANT_SUFFIX = "__webp"
+
+DEFAULT_MIN_PSNR = 40.0
+DEFAULT_MAX_ERROR = 24
+WEBP_METHOD = 6
+
+
+@dataclass
+class WebpResult:
+    name: str
+    mode: str
+    before: int
+    after: int
+    psnr: float
+    max_error: int
+    accepted: bool
+
+
+def get_webp_manifest_path(texture_dir: Path) -> Path:
+    return texture_dir.with_name(f"{texture_dir.name}_webp.json")
+
+
+def get_webp_variant_path(path: Path) -> Path:
+    return path.with_name(f"{path.stem}{WEBP_VARIANT_SUFFIX}.webp")
+
+
+def is_webp_variant(path: Path) -> bool:
+    return path.suffix.lower() == ".webp" and path.stem.endswith(WEBP_VARIANT_SUFFIX)
+
+
+def load_webp_manifest(texture_dir: Path) -> dict[str, str]:
+    path = get_webp_manifest_path(texture_dir)
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def save_webp_manifest(texture_dir: Path, manifest: dict[str, str]) -> None:
+    path = get_webp_manifest_path(texture_dir)
+    if not manifest:
+        path.unlink(missing_ok=True)
+        return
+    path.write_text(
+        json.dumps(dict(sorted(manifest.items())), separators=(",", ":")), encoding="utf-8"
+    )
+
+
+def _hash_file(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _remove_variant(path: Path) -> None:
+    path.unlink(missing_ok=True)
+    path.with_name(path.name + ".meta").unlink(missing_ok=True)
+
+
+def get_policy(name: str, policy: tuple[tuple[str, WebpPolicy], ...] = WEBP_POLICY) -> WebpPolicy:
+    return next((entry for prefix, entry in policy if name.startswith(prefix)), DEFAULT_POLICY)
+
+
+def _premultiplied_channels(image: Image.Image) -> list[Image.Image]:
+    red, green, blue, alpha = image.split()
+    return [*(ImageChops.multiply(channel, alpha) for channel in (red, green, blue)), alpha]
+
+
+def compare_images(expected: Image.Image, actual: Image.Image) -> tuple[float, int]:
+    """PSNR (inf when identical) and max channel error over premultiplied RGBA."""
+    squared = 0
+    max_error = 0
+    for a, b in zip(_premultiplied_channels(expected), _premultiplied_channels(actual)):
+        histogram = ImageChops.difference(a, b).histogram()
+        squared += sum(count * value * value for value, count in enumerate(histogram))
+        max_error = max(
+            max_error, max((value for value, count in enumerate(histogram) if count), default=0)
+        )
+    if squared == 0:
+        return math.inf, 0
+    mse = squared / (expected.width * expected.height * 4)
+    return 10 * math.log10(255 * 255 / mse), max_error
+
+
+def encode_webp(image: Image.Image, policy: WebpPolicy) -> bytes:
+    output = io.BytesIO()
+    if policy.mode == "lossless":
+        # exact keeps RGB under alpha 0, which linear filtering can still sample.
+        image.save(output, "WEBP", lossless=True, quality=100, method=WEBP_METHOD, exact=True)
+    else:
+        image.save(
+            output, "WEBP", quality=policy.quality, alpha_quality=100, method=WEBP_METHOD
+        )
+    return output.getvalue()
+
+
+def export_texture(
+    path: Path,
+    name: str,
+    policy: WebpPolicy,
+    min_psnr: float,
+    max_error: int,
+) -> WebpResult | None:
+    if policy.mode == "png":
+        return None
+    with Image.open(path) as source:
+        image = source.convert("RGBA")
+    data = encode_webp(image, policy)
+    with Image.open(io.BytesIO(data)) as decoded:
+        psnr, error = compare_images(image, decoded.convert("RGBA"))
+
+    before = path.stat().st_size
+    if policy.mode == "lossless":
+        accepted = error == 0
+    else:
+        accepted = psnr >= min_psnr and error <= max_error
+    accepted = accepted and len(data) < before
+    result = WebpResult(name, policy.mode, before, len(data), psnr, error, accepted)
+    if accepted:
+        # Written in place so an existing variant keeps its .meta (and uuid).
+        get_webp_variant_path(path).write_bytes(data)
+    return result
+
+
+def remove_stale_webp(texture_dir: Path, keep_current: bool = True) -> int:
+    """Drop WebP variants whose PNG changed or is gone since they were encoded.
+
+    Without keep_current every variant goes, for builds that no longer want WebP.
+    WebP files that replaced their PNG (this tool's earlier layout) go once the
+    PNG is back.
+    """
+    manifest = load_webp_manifest(texture_dir)
+    current: dict[str, str] = {}
+    removed = 0
+    for path in sorted(texture_dir.rglob("*.webp")):
+        if not is_webp_variant(path):
+            if path.with_suffix(".png").exists():
+                _remove_variant(path)
+                removed += 1
+            continue
+        png = path.with_name(f"{path.stem[:-len(WEBP_VARIANT_SUFFIX)]}.png")
+        name = png.relative_to(texture_dir).with_suffix("").as_posix()
+        digest = manifest.get(name)
+        if keep_current and digest is not None and png.exists() and _hash_file(png) == digest:
+            current[name] = digest
+            continue
+        _remove_variant(path)
+        removed += 1
+    save_webp_manifest(texture_dir, current)
+    return removed
+
+
+def export_webp_textures(
+    texture_dir: Path,
+    policy: tuple[tuple[str, WebpPolicy], ...] = WEBP_POLICY,
+    min_psnr: float = DEFAULT_MIN_PSNR,
+    max_error: int = DEFAULT_MAX_ERROR,
+    verbose: bool = True,
+) -> list[WebpResult]:
+    remove_stale_webp(texture_dir)
+    manifest = load_webp_manifest(texture_dir)
+    results: list[WebpResult] = []
+    for path in sorted(texture_dir.rglob("*.png")):
+        name = path.relative_to(texture_dir).with_suffix("").as_posix()
+        result = export_texture(path, name, get_policy(name, policy), min_psnr, max_error)
+        if result is None or not result.accepted:
+            _remove_variant(get_webp_variant_path(path))
+            manifest.pop(name, None)
+        else:
+            manifest[name] = _hash_file(path)
+        if result is None:
+            continue
+        results.append(result)
+        if verbose:
+            status = "webp" if result.accepted else "kept png"
+            print(
+                f"[webp]   {name}: {result.before} -> {result.after} bytes "
+                f"({result.mode}, psnr {result.psnr:.1f} dB, max error {result.max_error}) {status}"
+            )
+
+    accepted = [result for result in results if result.accepted]
+    before = sum(result.before for result in accepted)
+    after = sum(result.after for result in accepted)
+    save_webp_manifest(texture_dir, manifest)
+    print(
+        f"[webp] {texture_dir}: {len(accepted)}/{len(results)} textures as WebP, "
+        f"{before} -> {after} bytes"
+    )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--textures",
+        type=Path,
+        action="append",
+        help="Texture directory to add WebP variants to; repeatable. "
+        "Defaults to ./assets/resources/textures and ./assets/resources/atlases.",
+    )
+    parser.add_argument("--min-psnr", type=float, default=DEFAULT_MIN_PSNR)
+    parser.add_argument("--max-error", type=int, default=DEFAULT_MAX_ERROR)
+    parser.add_argument("-q", "--quiet", action="store_true", help="Only print the summary.")
+    args = parser.parse_args()
+
+    texture_dirs = args.textures or [
+        Path("./assets/resources/textures"),
+        Path("./assets/resources/atlases"),
+    ]
+    for texture_dir in texture_dirs:
+        if texture_dir.is_dir():
+            export_webp_textures(
+                texture_dir,
+                min_psnr=args.min_psnr,
+                max_error=args.max_error,
+                verbose=not args.quiet,
+            )
+
+
+if __name__ == "__main__":
+    main()